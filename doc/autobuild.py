@@ -53,6 +53,7 @@ import kivy.storage.jsonstore
 import kivy.storage.redisstore
 import kivy.network.urlrequest
 import kivy.modules.webdebugger
+import kivy.spatialindex
 import kivy.support
 import kivy.input.recorder
 import kivy.interactive
@@ -275,6 +275,83 @@ cdef class EventDispatcher(ObjectWithUid):
                 prop = self.__properties[key]
                 prop.unbind(self, value)
 
+    def bind_many(self, bindings):
+        '''Bind many event types or properties to callbacks in one call.
+
+        `bindings` is a list of (name, callback) pairs, a name can be used
+        multiple times. The callbacks are bound as with :meth:`bind`, except
+        that the names that are neither an event type nor a property are
+        ignored. A handle is returned. The handle must be passed to
+        :meth:`unbind_many` to unbind all of them at once::
+
+            handle = self.bind_many([('x', on_pos), ('y', on_pos),
+                                     ('on_press', on_press)])
+            ...
+            self.unbind_many(handle)
+
+        The handle is a tuple of (name, callbacks) groups. Handles of the same
+        dispatcher can be concatenated to be unbound in a single call.
+
+        .. versionadded:: 1.8.1
+        '''
+        cdef Property prop
+        cdef dict groups = {}
+        cdef list names = []
+        cdef list callbacks
+        for key, value in bindings:
+            callbacks = groups.get(key)
+            if callbacks is None:
+                callbacks = groups[key] = []
+                names.append(key)
+            callbacks.append(value)
+        handle = []
+        for key in names:
+            callbacks = groups[key]
+            if key[:3] == 'on_':
+                if key not in self.__event_stack:
+                    continue
+                # convert the handlers to weak methods
+                self.__event_stack[key].extend(
+                    [WeakMethod(value) for value in callbacks])
+            else:
+                prop = self.__properties.get(key)
+                if prop is None:
+                    continue
+                prop.bind_observers(self, callbacks)
+            handle.append((key, tuple(callbacks)))
+        return tuple(handle)
+
+    def unbind_many(self, handle):
+        '''Unbind all the callbacks of a handle returned by
+        :meth:`bind_many`. The observers list of each property is filtered
+        only once, whatever the number of callbacks to remove.
+
+        .. versionadded:: 1.8.1
+        '''
+        cdef Property prop
+        cdef dict groups = {}
+        cdef list callbacks
+        for key, values in handle:
+            callbacks = groups.get(key)
+            if callbacks is None:
+                callbacks = groups[key] = []
+            callbacks.extend(values)
+        for key, callbacks in groups.iteritems():
+            if key[:3] == 'on_':
+                if key not in self.__event_stack:
+                    continue
+                for value in callbacks:
+                    # we need to execute weak method to be able to compare
+                    for handler in self.__event_stack[key]:
+                        if handler() != value:
+                            continue
+                        self.__event_stack[key].remove(handler)
+                        break
+            else:
+                prop = self.__properties.get(key)
+                if prop is not None:
+                    prop.unbind_observers(self, callbacks)
+
     def get_property_observers(self, name):
         ''' Returns a list of methods that are bound to the property/event
         passed as the *name* argument::
@@ -73,6 +73,22 @@ property to `True`::
 
 For flow control of animations such as stopping and cancelling, use the methods
 already in place in the animation module.
+
+Performance
+-----------
+
+.. versionadded:: 1.8.1
+
+All the running animations with the same step are ticked by a single clock
+callback. The start and end values of their properties are flattened in two
+arrays and interpolated in one pass, with NumPy if it is installed and enough
+values are animated. Then each widget property is written once per frame,
+even if several animations target it: the last started one wins, as before.
+The `on_progress` events are dispatched once all the properties of the frame
+have been written.
+
+Subclasses overriding :meth:`Animation._update` or
+:meth:`Animation._calculate` are still ticked through their own method.
 '''
 
 __all__ = ('Animation', 'AnimationTransition')
@@ -83,6 +99,219 @@ from kivy.clock import Clock
 from kivy.compat import string_types, iterkeys
 
 
+_numpy = None
+
+
+def _get_numpy():
+    # numpy is imported only when a large batch needs it, and is optional
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+class _Generic(Exception):
+    # raised when a value cannot be flattened in the batch arrays
+    pass
+
+
+def _flatten(a, b, start, end):
+    '''(internal) Append the scalars of the start value `a` and end value `b`
+    to the `start` and `end` lists, and return the template used to rebuild
+    the value from the interpolated scalars: None for a scalar, or a
+    (type, items) tuple. Follow the same rules as :meth:`Animation._calculate`.
+    '''
+    if isinstance(a, list) or isinstance(a, tuple):
+        tp = list if isinstance(a, list) else tuple
+        return tp, [_flatten(a[x], b[x], start, end) for x in range(len(a))]
+    elif isinstance(a, dict):
+        items = []
+        for x in iterkeys(a):
+            if x not in b:
+                # copy the part of the dict that is not animated
+                items.append((x, False, a[x]))
+            else:
+                items.append((x, True, _flatten(a[x], b[x], start, end)))
+        return dict, items
+    elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        start.append(a)
+        end.append(b)
+        return None
+    raise _Generic()
+
+
+def _build(template, values, index):
+    '''(internal) Rebuild a value from its template and the interpolated
+    scalars starting at `index`. Return the value and the next index.
+    '''
+    if template is None:
+        return values[index], index + 1
+    tp, items = template
+    if tp is dict:
+        d = {}
+        for key, animated, item in items:
+            if animated:
+                d[key], index = _build(item, values, index)
+            else:
+                d[key] = item
+        return d, index
+    result = []
+    for item in items:
+        value, index = _build(item, values, index)
+        result.append(value)
+    return tp(result), index
+
+
+class _AnimationDriver(object):
+    '''(internal) Tick all the running animations with the same step in a
+    single clock callback.
+
+    The animated properties are compiled in a plan when the set of running
+    animations changes: their start and end scalars are flattened in two
+    arrays, and each widget property gets a single write, the last one
+    winning. On every tick, the transitions are evaluated once per widget,
+    then all the scalars are interpolated in one pass before the writes.
+    '''
+
+    drivers = {}
+
+    #: Minimum number of scalars to interpolate with numpy
+    numpy_threshold = 64
+
+    def __init__(self, step):
+        self.step = step
+        self.animations = []
+        self.dirty = True
+        self.plan = None
+        self._event = None
+
+    @staticmethod
+    def get(step):
+        drivers = _AnimationDriver.drivers
+        driver = drivers.get(step)
+        if driver is None:
+            driver = drivers[step] = _AnimationDriver(step)
+        return driver
+
+    def add(self, animation):
+        if not self.animations:
+            self._event = Clock.schedule_interval(self.tick, self.step)
+        self.animations.append(animation)
+        self.dirty = True
+
+    def remove(self, animation):
+        self.animations.remove(animation)
+        self.dirty = True
+        if not self.animations:
+            self._event.cancel()
+            self._event = None
+            self.plan = None
+
+    def compile(self):
+        entries = []
+        legacy = []
+        writes = []
+        targets = {}
+        start = []
+        end = []
+        owners = []
+        for animation in self.animations:
+            cls = type(animation)
+            if (cls._update != Animation._update or
+                    cls._calculate != Animation._calculate):
+                legacy.append(animation)
+                continue
+            for uid, anim in list(animation._widgets.items()):
+                widget = anim['widget']
+                index = len(entries)
+                entries.append([animation, uid, anim, widget, 0])
+                first = len(start)
+                for key, values in anim['properties'].items():
+                    a, b = values
+                    pos = len(start)
+                    try:
+                        template = _flatten(a, b, start, end)
+                    except _Generic:
+                        del start[pos:]
+                        del end[pos:]
+                        # interpolated by the animation on every tick
+                        template = (_Generic, animation._calculate, a, b)
+                        pos = index
+                    target = (id(widget), key)
+                    if target in targets:
+                        # coalesce: only the last write is kept
+                        writes[targets[target]] = None
+                    targets[target] = len(writes)
+                    writes.append((widget, key, template, pos))
+                owners.extend([index] * (len(start) - first))
+
+        writes = [x for x in writes if x is not None]
+        numpy = None
+        if len(start) >= self.numpy_threshold:
+            numpy = _get_numpy()
+        if numpy:
+            start = numpy.array(start, dtype=float)
+            end = numpy.array(end, dtype=float)
+            owners = numpy.array(owners, dtype=int)
+        self.plan = (entries, legacy, writes, start, end, owners, numpy)
+        self.dirty = False
+
+    def tick(self, dt):
+        if self.dirty:
+            self.compile()
+        entries, legacy, writes, start, end, owners, numpy = self.plan
+
+        # evaluate the transitions, once per widget
+        ts = []
+        for entry in entries:
+            animation, anim = entry[0], entry[2]
+            if anim['time'] is None:
+                anim['time'] = 0.
+            else:
+                anim['time'] += dt
+            duration = animation._duration
+            if duration:
+                progress = min(1., anim['time'] / duration)
+            else:
+                progress = 1
+            entry[4] = progress
+            ts.append(animation._transition(progress))
+
+        # interpolate all the scalars in one pass
+        if numpy:
+            t = numpy.array(ts, dtype=float)[owners]
+            values = (start * (1. - t) + end * t).tolist()
+        else:
+            values = [a * (1. - ts[o]) + b * ts[o]
+                      for a, b, o in zip(start, end, owners)]
+
+        # write the properties
+        for widget, key, template, pos in writes:
+            if template is None:
+                setattr(widget, key, values[pos])
+            elif template[0] is _Generic:
+                setattr(widget, key, template[1](template[2], template[3],
+                                                 ts[pos]))
+            else:
+                setattr(widget, key, _build(template, values, pos)[0])
+
+        # dispatch the events, the handlers may change the animations
+        for animation, uid, anim, widget, progress in entries:
+            if animation._widgets.get(uid) is not anim:
+                continue
+            animation.dispatch('on_progress', widget, progress)
+            if progress >= 1. and animation._widgets.get(uid) is anim:
+                animation.stop(widget)
+
+        for animation in legacy:
+            if animation in self.animations:
+                animation._update(dt)
+
+
 class Animation(EventDispatcher):
     '''Create an animation definition that can be used to animate a Widget.
 
@@ -117,6 +346,7 @@ class Animation(EventDispatcher):
 
         # Initialize
         self._clock_installed = False
+        self._driver = None
         self._duration = kw.get('d', kw.get('duration', 1.))
         self._transition = kw.get('t', kw.get('transition', 'linear'))
         self._step = kw.get('s', kw.get('step', 1. / 60.))
@@ -212,7 +442,8 @@ class Animation(EventDispatcher):
 
         .. versionadded:: 1.4.0
         '''
-        self._widgets.pop(widget.uid, None)
+        if self._widgets.pop(widget.uid, None) and self._driver:
+            self._driver.dirty = True
         self._clock_uninstall()
         if not self._widgets:
             self._unregister()
@@ -226,6 +457,8 @@ class Animation(EventDispatcher):
         if not props:
             return
         props['properties'].pop(prop, None)
+        if self._driver:
+            self._driver.dirty = True
 
         # no more properties to animation ? kill the animation.
         if not props['properties']:
@@ -242,6 +475,8 @@ class Animation(EventDispatcher):
         if not props:
             return
         props['properties'].pop(prop, None)
+        if self._driver:
+            self._driver.dirty = True
 
         # no more properties to animation ? kill the animation.
         if not props['properties']:
@@ -279,18 +514,21 @@ class Animation(EventDispatcher):
 
         # install clock
         self._clock_install()
+        self._driver.dirty = True
 
     def _clock_install(self):
         if self._clock_installed:
             return
-        Clock.schedule_interval(self._update, self._step)
+        self._driver = _AnimationDriver.get(self._step)
+        self._driver.add(self)
         self._clock_installed = True
 
     def _clock_uninstall(self):
         if self._widgets or not self._clock_installed:
             return
         self._clock_installed = False
-        Clock.unschedule(self._update)
+        self._driver.remove(self)
+        self._driver = None
 
     def _update(self, dt):
         widgets = self._widgets
@@ -28,6 +28,12 @@ A file with ``<basename>.atlas`` is a json file formatted like this::
         # ...
     }
 
+An image can also be stored rotated by 90 degrees clockwise, if the atlas has
+been created with rotation. Its entry has a fifth value, set to 1, and
+``<width>`` and ``<height>`` are still the size of the original image::
+
+    "id3": [ <x>, <y>, <width>, <height>, 1 ]
+
 Example of the Kivy ``defaulttheme.atlas``::
 
     {
@@ -86,6 +92,16 @@ As you can see, we get 2 new files: ``myatlas.atlas`` and ``myatlas-0.png``.
 
     In which case the id for ``../images/button.png`` will be ``images_button``
 
+.. versionadded:: 1.8.1
+
+    The packing algorithm can be chosen with ``--algorithm=<name>``, one of
+    ``guillotine`` (the default), ``maxrects`` or ``skyline``. Add
+    ``--rotation`` to allow rotating the images, and ``--workers=<count>`` to
+    change the number of processes used to read the images and write the
+    atlas images (one per CPU by default)::
+
+        $ python -m kivy.atlas --algorithm=maxrects --rotation myatlas 512 *.png
+
 
 How to use an Atlas
 -------------------
@@ -124,7 +140,7 @@ Manual usage of the Atlas
     <kivy.graphics.texture.TextureRegion object at 0x2404d10>
 '''
 
-__all__ = ('Atlas', )
+__all__ = ('Atlas', 'GuillotinePacker', 'MaxRectsPacker', 'SkylinePacker')
 
 import json
 from os.path import basename, dirname, join, splitext
@@ -136,6 +152,233 @@ import os
 
 # late import to prevent recursion
 CoreImage = None
+TextureRegion = None
+
+
+def _atlas_image_size(filename):
+    from PIL import Image
+    # only the header is read here
+    return Image.open(filename).size
+
+
+def _atlas_compose(job):
+    # load the images of an atlas image, and blit them at their place
+    from PIL import Image
+    outfilename, size, padding, boxes = job
+    out = Image.new('RGBA', size)
+    for filename, x, y, rotated in boxes:
+        im = Image.open(filename)
+        im.load()
+        if rotated:
+            # rotate by 90 degrees clockwise
+            im = im.transpose(Image.ROTATE_270)
+        out.paste(im, (x, y))
+        w, h = im.size
+        if padding > 1:
+            out.paste(im.crop((0, 0, w, 1)), (x, y - 1))
+            out.paste(im.crop((0, h - 1, w, h)), (x, y + h))
+            out.paste(im.crop((0, 0, 1, h)), (x - 1, y))
+            out.paste(im.crop((w - 1, 0, w, h)), (x + w, y))
+    out.save(outfilename)
+
+
+class GuillotinePacker(object):
+    '''Place each box in the smallest free box that can contain it, and
+    split the rest of the free box in two. It's the historical algorithm of
+    :meth:`Atlas.create`.
+
+    A packer manages the free space of one image. :meth:`find` returns the
+    best place for a box, as a tuple starting with a score (lower is better)
+    that can be compared with the places found in other images, and
+    :meth:`place` uses that place. Coordinates start at the top-left corner.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def __init__(self, width, height, rotation=False):
+        self.rotation = rotation
+        # the freebox tuple format is: x, y, w, h
+        self.freeboxes = [(0, 0, width, height)]
+
+    def find(self, w, h):
+        for idx, fb in enumerate(self.freeboxes):
+            # the free boxes are sorted by area, the first one is the smallest
+            if fb[2] >= w and fb[3] >= h:
+                return fb[2] * fb[3], idx, w, h, False
+            if self.rotation and fb[2] >= h and fb[3] >= w:
+                return fb[2] * fb[3], idx, h, w, True
+
+    def place(self, found):
+        score, idx, imw, imh, rotated = found
+        freeboxes = self.freeboxes
+        fb = freeboxes.pop(idx)
+        if fb[2] > imw:
+            freeboxes.append((fb[0] + imw, fb[1], fb[2] - imw, imh))
+        if fb[3] > imh:
+            freeboxes.append((fb[0], fb[1] + imh, fb[2], fb[3] - imh))
+        # keep this sorted!
+        freeboxes.sort(key=lambda fb: fb[2] * fb[3])
+        return fb[0], fb[1], rotated
+
+
+class MaxRectsPacker(object):
+    '''MaxRects packing with the best short side fit heuristic: the free
+    space is kept as a list of maximal free rectangles, possibly
+    overlapping, and each box goes where the shorter leftover side is the
+    smallest.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def __init__(self, width, height, rotation=False):
+        self.rotation = rotation
+        self.freerects = [(0, 0, width, height)]
+
+    def find(self, w, h):
+        best = None
+        rotation = self.rotation
+        for fx, fy, fw, fh in self.freerects:
+            if fw >= w and fh >= h:
+                dw = fw - w
+                dh = fh - h
+                score = (min(dw, dh), max(dw, dh), fy, fx)
+                if best is None or score < best[0]:
+                    best = score, fx, fy, w, h, False
+            if rotation and fw >= h and fh >= w:
+                dw = fw - h
+                dh = fh - w
+                score = (min(dw, dh), max(dw, dh), fy, fx)
+                if best is None or score < best[0]:
+                    best = score, fx, fy, h, w, True
+        return best
+
+    def place(self, found):
+        score, x, y, w, h, rotated = found
+        x2 = x + w
+        y2 = y + h
+        kept = []
+        splitted = []
+        for rect in self.freerects:
+            rx, ry, rw, rh = rect
+            rx2 = rx + rw
+            ry2 = ry + rh
+            if x >= rx2 or x2 <= rx or y >= ry2 or y2 <= ry:
+                kept.append(rect)
+                continue
+            # split the intersected rectangle in up to 4 maximal ones
+            if x > rx:
+                splitted.append((rx, ry, x - rx, rh))
+            if x2 < rx2:
+                splitted.append((x2, ry, rx2 - x2, rh))
+            if y > ry:
+                splitted.append((rx, ry, rw, y - ry))
+            if y2 < ry2:
+                splitted.append((rx, y2, rw, ry2 - y2))
+
+        # remove the new rectangles contained in another one. The kept
+        # rectangles cannot be contained in a new one, as they were not
+        # contained in the rectangle it comes from.
+        freerects = kept
+        for i, rect in enumerate(splitted):
+            rx, ry, rw, rh = rect
+            rx2 = rx + rw
+            ry2 = ry + rh
+            contained = False
+            for j, other in enumerate(splitted):
+                if i == j:
+                    continue
+                ox, oy, ow, oh = other
+                if (ox <= rx and oy <= ry and ox + ow >= rx2 and
+                        oy + oh >= ry2 and (other != rect or j < i)):
+                    contained = True
+                    break
+            if not contained:
+                for ox, oy, ow, oh in kept:
+                    if (ox <= rx and oy <= ry and ox + ow >= rx2 and
+                            oy + oh >= ry2):
+                        contained = True
+                        break
+            if not contained:
+                freerects.append(rect)
+        self.freerects = freerects
+        return x, y, rotated
+
+
+class SkylinePacker(object):
+    '''Skyline packing with the bottom-left heuristic: the used space is
+    described by its skyline, a list of segments, and each box goes where
+    its bottom side is the highest (closest to the top-left origin).
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def __init__(self, width, height, rotation=False):
+        self.rotation = rotation
+        self.width = width
+        self.height = height
+        # the segment format is: x, y, w
+        self.skyline = [(0, 0, width)]
+
+    def _fit(self, index, w, h):
+        # return the y where a box of w x h can be placed on the segment
+        # index, or None
+        skyline = self.skyline
+        x = skyline[index][0]
+        if x + w > self.width:
+            return
+        y = 0
+        remaining = w
+        while remaining > 0:
+            sx, sy, sw = skyline[index]
+            if sy > y:
+                y = sy
+            if y + h > self.height:
+                return
+            remaining -= sw
+            index += 1
+        return y
+
+    def find(self, w, h):
+        best = None
+        rotation = self.rotation
+        for index, segment in enumerate(self.skyline):
+            y = self._fit(index, w, h)
+            if y is not None:
+                score = (y + h, segment[0])
+                if best is None or score < best[0]:
+                    best = score, index, segment[0], y, w, h, False
+            if rotation:
+                y = self._fit(index, h, w)
+                if y is not None:
+                    score = (y + w, segment[0])
+                    if best is None or score < best[0]:
+                        best = score, index, segment[0], y, h, w, True
+        return best
+
+    def place(self, found):
+        score, index, x, y, w, h, rotated = found
+        x2 = x + w
+        skyline = self.skyline
+        # replace the segments covered by the box with the new one
+        end = index
+        while end < len(skyline) and skyline[end][0] < x2:
+            end += 1
+        last = skyline[end - 1]
+        new = [(x, y + h, w)]
+        if last[0] + last[2] > x2:
+            new.append((x2, last[1], last[0] + last[2] - x2))
+        skyline[index:end] = new
+
+        # merge the neighbour segments of the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            prev = merged[-1]
+            if prev[1] == segment[1]:
+                merged[-1] = (prev[0], prev[1], prev[2] + segment[2])
+            else:
+                merged.append(segment)
+        self.skyline = merged
+        return x, y, rotated
 
 
 class Atlas(EventDispatcher):
@@ -149,6 +392,15 @@ class Atlas(EventDispatcher):
     to {}.
     '''
 
+    packers = {
+        'guillotine': GuillotinePacker,
+        'maxrects': MaxRectsPacker,
+        'skyline': SkylinePacker}
+    '''Packing algorithms available for :meth:`create`, by name.
+
+    .. versionadded:: 1.8.1
+    '''
+
     def _get_filename(self):
         return self._filename
 
@@ -169,9 +421,10 @@ class Atlas(EventDispatcher):
 
     def _load(self):
         # late import to prevent recursive import.
-        global CoreImage
+        global CoreImage, TextureRegion
         if CoreImage is None:
             from kivy.core.image import Image as CoreImage
+            from kivy.graphics.texture import TextureRegion
 
         # must be a name finished by .atlas ?
         filename = self._filename
@@ -195,13 +448,20 @@ class Atlas(EventDispatcher):
             # for all the uid, load the image, get the region, and put
             # it in our dict.
             for meta_id, meta_coords in ids.items():
-                x, y, w, h = meta_coords
-                textures[meta_id] = ci.texture.get_region(*meta_coords)
+                if len(meta_coords) > 4 and meta_coords[4]:
+                    # the image is stored rotated in the atlas
+                    x, y, w, h = meta_coords[:4]
+                    textures[meta_id] = TextureRegion(
+                        x, y, w, h, ci.texture, rotated=True)
+                else:
+                    textures[meta_id] = ci.texture.get_region(
+                        *meta_coords[:4])
 
         self.textures = textures
 
     @staticmethod
-    def create(outname, filenames, size, padding=2, use_path=False):
+    def create(outname, filenames, size, padding=2, use_path=False,
+               algorithm='guillotine', rotation=False, workers=1):
         '''This method can be used to create an atlas manually from a set of
         images.
 
@@ -235,9 +495,23 @@ class Atlas(EventDispatcher):
                 ``../data/tiles/green_grass.png``, the id will be
                 ``green_grass``. If `use_path` is True, it will be
                 ``data_tiles_green_grass``.
+            `algorithm`: str, defaults to 'guillotine'
+                Packing algorithm, one of 'guillotine', 'maxrects' or
+                'skyline'. 'maxrects' usually wastes the least space, and
+                'skyline' is the fastest. See :attr:`packers`.
+            `rotation`: bool, defaults to False
+                If True, the images can be rotated by 90 degrees to fit
+                better. The rotated images are marked in the ``.atlas`` file,
+                and displayed back in their original orientation.
+            `workers`: int, defaults to 1
+                Number of processes used to read the images and compose the
+                atlas images. If None, use one process per CPU.
 
             .. versionchanged:: 1.8.0
                 Parameter use_path added
+
+            .. versionchanged:: 1.8.1
+                Parameters algorithm, rotation and workers added
         '''
         # Thanks to
         # omnisaurusgames.com/2011/06/texture-atlas-generation-using-python/
@@ -253,112 +527,74 @@ class Atlas(EventDispatcher):
         else:
             size_w = size_h = int(size)
 
-        # open all of the images
-        ims = list()
-        for f in filenames:
-            fp = open(f)
-            im = Image.open(fp)
-            im.load()
-            fp.close()
-            ims.append((f, im))
-
-        # sort by image area
-        ims = sorted(ims, key=lambda im: im[1].size[0] * im[1].size[1],
-                     reverse=True)
-
-        # free boxes are empty space in our output image set
-        # the freebox tuple format is: outidx, x, y, w, h
-        freeboxes = [(0, 0, 0, size_w, size_h)]
-        numoutimages = 1
-
-        # full boxes are areas where we have placed images in the atlas
-        # the full box tuple format is: image, outidx, x, y, w, h, filename
-        fullboxes = []
-
-        # do the actual atlasing by sticking the largest images we can
-        # have into the smallest valid free boxes
-        for imageinfo in ims:
-            im = imageinfo[1]
-            imw, imh = im.size
-            imw += padding
-            imh += padding
-            if imw > size_w or imh > size_h:
-                Logger.error(
-                    'Atlas: image %s is larger than the atlas size!' %
-                    imageinfo[0])
-                return
+        if algorithm not in Atlas.packers:
+            raise ValueError('Atlas: unknown algorithm %r' % algorithm)
 
-            inserted = False
-            while not inserted:
-                for idx, fb in enumerate(freeboxes):
-                    # find the smallest free box that will contain this image
-                    if fb[3] >= imw and fb[4] >= imh:
-                        # we found a valid spot! Remove the current
-                        # freebox, and split the leftover space into (up to)
-                        # two new freeboxes
-                        del freeboxes[idx]
-                        if fb[3] > imw:
-                            freeboxes.append((
-                                fb[0], fb[1] + imw, fb[2],
-                                fb[3] - imw, imh))
-
-                        if fb[4] > imh:
-                            freeboxes.append((
-                                fb[0], fb[1], fb[2] + imh,
-                                fb[3], fb[4] - imh))
-
-                        # keep this sorted!
-                        freeboxes = sorted(freeboxes,
-                                           key=lambda fb: fb[3] * fb[4])
-                        fullboxes.append((im,
-                                          fb[0], fb[1] + padding,
-                                          fb[2] + padding, imw - padding,
-                                          imh - padding, imageinfo[0]))
-                        inserted = True
-                        break
-
-                if not inserted:
-                    # oh crap - there isn't room in any of our free
-                    # boxes, so we have to add a new output image
-                    freeboxes.append((numoutimages, 0, 0, size_w, size_h))
-                    numoutimages += 1
-
-        # now that we've figured out where everything goes, make the output
-        # images and blit the source images to the approriate locations
-        Logger.info('Atlas: create an {0}x{1} rgba image'.format(size_w,
-                                                                 size_h))
-        outimages = [Image.new('RGBA', (size_w, size_h))
-                     for i in range(0, int(numoutimages))]
-        for fb in fullboxes:
-            x, y = fb[2], fb[3]
-            out = outimages[fb[1]]
-            out.paste(fb[0], (fb[2], fb[3]))
-            w, h = fb[0].size
-            if padding > 1:
-                out.paste(fb[0].crop((0, 0, w, 1)), (x, y - 1))
-                out.paste(fb[0].crop((0, h - 1, w, h)), (x, y + h))
-                out.paste(fb[0].crop((0, 0, 1, h)), (x - 1, y))
-                out.paste(fb[0].crop((w - 1, 0, w, h)), (x + w, y))
-
-        # save the output images
-        for idx, outimage in enumerate(outimages):
-            outimage.save('%s-%d.png' % (outname, idx))
+        pool = None
+        if workers is None or workers > 1:
+            from multiprocessing import Pool
+            pool = Pool(workers)
+        try:
+            # read the size of all the images
+            if pool is not None:
+                sizes = pool.map(_atlas_image_size, filenames)
+            else:
+                sizes = [_atlas_image_size(f) for f in filenames]
+
+            # find a place for each image
+            boxes = [(w + padding, h + padding) for w, h in sizes]
+            for f, (w, h) in zip(filenames, boxes):
+                if ((w > size_w or h > size_h) and
+                        (not rotation or h > size_w or w > size_h)):
+                    Logger.error(
+                        'Atlas: image %s is larger than the atlas size!' % f)
+                    return
+            places, numoutimages = Atlas.pack(boxes, size_w, size_h,
+                                              algorithm, rotation)
+
+            # full boxes are areas where we have placed images in the atlas
+            # the full box tuple format is:
+            # outidx, x, y, w, h, filename, rotated
+            fullboxes = []
+            pages = [[] for x in range(numoutimages)]
+            for f, (w, h), place in zip(filenames, sizes, places):
+                outidx, x, y, rotated = place
+                fullboxes.append((outidx, x + padding, y + padding, w, h, f,
+                                  rotated))
+                pages[outidx].append((f, x + padding, y + padding, rotated))
+
+            # now that we've figured out where everything goes, make the
+            # output images and blit the source images to the approriate
+            # locations
+            Logger.info('Atlas: create an {0}x{1} rgba image'.format(size_w,
+                                                                     size_h))
+            jobs = [('%s-%d.png' % (outname, idx), (size_w, size_h), padding,
+                     page) for idx, page in enumerate(pages)]
+            if pool is not None:
+                pool.map(_atlas_compose, jobs)
+            else:
+                for job in jobs:
+                    _atlas_compose(job)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         # write out an json file that says where everything ended up
         meta = {}
         for fb in fullboxes:
-            fn = '%s-%d.png' % (basename(outname), fb[1])
+            fn = '%s-%d.png' % (basename(outname), fb[0])
             if fn not in meta:
                 d = meta[fn] = {}
             else:
                 d = meta[fn]
 
-            # fb[6] contain the filename
+            # fb[5] contain the filename
             if use_path:
                 # use the path with separators replaced by _
                 # example '../data/tiles/green_grass.png' becomes
                 # 'data_tiles_green_grass'
-                uid = splitext(fb[6])[0]
+                uid = splitext(fb[5])[0]
                 # remove leading dots and slashes
                 uid = uid.lstrip('./\\')
                 # replace remaining slashes with _
@@ -366,10 +602,14 @@ class Atlas(EventDispatcher):
             else:
                 # for example, '../data/tiles/green_grass.png'
                 # just get only 'green_grass' as the uniq id.
-                uid = splitext(basename(fb[6]))[0]
+                uid = splitext(basename(fb[5]))[0]
 
-            x, y, w, h = fb[2:6]
-            d[uid] = x, size_h - y - h, w, h
+            x, y, w, h = fb[1:5]
+            if fb[6]:
+                # the image covers h x w pixels in the atlas image
+                d[uid] = x, size_h - y - w, w, h, 1
+            else:
+                d[uid] = x, size_h - y - h, w, h
 
         outfn = '%s.atlas' % outname
         with open(outfn, 'w') as fd:
@@ -377,23 +617,71 @@ class Atlas(EventDispatcher):
 
         return outfn, meta
 
+    @staticmethod
+    def pack(sizes, width, height, algorithm='guillotine', rotation=False):
+        '''Find a place for boxes of the given sizes in as few images of
+        `width` x `height` as possible. The biggest boxes are placed first,
+        each one at the best place of all the images according to the
+        algorithm.
+
+        Return a tuple (places, count) where places is a list of (image
+        index, x, y, rotated) for each size, with the origin at the top-left
+        corner, and count the number of images needed.
+
+        .. versionadded:: 1.8.1
+        '''
+        cls = Atlas.packers[algorithm]
+        bins = []
+        places = [None] * len(sizes)
+        order = sorted(range(len(sizes)),
+                       key=lambda i: sizes[i][0] * sizes[i][1], reverse=True)
+        for i in order:
+            w, h = sizes[i]
+            best = None
+            for idx, packer in enumerate(bins):
+                found = packer.find(w, h)
+                if found is not None and (best is None or
+                                          found[0] < best[1][0]):
+                    best = idx, found
+            if best is None:
+                # no room left, add a new output image
+                packer = cls(width, height, rotation)
+                bins.append(packer)
+                found = packer.find(w, h)
+                if found is None:
+                    raise ValueError('Atlas: box %dx%d is larger than the '
+                                     'atlas size' % (w, h))
+                best = len(bins) - 1, found
+            idx, found = best
+            x, y, rotated = bins[idx].place(found)
+            places[i] = idx, x, y, rotated
+        return places, len(bins)
+
+
 if __name__ == '__main__':
 
     import sys
     argv = sys.argv[1:]
     if len(argv) < 3:
         print('Usage: python -m kivy.atlas [--use-path] '
-              '[--padding=2] <outname> '
+              '[--padding=2] [--algorithm=guillotine|maxrects|skyline] '
+              '[--rotation] [--workers=N] <outname> '
               '<size|512x256> <img1.png> [<img2.png>, ...]')
         sys.exit(1)
 
-    options = {'use_path': False}
+    options = {'use_path': False, 'workers': None}
     while True:
         option = argv[0]
         if option == '--use-path':
             options['use_path'] = True
         elif option.startswith('--padding='):
             options['padding'] = int(option.split('=', 1)[-1])
+        elif option.startswith('--algorithm='):
+            options['algorithm'] = option.split('=', 1)[-1]
+        elif option == '--rotation':
+            options['rotation'] = True
+        elif option.startswith('--workers='):
+            options['workers'] = int(option.split('=', 1)[-1])
         elif option[:2] == '--':
             print('Unknow option {}'.format(option))
             sys.exit(1)
@@ -404,7 +692,7 @@ if __name__ == '__main__':
     outname = argv[0]
     try:
         if 'x' in argv[1]:
-            size = map(int, argv[1].split('x', 1))
+            size = list(map(int, argv[1].split('x', 1)))
         else:
             size = int(argv[1])
     except ValueError:
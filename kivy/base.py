@@ -10,6 +10,24 @@ result in unpredicatable behavior.
 Event loop management
 ---------------------
 
+Lazy mode
+~~~~~~~~~
+
+.. versionadded:: 1.8.1
+
+By default, the event loop runs a frame every `1 / maxfps` seconds, even when
+nothing changes on the screen. In lazy mode (the `lazy_loop` token of the
+`kivy` section of the configuration, or :attr:`EventLoopBase.lazy`), the loop
+waits when no clock event is due, no input is pending and the window doesn't
+need to be redrawn. It wakes up for the next scheduled event, or when
+:meth:`EventLoopBase.wakeup` is called: scheduling an event on the
+:class:`~kivy.clock.Clock`, from any thread, calls it, and so do the input
+providers when they receive new events.
+
+A custom input provider fed by a thread must call :meth:`EventLoopBase.wakeup`
+when it queues new events, or they will be dispatched only when the loop wakes
+up for another reason.
+
 '''
 
 __all__ = (
@@ -22,7 +40,11 @@ __all__ = (
     'stopTouchApp',
 )
 
+import os
 import sys
+from select import select, error as select_error
+from threading import Event
+from time import time
 from kivy.config import Config
 from kivy.logger import Logger
 from kivy.clock import Clock
@@ -91,6 +113,65 @@ class ExceptionManagerBase:
 ExceptionManager = register_context('ExceptionManager', ExceptionManagerBase)
 
 
+class _EventLoopWaker(object):
+    # Wake up the event loop waiting in lazy mode, from any thread. On posix,
+    # a byte is written in a pipe watched by select(), otherwise a
+    # threading.Event is used.
+
+    def __init__(self):
+        super(_EventLoopWaker, self).__init__()
+        # set until the loop has been woken up, to write only one byte
+        self.signaled = False
+        self._event = None
+        if os.name == 'posix':
+            import fcntl
+            self._read_fd, self._write_fd = os.pipe()
+            for fd in (self._read_fd, self._write_fd):
+                flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+                fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        else:
+            self._event = Event()
+
+    def wake(self):
+        if self.signaled:
+            return
+        self.signaled = True
+        if self._event is not None:
+            self._event.set()
+            return
+        try:
+            os.write(self._write_fd, b'\0')
+        except OSError:
+            # the pipe is full, the loop will wake up anyway
+            pass
+
+    def wait(self, timeout):
+        # wait until woken up or `timeout` (None for ever), return True if
+        # woken up
+        if self._event is not None:
+            self._event.wait(timeout)
+            woken = self._event.is_set()
+            self._event.clear()
+            self.signaled = False
+            return woken
+        if not self.signaled:
+            try:
+                ready = select([self._read_fd], [], [], timeout)[0]
+            except (select_error, OSError):
+                # interrupted by a signal
+                return True
+            if not ready:
+                return False
+        # the events queued before this point are dispatched in the next
+        # frame
+        self.signaled = False
+        try:
+            os.read(self._read_fd, 512)
+        except OSError:
+            pass
+        return True
+
+
 class EventLoopBase(EventDispatcher):
     '''Main event loop. This loop handles the updating of input and
     dispatching events.
@@ -102,6 +183,8 @@ class EventLoopBase(EventDispatcher):
         super(EventLoopBase, self).__init__()
         self.quit = False
         self.input_events = []
+        # (type, uid) of the events in input_events, to queue each one once
+        self._input_keys = set()
         self.postproc_modules = []
         self.status = 'idle'
         self.input_providers = []
@@ -109,6 +192,14 @@ class EventLoopBase(EventDispatcher):
         self.event_listeners = []
         self.window = None
         self.me_list = []
+        #: If True, the loop waits when there is nothing to do, instead of
+        #: running frames at `maxfps`. It's initialized from the `lazy_loop`
+        #: token of the `kivy` section of the configuration. See the module
+        #: documentation.
+        #:
+        #: .. versionadded:: 1.8.1
+        self.lazy = Config.getdefaultint('kivy', 'lazy_loop', 0) == 1
+        self._waker = _EventLoopWaker()
 
     @property
     def touches(self):
@@ -187,6 +278,7 @@ class EventLoopBase(EventDispatcher):
 
         # ensure any restart will not break anything later.
         self.input_events = []
+        self._input_keys.clear()
 
         self.status = 'stopped'
         self.dispatch('on_stop')
@@ -283,14 +375,25 @@ class EventLoopBase(EventDispatcher):
         me.grab_state = False
 
     def _dispatch_input(self, *ev):
-        # remove the save event for the touch if exist
-        if ev in self.input_events:
-            self.input_events.remove(ev)
+        # the motion events are updated in place by the providers: if the
+        # same event is already queued, it will be dispatched with its last
+        # state, don't queue it again
+        key = (ev[0], ev[1].uid)
+        keys = self._input_keys
+        if key in keys:
+            return
+        keys.add(key)
         self.input_events.append(ev)
 
     def dispatch_input(self):
         '''Called by idle() to read events from input providers, pass events to
         postproc, and dispatch final events.
+
+        .. versionchanged:: 1.8.1
+            The events are coalesced: a motion event updated many times
+            since the last frame is dispatched once, with its last state. Its
+            intermediate positions can be kept in
+            :attr:`~kivy.input.motionevent.MotionEvent.history`.
         '''
 
         # first, aquire input events
@@ -301,22 +404,88 @@ class EventLoopBase(EventDispatcher):
         for mod in self.postproc_modules:
             self.input_events = mod.process(events=self.input_events)
 
-        # real dispatch input
+        # real dispatch input. The events queued while dispatching are
+        # dispatched too, the ones not dispatched because of an exception are
+        # kept for the next frame.
+        self._input_keys.clear()
         input_events = self.input_events
-        pop = input_events.pop
         post_dispatch_input = self.post_dispatch_input
-        while input_events:
-            post_dispatch_input(*pop(0))
+        index = 0
+        try:
+            while index < len(input_events):
+                etype, me = input_events[index]
+                index += 1
+                # the positions go to the move, or to the end of the touch
+                if me.keep_history and etype != 'begin':
+                    me.flush_history()
+                post_dispatch_input(etype, me)
+        finally:
+            del input_events[:index]
+
+    def wakeup(self):
+        '''Wake up the loop if it's waiting in :attr:`lazy` mode, or make its
+        next wait return immediately. Can be called from any thread.
+
+        .. versionadded:: 1.8.1
+        '''
+        self._waker.wake()
+
+    def wait(self):
+        '''Called by :meth:`idle` in :attr:`lazy` mode. Wait until the next
+        scheduled event is due, :meth:`wakeup` is called or the window has
+        new events, if there are no touches, pending input events or
+        changes to draw. Return True if the loop has waited.
+
+        .. versionadded:: 1.8.1
+        '''
+        # the events scheduled from now on must stop the wait
+        Clock._wakeup = self._waker.wake
+        if self.me_list or self.input_events:
+            return False
+        window = self.window
+        if window is not None and (window.canvas.needs_redraw or
+                                   window.has_pending_events()):
+            return False
+        timeout = Clock.get_next_timeout()
+        if timeout == 0:
+            return False
+
+        # the window events can't wake up the loop, check them at
+        # lazy_poll_interval
+        interval = None
+        if window is not None:
+            interval = window.lazy_poll_interval
+        waker = self._waker
+        if interval is None:
+            waker.wait(timeout)
+            return True
+        deadline = None if timeout is None else time() + timeout
+        while True:
+            wait = interval
+            if deadline is not None:
+                wait = min(wait, deadline - time())
+                if wait <= 0:
+                    break
+            if waker.wait(wait) or window.has_pending_events():
+                break
+        return True
 
     def idle(self):
         '''This function is called after every frame. By default:
 
+           * it waits for something to do, in :attr:`lazy` mode.
            * it "ticks" the clock to the next frame.
            * it reads all input and dispatches events.
            * it dispatches `on_update`, `on_draw` and `on_flip` events to the
              window.
+
+        .. versionchanged:: 1.8.1
+            The :attr:`lazy` mode has been added.
         '''
 
+        if self.lazy:
+            self.wait()
+
         # update dt
         Clock.tick()
 
@@ -337,6 +506,9 @@ class EventLoopBase(EventDispatcher):
             window.dispatch('on_draw')
             window.dispatch('on_flip')
 
+        # the work of the frame is done, the lazy wait is not part of it
+        Clock.end_frame()
+
         # don't loop if we don't have listeners !
         if len(self.event_listeners) == 0:
             Logger.error('Base: No event listeners have been created')
@@ -22,13 +22,48 @@ timeout of 5 seconds::
 
 If the instance is NULL, the cache may have trashed it because you've
 not used the label for 5 seconds and you've reach the limit.
+
+Limits
+------
+
+.. versionchanged:: 1.8.1
+
+When an object is appended to a category that already holds `limit` objects,
+the least recently used object of the category is removed from the cache.
+
+A category can also be limited by memory with `size_limit`, in bytes. The size
+of an object is given by the `size` argument of :meth:`Cache.append`, or by its
+`cache_size` attribute if it has one: a
+:class:`~kivy.graphics.texture.Texture` reports the size of its GPU storage,
+and a :class:`~kivy.core.image.ImageData` the length of its buffers::
+
+    Cache.register('mytextures', size_limit=64 * 1024 * 1024)
+
+Timeouts and statistics
+-----------------------
+
+.. versionchanged:: 1.8.1
+
+The objects that have not been used for longer than their timeout are removed
+every second, at most :attr:`Cache.sweep_limit` objects are checked at once:
+when more objects are due, the sweep continues on the next frame. The number
+of hits, misses, evictions (objects removed because of a limit) and
+expirations (objects removed because of a timeout) of each category are
+available with :meth:`Cache.stats`::
+
+    >>> Cache.stats('kv.texture')
+    {'count': 123, 'size': 8388608, 'hits': 2045, 'misses': 130, ...}
 '''
 
 __all__ = ('Cache', )
 
 from os import environ
+from collections import OrderedDict
+from heapq import heapify, heappop, heappush
+from itertools import count
 from kivy.logger import Logger
 from kivy.clock import Clock
+from kivy.compat import PY2
 
 
 class Cache(object):
@@ -37,9 +72,15 @@ class Cache(object):
 
     _categories = {}
     _objects = {}
+    _expiry_counter = count()
+
+    #: Maximum number of objects checked for a timeout per frame.
+    #:
+    #: .. versionadded:: 1.8.1
+    sweep_limit = 100
 
     @staticmethod
-    def register(category, limit=None, timeout=None):
+    def register(category, limit=None, timeout=None, size_limit=None):
         '''Register a new category in the cache with the specified limit.
 
         :Parameters:
@@ -51,17 +92,34 @@ class Cache(object):
             `timeout` : double (optional)
                 Time after which to delete the object if it has not been used.
                 If None, no timeout is applied.
+            `size_limit` : int (optional)
+                Maximum size of the objects allowed in the cache, in bytes.
+                If None, no limit is applied.
+
+        .. versionchanged:: 1.8.1
+            `size_limit` has been added.
         '''
         Cache._categories[category] = {
             'limit': limit,
-            'timeout': timeout}
-        Cache._objects[category] = {}
+            'timeout': timeout,
+            'size_limit': size_limit,
+            'size': 0,
+            # heap of (deadline, counter, key, item), the deadlines are
+            # updated lazily when the entries are popped
+            'expiry': [],
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0}
+        # objects are kept from the least to the most recently used
+        Cache._objects[category] = OrderedDict()
         Logger.debug(
-            'Cache: register <%s> with limit=%s, timeout=%ss' %
-            (category, str(limit), str(timeout)))
+            'Cache: register <%s> with limit=%s, timeout=%ss, '
+            'size_limit=%s' %
+            (category, str(limit), str(timeout), str(size_limit)))
 
     @staticmethod
-    def append(category, key, obj, timeout=None):
+    def append(category, key, obj, timeout=None, size=None):
         '''Add a new object to the cache.
 
         :Parameters:
@@ -74,6 +132,15 @@ class Cache(object):
             `timeout` : double (optional)
                 Time after which to delete the object if it has not been used.
                 If None, no timeout is applied.
+            `size` : int (optional)
+                Size of the object in bytes, used for the `size_limit` of the
+                category. If None, the `cache_size` attribute of the object
+                is used, or 0.
+
+        .. versionchanged:: 1.8.1
+            The least recently used objects are removed when the `limit` or
+            the `size_limit` of the category is reached. `size` has been
+            added.
         '''
         #check whether obj should not be cached first
         if getattr(obj, '_no_cache', False):
@@ -84,15 +151,35 @@ class Cache(object):
             Logger.warning('Cache: category <%s> not exist' % category)
             return
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
-        Cache._objects[category][key] = {
+        if size is None:
+            size = getattr(obj, 'cache_size', 0)
+        objects = Cache._objects[category]
+        if key in objects:
+            Cache._remove_object(category, key)
+        item = objects[key] = {
             'object': obj,
             'timeout': timeout,
+            'size': size,
             'lastaccess': Clock.get_time(),
             'timestamp': Clock.get_time()}
+        cat['size'] += size
+        if timeout is not None:
+            expiry = cat['expiry']
+            heappush(expiry, (item['lastaccess'] + timeout,
+                              next(Cache._expiry_counter), key, item))
+            # drop the entries of the removed objects
+            if len(expiry) > 2 * len(objects) + 100:
+                expiry[:] = [x for x in expiry if objects.get(x[2]) is x[3]]
+                heapify(expiry)
+
+        # purge the least recently used objects, but keep the new one
+        limit = cat['limit']
+        size_limit = cat['size_limit']
+        while len(objects) > 1 and (
+                (limit is not None and len(objects) > limit) or
+                (size_limit is not None and cat['size'] > size_limit)):
+            Cache._purge_oldest(category)
+            cat['evictions'] += 1
 
     @staticmethod
     def get(category, key, default=None):
@@ -107,10 +194,24 @@ class Cache(object):
                 Default value to be returned if the key is not found.
         '''
         try:
-            Cache._objects[category][key]['lastaccess'] = Clock.get_time()
-            return Cache._objects[category][key]['object']
+            objects = Cache._objects[category]
+            item = objects[key]
         except Exception:
+            cat = Cache._categories.get(category)
+            if cat is not None:
+                cat['misses'] += 1
             return default
+        cat = Cache._categories.get(category)
+        if cat is not None:
+            cat['hits'] += 1
+        item['lastaccess'] = Clock.get_time()
+        # mark it as the most recently used
+        if PY2:
+            del objects[key]
+            objects[key] = item
+        else:
+            objects.move_to_end(key)
+        return item['object']
 
     @staticmethod
     def get_timestamp(category, key, default=None):
@@ -159,40 +260,35 @@ class Cache(object):
         '''
         try:
             if key is not None:
-                del Cache._objects[category][key]
+                Cache._remove_object(category, key)
             else:
-                Cache._objects[category] = {}
+                Cache._objects[category] = OrderedDict()
+                Cache._categories[category]['size'] = 0
+                Cache._categories[category]['expiry'] = []
         except Exception:
             pass
 
+    @staticmethod
+    def _remove_object(category, key):
+        item = Cache._objects[category].pop(key)
+        cat = Cache._categories.get(category)
+        if cat is not None:
+            cat['size'] -= item['size']
+
     @staticmethod
     def _purge_oldest(category, maxpurge=1):
-        print('PURGE', category)
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print('<<<', obj['lastaccess'])
-        n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print('=>', key, lastaccess, Clock.get_time())
-            except Exception:
-                return
-            del Cache._objects[category][key]
+        objects = Cache._objects[category]
+        for x in range(min(maxpurge, len(objects))):
+            key = next(iter(objects))
+            Cache._remove_object(category, key)
 
     @staticmethod
     def _purge_by_timeout(dt):
         curtime = Clock.get_time()
+        budget = Cache.sweep_limit
 
-        for category in Cache._objects:
-            if category not in Cache._categories:
-                continue
-            timeout = Cache._categories[category]['timeout']
+        for category, cat in list(Cache._categories.items()):
+            timeout = cat['timeout']
             if timeout is not None and dt > timeout:
                 # XXX got a lag ! that may be because the frame take lot of
                 # time to draw. and the timeout is not adapted to the current
@@ -200,34 +296,66 @@ class Cache(object):
                 # ie: if the timeout is 1 sec, and framerate go to 0.7, newly
                 # object added will be automaticly trashed.
                 timeout *= 2
-                Cache._categories[category]['timeout'] = timeout
+                cat['timeout'] = timeout
                 continue
 
-            for key in list(Cache._objects[category].keys())[:]:
-                lastaccess = Cache._objects[category][key]['lastaccess']
-                objtimeout = Cache._objects[category][key]['timeout']
+            objects = Cache._objects.get(category)
+            expiry = cat['expiry']
+            while expiry and expiry[0][0] < curtime:
+                if budget <= 0:
+                    # continue on the next frame
+                    Cache._trigger_sweep()
+                    return
+                budget -= 1
+                deadline, counter, key, item = heappop(expiry)
+                if objects is None or objects.get(key) is not item:
+                    # already removed or replaced
+                    continue
 
-                # take the object timeout if available
-                if objtimeout is not None:
-                    timeout = objtimeout
+                # the object may have been used since the entry was pushed
+                objtimeout = item['timeout']
+                if objtimeout is None:
+                    objtimeout = timeout
+                deadline = item['lastaccess'] + objtimeout
+                if curtime > deadline:
+                    Cache._remove_object(category, key)
+                    cat['expirations'] += 1
+                else:
+                    heappush(expiry, (deadline, counter, key, item))
 
-                # no timeout, cancel
-                if timeout is None:
-                    continue
+    @staticmethod
+    def stats(category=None):
+        '''Return the statistics of a category as a dict with the keys
+        `count`, `size`, `limit`, `size_limit`, `timeout`, `hits`, `misses`,
+        `evictions` and `expirations`. If `category` is None, return a dict
+        with the statistics of every category.
 
-                if curtime - lastaccess > timeout:
-                    del Cache._objects[category][key]
+        .. versionadded:: 1.8.1
+        '''
+        if category is None:
+            return dict((x, Cache.stats(x)) for x in Cache._categories)
+        cat = Cache._categories[category]
+        stats = dict((x, cat[x]) for x in (
+            'size', 'limit', 'size_limit', 'timeout', 'hits', 'misses',
+            'evictions', 'expirations'))
+        stats['count'] = len(Cache._objects.get(category, ()))
+        return stats
 
     @staticmethod
     def print_usage():
         '''Print the cache usage to the console.'''
         print('Cache usage :')
         for category in Cache._categories:
-            print(' * %s : %d / %s, timeout=%s' % (
-                category.capitalize(),
-                len(Cache._objects[category]),
-                str(Cache._categories[category]['limit']),
-                str(Cache._categories[category]['timeout'])))
+            stats = Cache.stats(category)
+            print(' * %s : %d / %s, %d / %s bytes, timeout=%s, '
+                  'hits=%d, misses=%d, evictions=%d, expirations=%d' % (
+                      category.capitalize(), stats['count'],
+                      str(stats['limit']), stats['size'],
+                      str(stats['size_limit']), str(stats['timeout']),
+                      stats['hits'], stats['misses'], stats['evictions'],
+                      stats['expirations']))
+
+Cache._trigger_sweep = Clock.create_trigger(Cache._purge_by_timeout)
 
 if 'KIVY_DOC_INCLUDE' not in environ:
     # install the schedule clock for purging
@@ -154,9 +154,49 @@ Even if x and y changes within one frame, the callback is only run once.
     :meth:`ClockBase.create_trigger` also has a timeout parameter that
     behaves exactly like :meth:`ClockBase.schedule_once`.
 
+Clock implementations
+---------------------
+
+.. versionadded:: 1.8.1
+
+The default :class:`ClockBase` checks every scheduled event on every frame,
+which is fine for a few dozen events but becomes costly when thousands of
+callbacks are scheduled. The :class:`ClockBaseHeap` keeps the events ordered
+by their deadline and only looks at the ones that are due. The clock is
+selected with the `kivy_clock` token of the `kivy` configuration section::
+
+    [kivy]
+    kivy_clock = heap
+
+Profiling
+---------
+
+.. versionadded:: 1.8.1
+
+To know which callbacks are eating the frame time, start the profiling on
+the clock. Each callback is then timed, and the statistics are collected per
+qualified callback name in a :class:`ClockProfiler`::
+
+    profiler = Clock.start_profiling()
+    # ... run the application for a while
+    print(profiler.dump())
+    stats = profiler.snapshot()
+    Clock.stop_profiling()
+
+The profiler also counts the frames that took more than `1 / maxfps`, from the
+end of the sleep of the clock to the end of the frame: the callbacks, the
+input dispatch and the drawing are counted, the time the clock sleeps to honor
+`maxfps` is not. The event loop marks the end of the frame after the window
+flip with :meth:`ClockBase.end_frame`, other loops can call it too, or the
+frame ends at the next :meth:`ClockBase.tick`. When the profiling is not
+started, the only overhead is a test per callback call.
+The :mod:`~kivy.modules.monitor` module can start it for you with its
+`profile` option.
+
 '''
 
-__all__ = ('Clock', 'ClockBase', 'ClockEvent', 'mainthread')
+__all__ = ('Clock', 'ClockBase', 'ClockBaseHeap', 'ClockEvent',
+           'ClockProfiler', 'mainthread')
 
 from sys import platform
 from os import environ
@@ -164,6 +204,11 @@ from kivy.context import register_context
 from kivy.weakmethod import WeakMethod
 from kivy.config import Config
 from kivy.logger import Logger
+from collections import deque
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Lock
+from timeit import default_timer as _profile_time
 import time
 
 try:
@@ -227,6 +272,180 @@ def _hash(cb):
             return 'default'
 
 
+#: Lock guarding the event lists and the heap of the clocks: the events are
+#: scheduled from any thread (:func:`mainthread`, triggers called by the
+#: :class:`~kivy.loader.Loader` or :class:`~kivy.network.urlrequest.UrlRequest`
+#: workers), while the main thread unlinks them during the tick.
+_events_lock = Lock()
+
+
+class _ClockEventList(object):
+    # Intrusive doubly linked list of ClockEvent: the events are the nodes,
+    # so adding and removing an event is O(1) and doesn't allocate. An event
+    # can only be linked in one list at a time. The public methods take
+    # _events_lock, the underscore ones expect the caller to hold it.
+
+    __slots__ = ('first', 'last', 'size')
+
+    def __init__(self):
+        self.first = self.last = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        # iterate over a copy, the callbacks can change the list
+        events = []
+        with _events_lock:
+            event = self.first
+            while event is not None:
+                events.append(event)
+                event = event._next
+        return iter(events)
+
+    def append(self, event):
+        with _events_lock:
+            self._append(event)
+
+    def remove(self, event):
+        with _events_lock:
+            self._remove(event)
+
+    def _append(self, event):
+        if event._list is self:
+            return
+        if event._list is not None:
+            event._list._remove(event)
+        event._list = self
+        event._prev = self.last
+        event._next = None
+        if self.last is None:
+            self.first = event
+        else:
+            self.last._next = event
+        self.last = event
+        self.size += 1
+
+    def _remove(self, event):
+        if event._list is not self:
+            return
+        prev_event, next_event = event._prev, event._next
+        if prev_event is None:
+            self.first = next_event
+        else:
+            prev_event._next = next_event
+        if next_event is None:
+            self.last = prev_event
+        else:
+            next_event._prev = prev_event
+        event._list = event._prev = event._next = None
+        self.size -= 1
+
+
+def _callback_name(callback):
+    # qualified name of a callback, used as a key for the profiling
+    func = getattr(callback, 'func', callback)
+    name = getattr(func, '__qualname__', None)
+    if name is None:
+        name = getattr(func, '__name__', None)
+        if name is None:
+            return repr(func)
+        obj = getattr(func, '__self__', None)
+        if obj is not None:
+            name = '%s.%s' % (type(obj).__name__, name)
+    module = getattr(func, '__module__', None)
+    if module:
+        return '%s.%s' % (module, name)
+    return name
+
+
+class ClockProfiler(object):
+    '''Statistics collected by a clock between
+    :meth:`ClockBase.start_profiling` and :meth:`ClockBase.stop_profiling`.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    #: Maximum number of overrun frames kept in :attr:`overrun_frames`.
+    max_overrun_frames = 100
+
+    def __init__(self, budget):
+        #: Time allowed for one frame (1 / maxfps), in seconds.
+        self.budget = budget
+        #: Number of frames seen since the start.
+        self.frames = 0
+        #: Number of frames that took more than the :attr:`budget`.
+        self.overruns = 0
+        #: The last overrun frames, as a list of (frame number, time spent in
+        #: the frame, without the sleep of the clock).
+        self.overrun_frames = deque(maxlen=self.max_overrun_frames)
+        #: Statistics per callback name, as [count, cumulative time, max
+        #: time].
+        self.callbacks = {}
+
+    def call(self, callback, dt):
+        start = _profile_time()
+        try:
+            return callback(dt)
+        finally:
+            duration = _profile_time() - start
+            name = _callback_name(callback)
+            stats = self.callbacks.get(name)
+            if stats is None:
+                self.callbacks[name] = [1, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+
+    def add_frame(self, frame, worktime):
+        # worktime excludes the sleep of the clock
+        self.frames += 1
+        if worktime > self.budget:
+            self.overruns += 1
+            self.overrun_frames.append((frame, worktime))
+
+    def reset(self):
+        '''Forget all the statistics collected until now.
+        '''
+        self.frames = self.overruns = 0
+        self.overrun_frames.clear()
+        self.callbacks = {}
+
+    def snapshot(self):
+        '''Return a copy of the statistics as a dict with the keys `frames`,
+        `overruns`, `overrun_frames`, `budget` and `callbacks`. The
+        `callbacks` value is a list of dicts with the keys `name`, `count`,
+        `total` and `max`, sorted by decreasing total time.
+        '''
+        callbacks = [{'name': name, 'count': stats[0], 'total': stats[1],
+                      'max': stats[2]}
+                     for name, stats in self.callbacks.items()]
+        callbacks.sort(key=lambda x: x['total'], reverse=True)
+        return {'frames': self.frames,
+                'overruns': self.overruns,
+                'overrun_frames': list(self.overrun_frames),
+                'budget': self.budget,
+                'callbacks': callbacks}
+
+    def dump(self, limit=20):
+        '''Return a text report of the `limit` most expensive callbacks.
+        '''
+        snapshot = self.snapshot()
+        lines = ['Clock profile: {0} frames, {1} over the {2:.1f}ms '
+                 'budget'.format(snapshot['frames'], snapshot['overruns'],
+                                 snapshot['budget'] * 1000.),
+                 '{0:>8} {1:>10} {2:>10}  {3}'.format(
+                     'calls', 'total ms', 'max ms', 'callback')]
+        for stats in snapshot['callbacks'][:limit]:
+            lines.append('{0:>8} {1:>10.3f} {2:>10.3f}  {3}'.format(
+                stats['count'], stats['total'] * 1000.,
+                stats['max'] * 1000., stats['name']))
+        return '\n'.join(lines)
+
+
 class ClockEvent(object):
 
     def __init__(self, clock, loop, callback, timeout, starttime, cid):
@@ -239,18 +458,20 @@ class ClockEvent(object):
         self._is_triggered = False
         self._last_dt = starttime
         self._dt = 0.
+        # intrusive handle: the _ClockEventList the event is linked in, and
+        # the heap entry for ClockBaseHeap.
+        self._list = None
+        self._prev = None
+        self._next = None
+        self._entry = None
 
     def __call__(self, *largs):
         # if the event is not yet triggered, do it !
         if self._is_triggered is False:
             self._is_triggered = True
-            events = self.clock._events
-            cid = self.cid
-            if cid not in events:
-                events[cid] = []
-            events[cid].append(self)
             # update starttime
             self._last_dt = self.clock._last_tick
+            self.clock._add_event(self)
             return True
 
     def get_callback(self):
@@ -267,11 +488,13 @@ class ClockEvent(object):
         return self._is_triggered
 
     def cancel(self):
-        if self._is_triggered:
-            events = self.clock._events
-            cid = self.cid
-            if cid in events and self in events[cid]:
-                events[cid].remove(self)
+        '''Unschedule the event, in constant time.
+
+        .. versionchanged:: 1.8.1
+            Events created with :meth:`ClockBase.schedule_once` or
+            :meth:`ClockBase.schedule_interval` can be cancelled too.
+        '''
+        self.clock._remove_event(self)
         self._is_triggered = False
 
     def do(self, dt):
@@ -306,7 +529,11 @@ class ClockEvent(object):
             self._is_triggered = False
 
         # call the callback
-        ret = callback(self._dt)
+        profiler = self.clock._profiler
+        if profiler is None:
+            ret = callback(self._dt)
+        else:
+            ret = profiler.call(callback, self._dt)
 
         # if it's a once event, don't care about the result
         # just remove the event
@@ -329,8 +556,9 @@ class ClockBase(_ClockBase):
     '''
     __slots__ = ('_dt', '_last_fps_tick', '_last_tick', '_fps', '_rfps',
                  '_start_tick', '_fps_counter', '_rfps_counter', '_events',
-                 '_frames', '_frames_displayed',
-                 '_max_fps', 'max_iteration')
+                 '_frames', '_frames_displayed', '_events_to_release',
+                 '_max_fps', '_profiler', 'max_iteration', '_wakeup',
+                 '_frame_ended')
 
     MIN_SLEEP = 0.005
     SLEEP_UNDERSHOOT = MIN_SLEEP - 0.001
@@ -347,7 +575,14 @@ class ClockBase(_ClockBase):
         self._frames = 0
         self._frames_displayed = 0
         self._events = {}
+        self._events_to_release = []
         self._max_fps = float(Config.getint('graphics', 'maxfps'))
+        self._profiler = None
+        # whether the current frame has been given to the profiler
+        self._frame_ended = True
+        # called when an event is scheduled, to wake up the event loop
+        # waiting in lazy mode
+        self._wakeup = None
 
         #: .. versionadded:: 1.0.5
         #:     When a schedule_once is used with -1, you can add a limit on
@@ -384,6 +619,9 @@ class ClockBase(_ClockBase):
         The default clock has a tick() function called by the core Kivy
         framework.'''
 
+        # the previous frame ends here if end_frame() was not called
+        self.end_frame()
+
         self._release_references()
         if self._fps_counter % 100 == 0:
             self._remove_empty()
@@ -406,6 +644,7 @@ class ClockBase(_ClockBase):
         self._frames += 1
         self._fps_counter += 1
         self._last_tick = current
+        self._frame_ended = False
 
         # calculate fps things
         if self._last_fps_tick is None:
@@ -423,6 +662,21 @@ class ClockBase(_ClockBase):
 
         return self._dt
 
+    def end_frame(self):
+        '''Mark the end of the current frame, after its drawing. The time
+        spent since the end of the sleep of :meth:`tick` is given to the
+        :attr:`profiler`. Called by the :class:`~kivy.base.EventLoopBase`
+        after the window flip, or by the next :meth:`tick`.
+
+        .. versionadded:: 1.8.1
+        '''
+        if self._frame_ended:
+            return
+        self._frame_ended = True
+        if self._profiler is not None:
+            self._profiler.add_frame(
+                self._frames, _default_time() - self._last_tick)
+
     def tick_draw(self):
         '''Tick the drawing counter.
         '''
@@ -452,6 +706,58 @@ class ClockBase(_ClockBase):
         '''Get the time in seconds from the application start.'''
         return self._last_tick - self._start_tick
 
+    def get_next_timeout(self):
+        '''Return the time, in seconds, until the next scheduled event is due:
+        0 if an event must be processed in the next frame, or None if no event
+        is scheduled. Used by the :attr:`~kivy.base.EventLoopBase.lazy` event
+        loop to know how long it can wait.
+
+        .. versionadded:: 1.8.1
+        '''
+        timeout = None
+        now = _default_time()
+        for events in list(self._events.values()):
+            for event in events:
+                if event.timeout <= 0:
+                    return 0
+                remaining = event._last_dt + event.timeout - 0.005 - now
+                if remaining <= 0:
+                    return 0
+                if timeout is None or remaining < timeout:
+                    timeout = remaining
+        return timeout
+
+    @property
+    def profiler(self):
+        '''The :class:`ClockProfiler` in use, or None if the profiling is not
+        started.
+
+        .. versionadded:: 1.8.1
+        '''
+        return self._profiler
+
+    def start_profiling(self):
+        '''Start to record the time spent in each callback, and the frames
+        that took more than `1 / maxfps`. Return the new
+        :class:`ClockProfiler`. Check module documentation for more
+        information.
+
+        .. versionadded:: 1.8.1
+        '''
+        fps = self._max_fps if self._max_fps > 0 else 60.
+        self._profiler = ClockProfiler(1. / fps)
+        return self._profiler
+
+    def stop_profiling(self):
+        '''Stop the profiling, and return the :class:`ClockProfiler` used
+        until now, or None if the profiling was not started.
+
+        .. versionadded:: 1.8.1
+        '''
+        profiler = self._profiler
+        self._profiler = None
+        return profiler
+
     def create_trigger(self, callback, timeout=0):
         '''Create a Trigger event. Check module documentation for more
         information.
@@ -477,10 +783,7 @@ class ClockBase(_ClockBase):
         cid = _hash(callback)
         event = ClockEvent(
             self, False, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        self._add_event(event)
         return event
 
     def schedule_interval(self, callback, timeout):
@@ -490,54 +793,81 @@ class ClockBase(_ClockBase):
         cid = _hash(callback)
         event = ClockEvent(
             self, True, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        self._add_event(event)
         return event
 
     def unschedule(self, callback):
         '''Remove a previously scheduled event.
+
+        .. versionchanged:: 1.8.1
+            Unscheduling a :class:`ClockEvent` is done in constant time.
         '''
-        events = self._events
         if isinstance(callback, ClockEvent):
-            # already done, nothing to schedule
-            if callback.is_done:
-                return
-            cid = callback.cid
-            if cid in events:
-                for event in events[cid][:]:
-                    if event is callback:
-                        events[cid].remove(event)
-        else:
-            cid = _hash(callback)
-            if cid in events:
-                for event in events[cid][:]:
-                    if event.get_callback() == callback:
-                        events[cid].remove(event)
+            callback.cancel()
+            return
+        events = self._events
+        cid = _hash(callback)
+        if cid in events:
+            for event in events[cid]:
+                if event.get_callback() == callback:
+                    self._remove_event(event)
+
+    def _add_event(self, event):
+        events = self._events
+        cid = event.cid
+        with _events_lock:
+            event_list = events.get(cid)
+            if event_list is None:
+                event_list = events[cid] = _ClockEventList()
+            event_list._append(event)
+            if event.callback is not None:
+                self._events_to_release.append(event)
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _remove_event(self, event):
+        with _events_lock:
+            if event._list is not None:
+                event._list._remove(event)
 
     def _release_references(self):
         # call that function to release all the direct reference to any
         # callback and replace it with a weakref
-        events = self._events
-        for cid in list(events.keys())[:]:
-            [x.release() for x in events[cid] if x.callback is not None]
+        if not self._events_to_release:
+            return
+        with _events_lock:
+            events = self._events_to_release
+            self._events_to_release = []
+        for event in events:
+            if event.callback is not None:
+                event.release()
 
     def _remove_empty(self):
         # remove empty entry in the event list
         events = self._events
-        for cid in list(events.keys())[:]:
-            if not events[cid]:
-                del events[cid]
+        with _events_lock:
+            for cid in list(events.keys())[:]:
+                if not events[cid]:
+                    del events[cid]
+
+    def _tick_event(self, event):
+        # tick the event, and remove it if it's done. A trigger re-armed by
+        # its own callback stays scheduled.
+        if event.tick(self._last_tick) is False:
+            if event.loop or not event._is_triggered:
+                self._remove_event(event)
 
     def _process_events(self):
         events = self._events
+        curtime = self._last_tick
         for cid in list(events.keys())[:]:
-            for event in events[cid][:]:
-                if event.tick(self._last_tick) is False:
-                    # event may be already removed by the callback
-                    if event in events[cid]:
-                        events[cid].remove(event)
+            for event in events[cid]:
+                # event may be already removed by a previous callback
+                if event._list is None:
+                    continue
+                if event.tick(curtime) is False:
+                    if event.loop or not event._is_triggered:
+                        self._remove_event(event)
 
     def _process_events_before_frame(self):
         found = True
@@ -555,14 +885,171 @@ class ClockBase(_ClockBase):
             # search event that have timeout = -1
             found = False
             for cid in list(events.keys())[:]:
-                for event in events[cid][:]:
-                    if event.timeout != -1:
+                for event in events[cid]:
+                    if event.timeout != -1 or event._list is None:
                         continue
                     found = True
-                    if event.tick(self._last_tick) is False:
-                        # event may be already removed by the callback
-                        if event in events[cid]:
-                            events[cid].remove(event)
+                    self._tick_event(event)
+
+
+class ClockBaseHeap(ClockBase):
+    '''A clock object that keeps its events ordered by deadline.
+
+    The default :class:`ClockBase` ticks every scheduled event on every frame
+    to know if it is due. This clock stores the events in a heap ordered by
+    their next deadline, and the events scheduled with a timeout of -1 in a
+    separate queue, so the cost of a frame depends on the number of events
+    that are due, not on the number of scheduled events.
+
+    Select it with the `kivy_clock` token of the `kivy` section in the
+    configuration file.
+
+    .. versionadded:: 1.8.1
+    '''
+    __slots__ = ('_heap', '_heap_dead', '_heap_counter', '_events_due',
+                 '_events_before_frame')
+
+    def __init__(self):
+        super(ClockBaseHeap, self).__init__()
+        # each entry of the heap is [deadline, counter, event]. The deadline
+        # is set to None when the entry leaves the heap, so the event can
+        # reuse it the next time it's scheduled. A cancelled entry has its
+        # event set to None, and is dropped when popped.
+        self._heap = []
+        self._heap_dead = 0
+        self._heap_counter = count()
+        self._events_due = []
+        self._events_before_frame = _ClockEventList()
+
+    def unschedule(self, callback):
+        if isinstance(callback, ClockEvent):
+            callback.cancel()
+            return
+        with _events_lock:
+            events = [entry[2] for entry in self._heap + self._events_due]
+        events.extend(self._events_before_frame)
+        for event in events:
+            if event is not None and event.get_callback() == callback:
+                self._remove_event(event)
+
+    def get_next_timeout(self):
+        if self._events_before_frame:
+            return 0
+        heap = self._heap
+        with _events_lock:
+            while heap and heap[0][2] is None:
+                heappop(heap)
+                self._heap_dead -= 1
+            if not heap:
+                return None
+            deadline = heap[0][0]
+        return max(0, deadline - _default_time())
+
+    def _add_event(self, event):
+        with _events_lock:
+            if event.callback is not None:
+                self._events_to_release.append(event)
+            if event.timeout == -1:
+                self._events_before_frame._append(event)
+            else:
+                self._push_event(event)
+        # wake up the loop only once the event is visible, or it could go
+        # back to sleep without it
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def _push_event(self, event):
+        # push the event in the heap, unless it's already scheduled. Called
+        # with _events_lock held.
+        # same 5ms tolerance as ClockEvent.tick()
+        deadline = event._last_dt + event.timeout - 0.005
+        entry = event._entry
+        if entry is None:
+            event._entry = entry = [
+                deadline, next(self._heap_counter), event]
+        elif entry[0] is not None:
+            # already scheduled
+            return
+        else:
+            entry[0] = deadline
+            entry[1] = next(self._heap_counter)
+        heappush(self._heap, entry)
+
+    def _remove_event(self, event):
+        with _events_lock:
+            if event._list is not None:
+                event._list._remove(event)
+                return
+            entry = event._entry
+            if entry is None:
+                return
+            event._entry = None
+            entry[2] = None
+            if entry[0] is None:
+                return
+            # the entry is still in the heap, rebuild it if it's mostly
+            # garbage
+            self._heap_dead += 1
+            heap = self._heap
+            if self._heap_dead > 64 and self._heap_dead * 2 > len(heap):
+                heap[:] = [x for x in heap if x[2] is not None]
+                heapify(heap)
+                self._heap_dead = 0
+
+    def _remove_empty(self):
+        pass
+
+    def _process_events(self):
+        heap = self._heap
+        curtime = self._last_tick
+
+        # pop everything that is due first, the events scheduled by the
+        # callbacks will be processed in the next frame.
+        due = []
+        with _events_lock:
+            while heap and heap[0][0] <= curtime:
+                entry = heappop(heap)
+                if entry[2] is None:
+                    self._heap_dead -= 1
+                    continue
+                entry[0] = None
+                due.append(entry)
+            self._events_due = due
+
+        self._process_before_frame_queue()
+
+        for entry in due:
+            event = entry[2]
+            if event is None:
+                # cancelled by a previous callback
+                continue
+            if event.tick(curtime) is False:
+                continue
+            # still alive, and not cancelled or re-armed by the callback
+            with _events_lock:
+                if entry[2] is not None and entry[0] is None:
+                    entry[0] = event._last_dt + event.timeout - 0.005
+                    entry[1] = next(self._heap_counter)
+                    heappush(heap, entry)
+        self._events_due = []
+
+    def _process_before_frame_queue(self):
+        queue = self._events_before_frame
+        for event in queue:
+            if event._list is queue:
+                self._tick_event(event)
+
+    def _process_events_before_frame(self):
+        count = self.max_iteration
+        while self._events_before_frame:
+            count -= 1
+            if count == -1:
+                Logger.critical(
+                    'Clock: Warning, too much iteration done before'
+                    ' the next frame. Check your code, or increase'
+                    ' the Clock.max_iteration attribute')
+                break
+            self._process_before_frame_queue()
 
 
 def mainthread(func):
@@ -593,4 +1080,10 @@ if 'KIVY_DOC_INCLUDE' in environ:
     #: Instance of :class:`ClockBase`.
     Clock = None
 else:
-    Clock = register_context('Clock', ClockBase)
+    _clocks = {'default': ClockBase, 'heap': ClockBaseHeap}
+    _clock_name = Config.getdefault('kivy', 'kivy_clock', 'default')
+    if _clock_name not in _clocks:
+        Logger.warning('Clock: Unknown clock <%s>, using the default one'
+                       % _clock_name)
+        _clock_name = 'default'
+    Clock = register_context('Clock', _clocks[_clock_name])
@@ -67,6 +67,14 @@ Available configuration tokens
     `window_icon`: string
         Path of the window icon. Use this if you want to replace the default
         pygame icon.
+    `kivy_clock`: one of `default` or `heap`
+        The clock implementation to use. `default` checks every scheduled
+        event on each frame, `heap` keeps the events ordered by deadline.
+        See :mod:`kivy.clock` for more information.
+    `lazy_loop`: int, 0 or 1
+        If 1, the event loop waits for the next scheduled event or input
+        instead of running frames at `maxfps` when nothing changes. See
+        :attr:`kivy.base.EventLoopBase.lazy`. 0 is disabled, 1 is enabled.
 
 :postproc:
 
@@ -199,6 +207,9 @@ Available configuration tokens
     Check the specific module's documentation for a list of accepted
     arguments.
 
+.. versionchanged:: 1.8.1
+    `kivy_clock` and `lazy_loop` have been added to the kivy section.
+
 .. versionchanged:: 1.8.0
     `systemanddock` and `systemandmulti` has been added as possible values for
     `keyboard_mode` in the kivy section. `exit_on_escape` has been added
@@ -237,7 +248,7 @@ from kivy.compat import PY2, string_types
 _is_rpi = exists('/opt/vc/include/bcm_host.h')
 
 # Version number of current configuration format
-KIVY_CONFIG_VERSION = 10
+KIVY_CONFIG_VERSION = 12
 
 #: Kivy configuration object
 Config = None
@@ -527,6 +538,12 @@ if not environ.get('KIVY_DOC_INCLUDE'):
         elif version == 9:
             Config.setdefault('kivy', 'exit_on_escape', '1')
 
+        elif version == 10:
+            Config.setdefault('kivy', 'kivy_clock', 'default')
+
+        elif version == 11:
+            Config.setdefault('kivy', 'lazy_loop', '0')
+
         #elif version == 1:
         #   # add here the command for upgrading from configuration 0 to 1
         #
@@ -100,6 +100,17 @@ class ImageData(object):
     def have_mipmap(self):
         return len(self.mipmaps) > 1
 
+    @property
+    def cache_size(self):
+        '''Length of the image buffers in bytes, for all the mipmap levels.
+        It is used by the :class:`~kivy.cache.Cache` to enforce the
+        `size_limit` of a category.
+
+        .. versionadded:: 1.8.1
+        '''
+        return sum(len(item[2]) for item in self.mipmaps.values()
+                   if item[2] is not None)
+
     def __repr__(self):
         return ('<ImageData width=%d height=%d fmt=%s '
                 'source=%r with %d images>' % (
@@ -147,7 +158,14 @@ class ImageLoaderBase(object):
         self.keep_data = kwargs.get('keep_data', False)
         self._nocache = kwargs.get('nocache', False)
         self.filename = filename
-        self._data = self.load(filename)
+        rawdata = kwargs.get('rawdata')
+        if rawdata is not None:
+            # decode from the file-like object, but keep the filename as the
+            # identifier of the image
+            self._data = self.load(rawdata)
+            self.filename = filename
+        else:
+            self._data = self.load(filename)
         self._textures = None
 
     def load(self, filename):
@@ -160,6 +178,15 @@ class ImageLoaderBase(object):
         '''
         return False
 
+    @staticmethod
+    def can_load_memory():
+        '''Indicate if the loader can load an image from a file-like object
+        passed in the `rawdata` keyword argument.
+
+        .. versionadded:: 1.8.1
+        '''
+        return False
+
     @staticmethod
     def save():
         raise NotImplementedError()
@@ -306,6 +333,17 @@ class ImageLoader(object):
 
     @staticmethod
     def load(filename, **kwargs):
+        '''Load the image `filename` with the first loader that supports its
+        extension.
+
+        .. versionchanged:: 1.8.1
+            If a file-like object is passed in the `rawdata` keyword argument,
+            the image is decoded from it with a loader supporting
+            :meth:`ImageLoaderBase.can_load_memory`, and `filename` is only
+            used as the identifier of the image. The `ext` keyword argument
+            can be used to override the extension guessed from `filename`.
+        '''
+        rawdata = kwargs.get('rawdata')
 
         # atlas ?
         if filename[:8] == 'atlas://':
@@ -348,13 +386,16 @@ class ImageLoader(object):
             return Image(atlas[uid])
 
         # extract extensions
-        ext = filename.split('.')[-1].lower()
+        ext = kwargs.pop('ext', None)
+        if ext is None:
+            ext = filename.split('.')[-1].lower()
 
-        # prevent url querystrings
-        if filename.startswith((('http://', 'https://'))):
-            ext = ext.split('?')[0]
+            # prevent url querystrings
+            if filename.startswith((('http://', 'https://'))):
+                ext = ext.split('?')[0]
 
-        filename = resource_find(filename)
+        if rawdata is None:
+            filename = resource_find(filename)
 
         # special case. When we are trying to load a "zip" file with image, we
         # will use the special zip_loader in ImageLoader. This might return a
@@ -366,6 +407,10 @@ class ImageLoader(object):
             for loader in ImageLoader.loaders:
                 if ext not in loader.extensions():
                     continue
+                if rawdata is not None:
+                    if not loader.can_load_memory():
+                        continue
+                    rawdata.seek(0)
                 Logger.debug('Image%s: Load <%s>' %
                              (loader.__name__[11:], filename))
                 im = loader(filename, **kwargs)
@@ -34,6 +34,10 @@ class ImageLoaderPIL(ImageLoaderBase):
     def can_save():
         return True
 
+    @staticmethod
+    def can_load_memory():
+        return True
+
     @staticmethod
     def extensions():
         '''Return accepted extensions for this loader'''
@@ -35,6 +35,10 @@ class ImageLoaderPygame(ImageLoaderBase):
     def can_save():
         return True
 
+    @staticmethod
+    def can_load_memory():
+        return True
+
     def load(self, filename):
         try:
             try:
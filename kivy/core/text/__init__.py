@@ -315,16 +315,16 @@ class LabelBase(object):
 
         # get data from provider
         data = self._render_end()
-        assert(data)
-
-        # If the text is 1px width, usually, the data is black.
-        # Don't blit that kind of data, otherwise, you have a little black bar.
-        if data is not None and data.width > 1:
-            self.texture.blit_data(data)
+        assert(data is not None)
+        return data
 
     def render(self, real=False):
         '''Return a tuple (width, height) to create the image
         with the user constraints. (width, height) includes the padding.
+
+        .. versionchanged:: 1.8.1
+            With `real`, the data returned by the provider is returned instead
+            of being blitted in the texture.
         '''
         if real:
             return self._render_real()
@@ -510,7 +510,12 @@ class LabelBase(object):
 
     def _texture_fill(self, texture):
         # second pass, render for real
-        self.render(real=True)
+        data = self.render(real=True)
+
+        # If the text is 1px width, usually, the data is black.
+        # Don't blit that kind of data, otherwise, you have a little black bar.
+        if data is not None and data.width > 1:
+            texture.blit_data(data)
 
     def refresh(self):
         '''Force re-rendering of the text
@@ -0,0 +1,325 @@
+'''
+Text atlas: Draw text with a glyph atlas
+========================================
+
+.. versionadded:: 1.8.1
+
+The other text providers render one texture per label, and render it again
+every time the text changes. The :class:`LabelAtlas` doesn't have a texture:
+each glyph is rasterized once, by the current text provider, in a
+:class:`GlyphAtlas` shared by all the labels using the same font. The label is
+drawn as a list of textured quads, one per glyph, so changing its text only
+computes new quads. This is useful for many small labels that change often,
+like counters or table cells::
+
+    from kivy.core.text.text_atlas import LabelAtlas
+    from kivy.graphics import Color, Mesh
+
+    label = LabelAtlas(text='12:30', font_size=24)
+    label.refresh()
+    vertices, indices = label.get_mesh(x=10, y=10)
+    with widget.canvas:
+        Color(1, 1, 1)
+        Mesh(vertices=vertices, indices=indices, mode='triangles',
+             texture=label.atlas.texture)
+
+The glyphs are rendered in white: use a :class:`~kivy.graphics.Color`
+instruction to color the text. The text is laid out like with the other
+providers (`text_size`, `halign`, `valign`, `padding`...), but each glyph is
+advanced by its own width: kerning is not applied.
+
+The atlas grows when it is full, up to :attr:`GlyphAtlas.max_size`, and is
+cleared when it can't grow anymore. Both change the texture coordinates of the
+glyphs and increment :attr:`GlyphAtlas.version`: the meshes built before must
+be built again.
+
+:meth:`LabelAtlas.get_quads`, :meth:`LabelAtlas.get_mesh` and the
+:class:`GlyphAtlas` only compute coordinates, the texture of the atlas is
+created when :attr:`GlyphAtlas.texture` is read. They can be used without an
+OpenGL context.
+'''
+
+__all__ = ('GlyphAtlas', 'LabelAtlas')
+
+from kivy.atlas import SkylinePacker
+from kivy.core.text import LabelBase, Label
+from kivy.graphics.texture import Texture
+
+
+class GlyphAtlas(object):
+    '''Growable atlas of glyph images, in RGBA.
+
+    The glyphs are stored by key, with their box (x, y, width, height) in
+    the atlas. The origin is at the top-left corner of the atlas, and the
+    rows of the glyph images go from top to bottom.
+
+    :Parameters:
+        `size`: tuple, defaults to (256, 256)
+            Initial size of the atlas.
+        `max_size`: tuple, defaults to (2048, 2048)
+            Maximum size of the atlas.
+        `padding`: int, defaults to 1
+            Space left between the glyphs.
+    '''
+
+    def __init__(self, size=(256, 256), max_size=(2048, 2048), padding=1):
+        super(GlyphAtlas, self).__init__()
+        self.max_size = max_size
+        self.padding = padding
+        #: Number of times the atlas has been grown or cleared. The texture
+        #: coordinates of the glyphs change when it's incremented.
+        self.version = 0
+        self._initial_size = size
+        self._reset()
+
+    def clear(self):
+        '''Remove all the glyphs and go back to the initial size.
+        '''
+        self._reset()
+        self.version += 1
+
+    def _reset(self):
+        width, height = self.size = self._initial_size
+        #: Glyph boxes (x, y, width, height) by key
+        self.glyphs = {}
+        self._packer = SkylinePacker(width, height)
+        self._buffer = bytearray(width * height * 4)
+        # boxes changed since the last upload in the texture
+        self._pending = []
+        self._texture = None
+
+    def __contains__(self, key):
+        return key in self.glyphs
+
+    def get(self, key):
+        '''Return the box of a glyph, or None if it's not in the atlas.
+        '''
+        return self.glyphs.get(key)
+
+    def add(self, key, width, height, data=None):
+        '''Add the glyph `key` to the atlas and return its box. `data` is the
+        glyph image, width * height RGBA pixels from top to bottom; without
+        it the box stays transparent.
+
+        The atlas grows if needed. A ValueError is raised if the glyph
+        doesn't fit in an atlas of :attr:`max_size`.
+        '''
+        padding = self.padding
+        packer = self._packer
+        found = packer.find(width + padding, height + padding)
+        while found is None:
+            self._grow()
+            found = packer.find(width + padding, height + padding)
+        x, y, rotated = packer.place(found)
+        box = self.glyphs[key] = (x, y, width, height)
+
+        if data is not None:
+            buf = self._buffer
+            stride = self.size[0] * 4
+            row = width * 4
+            for line in range(height):
+                offset = (y + line) * stride + x * 4
+                buf[offset:offset + row] = data[line * row:(line + 1) * row]
+        if width and height:
+            self._pending.append(box)
+        return box
+
+    def _grow(self):
+        # double the smallest side of the atlas, the glyphs stay at their
+        # place
+        width, height = self.size
+        max_width, max_height = self.max_size
+        packer = self._packer
+        if width <= height and width < max_width or height >= max_height:
+            if width >= max_width:
+                raise ValueError('GlyphAtlas: the glyph does not fit in an '
+                                 'atlas of %dx%d' % (max_width, max_height))
+            new_width = min(width * 2, max_width)
+            packer.skyline.append((width, 0, new_width - width))
+            packer.width = new_width
+            new_height = height
+        else:
+            new_height = min(height * 2, max_height)
+            packer.height = new_height
+            new_width = width
+
+        buf = bytearray(new_width * new_height * 4)
+        old = self._buffer
+        stride = width * 4
+        new_stride = new_width * 4
+        for line in range(height):
+            buf[line * new_stride:line * new_stride + stride] = \
+                old[line * stride:(line + 1) * stride]
+        self._buffer = buf
+        self.size = new_width, new_height
+        self._pending = []
+        self._texture = None
+        self.version += 1
+
+    def uvs(self, box):
+        '''Return the texture coordinates (u, v, u2, v2) of a glyph box:
+        (u, v) is its bottom-left corner and (u2, v2) its top-right corner,
+        when the glyph is drawn upright.
+        '''
+        x, y, w, h = box
+        width, height = self.size
+        return (x / float(width), (y + h) / float(height),
+                (x + w) / float(width), y / float(height))
+
+    def _get_texture(self):
+        texture = self._texture
+        if texture is None:
+            texture = Texture.create(size=self.size, colorfmt='rgba')
+            texture.add_reload_observer(self._reload_texture)
+            self._reload_texture(texture)
+            self._texture = texture
+        elif self._pending:
+            # upload only the new glyphs
+            buf = self._buffer
+            stride = self.size[0] * 4
+            for x, y, w, h in self._pending:
+                data = b''.join([
+                    bytes(buf[line * stride + x * 4:
+                              line * stride + (x + w) * 4])
+                    for line in range(y, y + h)])
+                texture.blit_buffer(data, size=(w, h), pos=(x, y),
+                                    colorfmt='rgba', bufferfmt='ubyte')
+        self._pending = []
+        return texture
+
+    def _reload_texture(self, texture):
+        texture.blit_buffer(bytes(self._buffer), colorfmt='rgba',
+                            bufferfmt='ubyte')
+
+    texture = property(_get_texture, doc='''Texture of the atlas, created
+    when it is first read. A new texture is created when the atlas grows or
+    is cleared.''')
+
+
+class LabelAtlas(LabelBase):
+    '''Text label drawn with a :class:`GlyphAtlas`. It takes the same
+    parameters as the :class:`~kivy.core.text.LabelBase`, plus:
+
+    :Parameters:
+        `provider`: class, defaults to :class:`~kivy.core.text.Label`
+            Text provider used to measure the text and rasterize the glyphs.
+
+    The label has no :attr:`texture`: after :meth:`refresh`, use
+    :meth:`get_quads` or :meth:`get_mesh` to draw it with the texture of the
+    :attr:`atlas`.
+    '''
+
+    #: Glyph atlas of each font, shared by all the labels
+    _atlases = {}
+
+    def __init__(self, text='', provider=None, **kwargs):
+        super(LabelAtlas, self).__init__(text, **kwargs)
+        options = self.options
+        self._provider = (provider or Label)(
+            font_size=options['font_size'], font_name=options['font_name'],
+            bold=options['bold'], italic=options['italic'])
+        self._layout = []
+
+    def _get_atlas(self):
+        fontid = self._provider.fontid
+        atlas = LabelAtlas._atlases.get(fontid)
+        if atlas is None:
+            atlas = LabelAtlas._atlases[fontid] = GlyphAtlas()
+        return atlas
+
+    atlas = property(_get_atlas, doc='''The :class:`GlyphAtlas` shared by the
+    labels using the same font.''')
+
+    def get_extents(self, text):
+        return self._provider.get_extents(text)
+
+    def _get_glyph(self, atlas, char):
+        # return the box of a glyph, rasterize it if needed
+        box = atlas.get(char)
+        if box is not None:
+            return box
+        provider = self._provider
+        width, height = provider.get_extents(char)
+        width, height = int(width), int(height)
+        data = None
+        if width and height and not char.isspace():
+            provider._size = width, height
+            provider._render_begin()
+            provider._render_text(char, 0, 0)
+            data = provider._render_end().data
+        try:
+            return atlas.add(char, width, height, data)
+        except ValueError:
+            # the atlas is full, start again with the glyphs in use
+            atlas.clear()
+            return atlas.add(char, width, height, data)
+
+    def _render_begin(self):
+        self._layout = []
+
+    def _render_text(self, text, x, y):
+        atlas = self.atlas
+        get_glyph = self._get_glyph
+        layout = self._layout
+        for char in text:
+            box = get_glyph(atlas, char)
+            if not char.isspace():
+                layout.append((x, y, char))
+            x += box[2]
+
+    def _render_end(self):
+        return self._layout
+
+    def refresh(self):
+        '''Compute the layout of the text, and rasterize the glyphs missing in
+        the atlas.
+        '''
+        self.resolve_font_name()
+        self._size_texture = self._size = sz = self.render()
+        self.texture = None
+        self._layout = []
+        if sz[0] > 1 and sz[1] > 1:
+            self.render(real=True)
+
+    def get_quads(self):
+        '''Return the list of quads of the glyphs, as tuples (x, y, width,
+        height, u, v, u2, v2). The position is relative to the bottom-left
+        corner of the label, and (u, v) to (u2, v2) are the texture
+        coordinates of the glyph in the :attr:`atlas` texture.
+        '''
+        atlas = self.atlas
+        layout = self._layout
+        # add the missing glyphs first, the atlas may grow or be cleared
+        for retry in (True, False):
+            boxes = [self._get_glyph(atlas, char) for x, y, char in layout]
+            glyphs = atlas.glyphs
+            if all(glyphs.get(char) is box
+                   for box, (x, y, char) in zip(boxes, layout)):
+                break
+            # the atlas has been cleared while adding the glyphs
+            if not retry:
+                raise ValueError('LabelAtlas: the glyphs of the text do not '
+                                 'fit in the atlas')
+        height = self.height
+        uvs = atlas.uvs
+        quads = []
+        for (x, y, char), box in zip(self._layout, boxes):
+            w, h = box[2:]
+            quads.append((x, height - y - h, w, h) + uvs(box))
+        return quads
+
+    def get_mesh(self, x=0, y=0):
+        '''Return (vertices, indices) to draw the label at (x, y) with a
+        :class:`~kivy.graphics.Mesh` in `triangles` mode, using the texture
+        of the :attr:`atlas`.
+        '''
+        vertices = []
+        indices = []
+        for i, (qx, qy, w, h, u, v, u2, v2) in enumerate(self.get_quads()):
+            qx += x
+            qy += y
+            vertices.extend((qx, qy, u, v, qx + w, qy, u2, v,
+                             qx + w, qy + h, u2, v2, qx, qy + h, u, v2))
+            i *= 4
+            indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+        return vertices, indices
@@ -558,6 +558,23 @@ class WindowBase(EventDispatcher):
         '''Flip between buffers'''
         pass
 
+    #: Interval, in seconds, at which a :attr:`~kivy.base.EventLoopBase.lazy`
+    #: event loop checks :meth:`has_pending_events` while it waits, or None if
+    #: the window events wake up the loop by themselves.
+    #:
+    #: .. versionadded:: 1.8.1
+    lazy_poll_interval = .05
+
+    def has_pending_events(self):
+        '''Return True if events are waiting to be read by the window. A
+        :attr:`~kivy.base.EventLoopBase.lazy` event loop only waits when it
+        returns False. The default implementation returns True: the event
+        loop never waits with a window that doesn't implement it.
+
+        .. versionadded:: 1.8.1
+        '''
+        return True
+
     def _update_childsize(self, instance, value):
         self.update_childsize([instance])
 
@@ -67,6 +67,12 @@ class WindowEglRpi(WindowBase):
     def flip(self):
         egl.SwapBuffers(self.egl_info[0], self.egl_info[1])
 
+    # the input comes from the providers only
+    lazy_poll_interval = None
+
+    def has_pending_events(self):
+        return False
+
     def _mainloop(self):
         EventLoop.idle()
 
@@ -1024,6 +1024,26 @@ cdef class Texture:
         def __get__(self):
             return self._mipmap
 
+    property cache_size:
+        '''Return the size of the texture storage in bytes (readonly). It is
+        used by the :class:`~kivy.cache.Cache` to enforce the `size_limit` of
+        a category.
+
+        .. versionadded:: 1.8.1
+        '''
+        def __get__(self):
+            cdef long size
+            if _is_compressed_fmt(self._colorfmt):
+                # most of the compressed formats use 4 bits per pixel
+                size = self._width * self._height / 2
+            else:
+                size = self._width * self._height * \
+                    _gl_format_size(_color_fmt_to_gl(self._colorfmt)) * \
+                    _buffer_type_to_gl_size(self._bufferfmt)
+            if self._mipmap:
+                size += size / 3
+            return size
+
     property id:
         '''Return the OpenGL ID of the texture (readonly).
         '''
@@ -1162,26 +1182,81 @@ cdef class Texture:
 
 cdef class TextureRegion(Texture):
     '''Handle a region of a Texture class. Useful for non power-of-2
-    texture handling.'''
+    texture handling.
+
+    .. versionchanged:: 1.8.1
+        `rotated` parameter added. If True, the region is stored rotated by
+        90 degrees clockwise in the origin texture: it covers `height` x
+        `width` pixels of the origin, and the tex_coords are rotated back so
+        that it is displayed as a `width` x `height` texture. It is used by
+        the :class:`~kivy.atlas.Atlas` created with rotation.
+    '''
 
-    def __init__(self, int x, int y, int width, int height, Texture origin):
+    def __init__(self, int x, int y, int width, int height, Texture origin,
+                 rotated=False):
         Texture.__init__(self, width, height, origin.target, origin.id)
         self._is_allocated = 1
         self._mipmap = origin._mipmap
+        self._rotated = 1 if rotated else 0
         self.x = x
         self.y = y
         self.owner = origin
 
+        # the area covered in the origin texture
+        cdef int area_width = width, area_height = height
+        if rotated:
+            area_width, area_height = height, width
+
         # recalculate texture coordinate
         cdef float origin_u1, origin_v1
         origin_u1 = origin._uvx
         origin_v1 = origin._uvy
         self._uvx = (x / <float>origin._width) * origin._uvw + origin_u1
         self._uvy = (y / <float>origin._height) * origin._uvh + origin_v1
-        self._uvw = (width / <float>origin._width) * origin._uvw
-        self._uvh = (height / <float>origin._height) * origin._uvh
+        self._uvw = (area_width / <float>origin._width) * origin._uvw
+        self._uvh = (area_height / <float>origin._height) * origin._uvh
         self.update_tex_coords()
 
+    cdef void update_tex_coords(self):
+        if not self._rotated:
+            Texture.update_tex_coords(self)
+            return
+        # the bottom-left corner of the image is at the top-left corner of
+        # the area, the bottom-right corner at the bottom-left, etc.
+        self._tex_coords[0] = self._uvx
+        self._tex_coords[1] = self._uvy + self._uvh
+        self._tex_coords[2] = self._uvx
+        self._tex_coords[3] = self._uvy
+        self._tex_coords[4] = self._uvx + self._uvw
+        self._tex_coords[5] = self._uvy
+        self._tex_coords[6] = self._uvx + self._uvw
+        self._tex_coords[7] = self._uvy + self._uvh
+
+    cpdef flip_vertical(self):
+        if not self._rotated:
+            Texture.flip_vertical(self)
+            return
+        # the vertical axis of the image is the u axis of the area
+        self._uvx += self._uvw
+        self._uvw = -self._uvw
+        self.update_tex_coords()
+
+    cpdef flip_horizontal(self):
+        if not self._rotated:
+            Texture.flip_horizontal(self)
+            return
+        self._uvy += self._uvh
+        self._uvh = -self._uvh
+        self.update_tex_coords()
+
+    property rotated:
+        '''Return True if the region is stored rotated in its origin texture.
+
+        .. versionadded:: 1.8.1
+        '''
+        def __get__(self):
+            return self._rotated == 1
+
     def __repr__(self):
         return '<TextureRegion of %r hash=%r id=%d size=%r colorfmt=%r bufferfmt=%r source=%r observers=%d>' % (
             self.owner, id(self), self._id, self.size, self.colorfmt,
@@ -1210,6 +1285,14 @@ cdef class TextureRegion(Texture):
     cpdef bind(self):
         self.owner.bind()
 
+    property cache_size:
+        '''Return 0, a region shares the storage of its owner texture.
+
+        .. versionadded:: 1.8.1
+        '''
+        def __get__(self):
+            return 0
+
     property pixels:
         def __get__(self):
             from kivy.graphics.fbo import Fbo
@@ -79,6 +79,22 @@ If you want to select only the fiducials::
         if 'markerid' not in touch.profile:
             return
 
+History of the positions
+------------------------
+
+.. versionadded:: 1.8.1
+
+The providers update the :class:`MotionEvent` in place, and the event loop
+dispatches each event once per frame, with its last state: with a high-rate
+device, the intermediate positions are lost. A drawing application can set
+:attr:`MotionEvent.keep_history` to get them in :attr:`MotionEvent.history`::
+
+    MotionEvent.keep_history = True
+
+    def on_touch_move(self, touch):
+        for sx, sy, t in touch.history:
+            self.add_point(sx * Window.width, sy * Window.height)
+
 '''
 
 __all__ = ('MotionEvent', )
@@ -130,6 +146,13 @@ class MotionEvent(MotionEventBase):
     '''
 
     __uniq_id = 0
+
+    #: If True, the positions set by :meth:`move` are kept until the event is
+    #: dispatched, in :attr:`history`. See the module documentation.
+    #:
+    #: .. versionadded:: 1.8.1
+    keep_history = False
+
     __attrs__ = \
         ('device', 'push_attrs', 'push_attrs_stack',
          'is_touch', 'id', 'shape', 'profile',
@@ -259,6 +282,17 @@ class MotionEvent(MotionEventBase):
         #: Time of the end event (last touch usage)
         self.time_end = -1
 
+        #: Positions (sx, sy, time_update) set since the previous `update` or
+        #: `end` dispatch of the event, oldest first, if :attr:`keep_history`
+        #: is True. The last one is the current position. The `begin`
+        #: dispatch doesn't take them: when a touch begins and moves in the
+        #: same frame, its positions are given to its first `update`.
+        #:
+        #: .. versionadded:: 1.8.1
+        self.history = []
+        # positions set since the last flush_history()
+        self._history = []
+
         #: Indicate if the touch is a double tap or not
         self.is_double_tap = False
 
@@ -345,6 +379,20 @@ class MotionEvent(MotionEventBase):
         self.psz = self.sz
         self.time_update = time()
         self.depack(args)
+        if self.keep_history:
+            self._history.append((self.sx, self.sy, self.time_update))
+
+    def flush_history(self):
+        '''Move the positions set since the last call in :attr:`history`.
+        Called by the event loop before dispatching an `update` or an `end`
+        event, if :attr:`keep_history` is True.
+
+        .. versionadded:: 1.8.1
+        '''
+        # the provider thread can still add a position to the previous list,
+        # it's then part of this history
+        self.history = self._history
+        self._history = []
 
     def scale_for_screen(self, w, h, p=None, rotation=0):
         '''Scale position for the screen
@@ -62,6 +62,7 @@ else:
     import collections
     import struct
     import fcntl
+    from kivy.base import EventLoop
     from kivy.input.provider import MotionEventProvider
     from kivy.input.factory import MotionEventFactory
     from kivy.logger import Logger
@@ -206,6 +207,7 @@ else:
         def _thread_run(self, **kwargs):
             input_fn = kwargs.get('input_fn')
             queue = kwargs.get('queue')
+            wakeup = EventLoop.wakeup
             device = kwargs.get('device')
             drs = kwargs.get('default_ranges').get
             touches = {}
@@ -250,6 +252,8 @@ else:
                             queue.append(('end', touch))
                             touches_sent.remove(tid)
                         del touches[tid]
+                # the events are dispatched in the main thread
+                wakeup()
 
             def normalize(value, vmin, vmax):
                 return (value - vmin) / float(vmax - vmin)
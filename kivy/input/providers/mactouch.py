@@ -9,6 +9,7 @@ import ctypes
 import threading
 import collections
 import os
+from kivy.base import EventLoop
 from kivy.input.provider import MotionEventProvider
 from kivy.input.factory import MotionEventFactory
 from kivy.input.motionevent import MotionEvent
@@ -209,6 +210,8 @@ class MacMotionEventProvider(MotionEventProvider):
                 _instance.queue.append(('end', touch))
                 del touches[tid]
 
+        # the events are dispatched in the main thread
+        EventLoop.wakeup()
         return 0
 
 MotionEventFactory.register('mactouch', MacMotionEventProvider)
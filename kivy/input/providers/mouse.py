@@ -158,6 +158,7 @@ class MouseMotionEventProvider(MotionEventProvider):
         if do_graphics:
             cur.update_graphics(EventLoop.window, True)
         self.waiting_event.append(('begin', cur))
+        EventLoop.wakeup()
         return cur
 
     def remove_touch(self, cur):
@@ -166,6 +167,7 @@ class MouseMotionEventProvider(MotionEventProvider):
         del self.touches[cur.id]
         cur.update_time_end()
         self.waiting_event.append(('end', cur))
+        EventLoop.wakeup()
         cur.clear_graphics(EventLoop.window)
 
     def on_mouse_motion(self, win, x, y, modifiers):
@@ -177,6 +179,7 @@ class MouseMotionEventProvider(MotionEventProvider):
             cur.move([rx, ry])
             cur.update_graphics(win)
             self.waiting_event.append(('update', cur))
+            EventLoop.wakeup()
         elif self.alt_touch is not None and 'alt' not in modifiers:
             # alt just released ?
             is_double_tap = 'shift' in modifiers
@@ -78,6 +78,7 @@ else:
         MTDEV_CODE_TRACKING_ID, MTDEV_ABS_POSITION_X, \
         MTDEV_ABS_POSITION_Y, MTDEV_ABS_TOUCH_MINOR, \
         MTDEV_ABS_TOUCH_MAJOR
+    from kivy.base import EventLoop
     from kivy.input.provider import MotionEventProvider
     from kivy.input.factory import MotionEventFactory
     from kivy.logger import Logger
@@ -156,6 +157,7 @@ else:
         def _thread_run(self, **kwargs):
             input_fn = kwargs.get('input_fn')
             queue = kwargs.get('queue')
+            wakeup = EventLoop.wakeup
             device = kwargs.get('device')
             drs = kwargs.get('default_ranges').get
             touches = {}
@@ -183,6 +185,8 @@ else:
                         touches_sent.remove(tid)
                         touch.update_time_end()
                     queue.append((action, touch))
+                # the events are dispatched in the main thread
+                wakeup()
 
             def normalize(value, vmin, vmax):
                 return (value - vmin) / float(vmax - vmin)
@@ -725,6 +725,23 @@ will first be unloaded and then reloaded again. For example:
                 pos: self.pos
                 size: (self.size[0]/4, self.size[1]/4)
 
+Compiled rules cache
+--------------------
+
+.. versionadded:: 1.8.1
+
+Parsing a kv file and compiling all its expressions takes time, and happens
+on every start of the application. The :class:`Builder` keeps the parsed
+rules and their compiled code in the :attr:`BuilderBase.cache_dir`
+directory, with one entry per kv filename. When the same content is loaded
+again with the same Kivy and Python versions, the rules are restored from the
+cache, and only the directives are executed again. A modified file replaces
+its entry, and a string loaded without filename is never cached.
+
+The cache is stored in `<kivy home>/cache/kv` by default. Set the
+`KIVY_KV_CACHE_DIR` environment variable to use another directory, or
+`KIVY_NO_KV_CACHE` to disable it.
+
 '''
 import os
 
@@ -732,11 +749,14 @@ __all__ = ('Builder', 'BuilderBase', 'BuilderException',
            'Parser', 'ParserException')
 
 import codecs
+import marshal
 import re
 import sys
 from re import sub, findall
-from os import environ
-from os.path import join
+from os import environ, makedirs, rename, unlink
+from os.path import join, exists
+from hashlib import sha1
+from tempfile import mkstemp
 from copy import copy
 from types import CodeType
 from functools import partial
@@ -745,7 +765,7 @@ from kivy.factory import Factory
 from kivy.logger import Logger
 from kivy.utils import QueryDict
 from kivy.cache import Cache
-from kivy import kivy_data_dir, require
+from kivy import kivy_data_dir, kivy_home_dir, require, __version__
 from kivy.compat import PY2, iteritems, iterkeys
 from kivy.context import register_context
 from kivy.resources import resource_find
@@ -775,9 +795,19 @@ lang_tr = re.compile('(_\()')
 _delayed_calls = []
 
 # all the widget handlers, used to correctly unbind all the callbacks then the
-# widget is deleted
+# widget is deleted: {widget uid: {dispatcher uid: [proxy, handle]}}, with the
+# handles returned by EventDispatcher.bind_many()
 _handlers = {}
 
+# version of the format of the compiled rules cache, with the versions of kivy
+# and python, as the compiled code is specific to it
+try:
+    from importlib.util import MAGIC_NUMBER as _py_magic
+except ImportError:
+    from imp import get_magic
+    _py_magic = get_magic()
+_kv_cache_version = (2, __version__, _py_magic)
+
 
 class ProxyApp(object):
     # proxy app object
@@ -945,7 +975,8 @@ class ParserRule(object):
 
     __slots__ = ('ctx', 'line', 'name', 'children', 'id', 'properties',
                  'canvas_before', 'canvas_root', 'canvas_after',
-                 'handlers', 'level', 'cache_marked', 'avoid_previous_rules')
+                 'handlers', 'level', 'cache_marked', 'avoid_previous_rules',
+                 'plan')
 
     def __init__(self, ctx, line, name, level):
         super(ParserRule, self).__init__()
@@ -975,6 +1006,9 @@ class ParserRule(object):
         self.cache_marked = []
         #: Indicate if any previous rules should be avoided.
         self.avoid_previous_rules = False
+        #: Instantiation plan, compiled by the :class:`BuilderBase` when the
+        #: rule is applied for the first time.
+        self.plan = None
 
         if level == 0:
             self._detect_selectors()
@@ -1093,6 +1127,46 @@ class ParserRule(object):
         return '<ParserRule name=%r>' % (self.name, )
 
 
+class ParserRulePlan(object):
+    '''(internal) Instantiation plan of a :class:`ParserRule`, compiled once
+    and replayed by the :class:`BuilderBase` for every widget the rule is
+    applied to.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    __slots__ = ('id', 'canvas', 'children', 'properties', 'handlers')
+
+    def __init__(self, rule):
+        super(ParserRulePlan, self).__init__()
+        #: Id of the rule, only the first word is used
+        self.id = None
+        if rule.id:
+            self.id = rule.id = rule.id.split('#', 1)[0].strip()
+        #: List of (canvas name, canvas rule) to build
+        self.canvas = [(name, crule) for name, crule in (
+            ('before', rule.canvas_before), ('root', rule.canvas_root),
+            ('after', rule.canvas_after)) if crule]
+        #: List of [rule, factory item, class, is_template] for every child,
+        #: the class is resolved on first use by :meth:`resolve`
+        self.children = [[crule, False, None, False]
+                         for crule in rule.children]
+        #: Properties to set, in the order of the rule
+        self.properties = list(rule.properties.values())
+        #: Handlers to bind
+        self.handlers = rule.handlers
+
+    def resolve(self, entry):
+        '''Resolve the class of a child entry from the
+        :class:`~kivy.factory.Factory`. The caller must resolve it again when
+        the factory item of the class is not the one saved in the entry
+        anymore (the class has been unregistered or registered again).
+        '''
+        name = entry[0].name
+        cls = Factory.get(name)
+        entry[1:] = [Factory.classes.get(name), cls, Factory.is_template(name)]
+
+
 class Parser(object):
     '''Create a Parser object to parse a Kivy language file or Kivy content.
     '''
@@ -1105,7 +1179,7 @@ class Parser(object):
         list(range(ord('0'), ord('9') + 1)) + [ord('_')])
 
     __slots__ = ('rules', 'templates', 'root', 'sourcecode',
-                 'directives', 'filename', 'dynamic_classes')
+                 'directives', 'filename', 'dynamic_classes', 'objects')
 
     def __init__(self, **kwargs):
         super(Parser, self).__init__()
@@ -1115,11 +1189,16 @@ class Parser(object):
         self.sourcecode = []
         self.directives = []
         self.dynamic_classes = {}
+        self.objects = []
         self.filename = kwargs.get('filename', None)
         content = kwargs.get('content', None)
         if content is None:
             raise ValueError('No content passed')
-        self.parse(content)
+        cached = kwargs.get('cached', None)
+        if cached is not None:
+            self.load_cached(content, cached)
+        else:
+            self.parse(content)
 
     def execute_directives(self):
         global __KV_INCLUDES__
@@ -1221,6 +1300,7 @@ class Parser(object):
 
         # Get object from the first level
         objects, remaining_lines = self.parse_level(0, lines)
+        self.objects = objects
 
         # Precompile rules tree
         for rule in objects:
@@ -1232,6 +1312,68 @@ class Parser(object):
             ln, content = remaining_lines[0]
             raise ParserException(self, ln, 'Invalid data (not parsed)')
 
+    def dump_cached(self):
+        '''Return the directives and the precompiled rules tree of the parsed
+        content, as a structure that can be saved with :mod:`marshal` and
+        restored by passing it in the `cached` argument of a new
+        :class:`Parser` for the same content.
+
+        .. versionadded:: 1.8.1
+        '''
+        def dump_property(prop):
+            return (prop.line, prop.name, prop.value, prop.mode,
+                    prop.co_value, prop.watched_keys)
+
+        def dump_rule(rule):
+            if rule is None:
+                return None
+            return (rule.line, rule.name, rule.level, rule.id,
+                    [dump_property(x) for x in rule.properties.values()],
+                    [dump_property(x) for x in rule.handlers],
+                    [dump_rule(x) for x in rule.children],
+                    dump_rule(rule.canvas_before),
+                    dump_rule(rule.canvas_root),
+                    dump_rule(rule.canvas_after))
+
+        return (self.directives, [dump_rule(x) for x in self.objects])
+
+    def load_cached(self, content, cached):
+        '''Restore the rules of `content` from the result of
+        :meth:`dump_cached`, instead of parsing and compiling it.
+
+        .. versionadded:: 1.8.1
+        '''
+        lines = content.splitlines()
+        self.sourcecode = list(zip(list(range(len(lines))), lines))
+        directives, objects = cached
+        self.directives = [tuple(x) for x in directives]
+        self.execute_directives()
+
+        def load_property(data):
+            line, name, value, mode, co_value, watched_keys = data
+            prop = ParserRuleProperty(self, line, name, value)
+            prop.mode = mode
+            prop.co_value = co_value
+            prop.watched_keys = watched_keys
+            return prop
+
+        def load_rule(data):
+            if data is None:
+                return None
+            # the rules of the first level register themselves in the parser
+            rule = ParserRule(self, data[0], data[1], data[2])
+            rule.id = data[3]
+            for prop in data[4]:
+                rule.properties[prop[1]] = load_property(prop)
+            rule.handlers = [load_property(x) for x in data[5]]
+            rule.children = [load_rule(x) for x in data[6]]
+            rule.canvas_before = load_rule(data[7])
+            rule.canvas_root = load_rule(data[8])
+            rule.canvas_after = load_rule(data[9])
+            return rule
+
+        self.objects = [load_rule(x) for x in objects]
+
     def strip_comments(self, lines):
         '''Remove all comments from all lines in-place.
            Comments need to be on a single line and not at the end of a line.
@@ -1402,16 +1544,20 @@ def custom_callback(__kvlang__, idmap, *largs, **kwargs):
 
 
 def create_handler(iself, element, key, value, rule, idmap, delayed=False):
+    idmap = copy(idmap)
+    idmap.update(global_idmap)
+    idmap['self'] = iself.proxy_ref
+    return _create_handler(iself, element, key, value, rule, idmap, delayed)
+
+
+def _create_handler(iself, element, key, value, rule, idmap, delayed=False):
+    # same as create_handler(), but idmap is used as it is: it must already
+    # contain the global_idmap and self, and can be shared by the handlers of
+    # the same widget.
     locals()['__kvlang__'] = rule
 
     # create an handler
     uid = iself.uid
-    if uid not in _handlers:
-        _handlers[uid] = []
-
-    idmap = copy(idmap)
-    idmap.update(global_idmap)
-    idmap['self'] = iself.proxy_ref
 
     def call_fn(*args):
         if __debug__:
@@ -1428,21 +1574,38 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
 
     fn = delayed_call_fn if delayed else call_fn
 
-    # bind every key.value
+    # bind every key.value, with one bind_many() call per dispatcher
+    bindings = None
     if rule.watched_keys is not None:
         for k in rule.watched_keys:
             try:
                 f = idmap[k[0]]
                 for x in k[1:-1]:
                     f = getattr(f, x)
-                if isinstance(f, EventDispatcher):
-                    f.bind(**{k[-1]: fn})
-                    # make sure _handlers doesn't keep widgets alive
-                    _handlers[uid].append([get_proxy(f), k[-1], fn])
             except KeyError:
                 continue
             except AttributeError:
                 continue
+            if isinstance(f, EventDispatcher):
+                if bindings is None:
+                    bindings = {}
+                target = bindings.get(f.uid)
+                if target is None:
+                    target = bindings[f.uid] = (f, [])
+                target[1].append((k[-1], fn))
+
+    if bindings:
+        handlers = _handlers.get(uid)
+        if handlers is None:
+            handlers = _handlers[uid] = {}
+        for f, pairs in bindings.values():
+            handle = f.bind_many(pairs)
+            entry = handlers.get(f.uid)
+            if entry is None:
+                # make sure _handlers doesn't keep widgets alive
+                handlers[f.uid] = [get_proxy(f), list(handle)]
+            else:
+                entry[1].extend(handle)
 
     try:
         return eval(value, idmap)
@@ -1517,6 +1680,14 @@ class BuilderBase(object):
         self.templates = {}
         self.rules = []
         self.rulectx = {}
+        #: Directory of the compiled rules cache, or None to disable it. See
+        #: `Compiled rules cache` in the module documentation.
+        #:
+        #: .. versionadded:: 1.8.1
+        self.cache_dir = None
+        if 'KIVY_NO_KV_CACHE' not in environ and kivy_home_dir:
+            self.cache_dir = environ.get('KIVY_KV_CACHE_DIR',
+                                         join(kivy_home_dir, 'cache', 'kv'))
 
     def load_file(self, filename, **kwargs):
         '''Insert a file into the language builder and return the root widget
@@ -1590,7 +1761,7 @@ class BuilderBase(object):
 
         try:
             # parse the string
-            parser = Parser(content=string, filename=fn)
+            parser = self._parse(string, fn)
 
             # merge rules with our rules
             self.rules.extend(parser.rules)
@@ -1626,6 +1797,60 @@ class BuilderBase(object):
         finally:
             self._current_filename = None
 
+    def _parse(self, string, filename):
+        # create the parser of a kv content, restored from the compiled rules
+        # cache if possible. There is one cache entry per filename, so a
+        # modified file replaces its previous entry. A content without
+        # filename is never cached.
+        cache_dir = self.cache_dir
+        if not cache_dir or not filename:
+            return Parser(content=string, filename=filename)
+
+        key = sha1(filename.encode('utf-8') if not isinstance(filename, bytes)
+                   else filename)
+        cache_fn = join(cache_dir, key.hexdigest() + '.kvc')
+        digest = sha1(string.encode('utf-8') if not isinstance(string, bytes)
+                      else string).hexdigest()
+
+        cached = None
+        try:
+            with open(cache_fn, 'rb') as fd:
+                version, cached_digest, cached = marshal.loads(fd.read())
+            if version != _kv_cache_version or cached_digest != digest:
+                cached = None
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            cached = None
+        if cached is not None:
+            if __debug__:
+                trace('Builder: use the compiled rules of %s' % filename)
+            return Parser(content=string, filename=filename, cached=cached)
+
+        parser = Parser(content=string, filename=filename)
+        try:
+            data = marshal.dumps(
+                (_kv_cache_version, digest, parser.dump_cached()))
+        except ValueError:
+            # a constant value cannot be saved, don't cache this content
+            return parser
+        tmp_fn = None
+        try:
+            if not exists(cache_dir):
+                makedirs(cache_dir)
+            tmp_fd, tmp_fn = mkstemp(suffix='.tmp', dir=cache_dir)
+            with os.fdopen(tmp_fd, 'wb') as fd:
+                fd.write(data)
+            if exists(cache_fn):
+                unlink(cache_fn)
+            rename(tmp_fn, cache_fn)
+        except (IOError, OSError):
+            Logger.debug('Builder: unable to write the compiled rules cache')
+            if tmp_fn is not None and exists(tmp_fn):
+                try:
+                    unlink(tmp_fn)
+                except OSError:
+                    pass
+        return parser
+
     def template(self, *args, **ctx):
         '''Create a specialized template using a specific context.
         .. versionadded:: 1.0.5
@@ -1675,35 +1900,45 @@ class BuilderBase(object):
         # rule: the current rule
         # rootrule: the current root rule (for children of a rule)
 
-        # will collect reference to all the id in children
-        assert(rule not in self.rulectx)
-        self.rulectx[rule] = rctx = {
-            'ids': {'root': widget.proxy_ref},
-            'set': [], 'hdl': []}
-
-        # extract the context of the rootrule (not rule!)
-        assert(rootrule in self.rulectx)
-        rctx = self.rulectx[rootrule]
+        # the rule is compiled once into a plan, that is replayed for every
+        # widget
+        plan = rule.plan
+        if plan is None:
+            plan = rule.plan = ParserRulePlan(rule)
+
+        # will collect reference to all the id in children, in the context of
+        # the rootrule (not rule!)
+        if rule is rootrule:
+            assert(rule not in self.rulectx)
+            self.rulectx[rule] = rctx = {
+                'ids': {'root': widget.proxy_ref},
+                'set': [], 'hdl': [], 'new_ids': []}
+        else:
+            assert(rootrule in self.rulectx)
+            rctx = self.rulectx[rootrule]
+        ids = rctx['ids']
+        new_ids = rctx['new_ids']
 
         # if a template context is passed, put it as "ctx"
         if template_ctx is not None:
-            rctx['ids']['ctx'] = QueryDict(template_ctx)
+            ids['ctx'] = QueryDict(template_ctx)
+            new_ids.append('ctx')
 
         # if we got an id, put it in the root rule for a later global usage
-        if rule.id:
-            # use only the first word as `id` discard the rest.
-            rule.id = rule.id.split('#', 1)[0].strip()
-            rctx['ids'][rule.id] = widget.proxy_ref
+        if plan.id:
+            ids[plan.id] = widget.proxy_ref
+            new_ids.append(plan.id)
             # set id name as a attribute for root widget so one can in python
-            # code simply access root_widget.id_name
-            _ids = dict(rctx['ids'])
-            _root = _ids.pop('root')
+            # code simply access root_widget.id_name. Only the ids collected
+            # since the last update are added.
+            _root = ids['root']
             _new_ids = _root.ids
-            for _key in iterkeys(_ids):
-                if _ids[_key] == _root:
+            for _key in new_ids:
+                if ids[_key] == _root:
                     # skip on self
                     continue
-                _new_ids[_key] = _ids[_key]
+                _new_ids[_key] = ids[_key]
+            del new_ids[:]
             _root.ids = _new_ids
 
         # first, ensure that the widget have all the properties used in
@@ -1711,37 +1946,31 @@ class BuilderBase(object):
         rule.create_missing(widget)
 
         # build the widget canvas
-        if rule.canvas_before:
-            with widget.canvas.before:
-                self._build_canvas(widget.canvas.before, widget,
-                                   rule.canvas_before, rootrule)
-        if rule.canvas_root:
-            with widget.canvas:
-                self._build_canvas(widget.canvas, widget,
-                                   rule.canvas_root, rootrule)
-        if rule.canvas_after:
-            with widget.canvas.after:
-                self._build_canvas(widget.canvas.after, widget,
-                                   rule.canvas_after, rootrule)
+        for name, crule in plan.canvas:
+            canvas = widget.canvas
+            if name != 'root':
+                canvas = getattr(canvas, name)
+            with canvas:
+                self._build_canvas(canvas, widget, crule, rootrule)
 
         # create children tree
-        Factory_get = Factory.get
-        Factory_is_template = Factory.is_template
-        for crule in rule.children:
-            cname = crule.name
+        classes = Factory.classes
+        for entry in plan.children:
+            crule = entry[0]
+            if classes.get(crule.name) is not entry[1]:
+                plan.resolve(entry)
+            cls = entry[2]
 
             # depending if the child rule is a template or not, we are not
             # having the same approach
-            cls = Factory_get(cname)
-
-            if Factory_is_template(cname):
+            if entry[3]:
                 # we got a template, so extract all the properties and
                 # handlers, and push them in a "ctx" dictionary.
                 ctx = {}
                 idmap = copy(global_idmap)
-                idmap.update({'root': rctx['ids']['root']})
-                if 'ctx' in rctx['ids']:
-                    idmap.update({'ctx': rctx['ids']['ctx']})
+                idmap.update({'root': ids['root']})
+                if 'ctx' in ids:
+                    idmap.update({'ctx': ids['ctx']})
                 try:
                     for prule in crule.properties.values():
                         value = prule.co_value
@@ -1762,7 +1991,8 @@ class BuilderBase(object):
 
                 # reference it on our root rule context
                 if crule.id:
-                    rctx['ids'][crule.id] = child
+                    ids[crule.id] = child
+                    new_ids.append(crule.id)
 
             else:
                 # we got a "normal" rule, construct it manually
@@ -1775,29 +2005,34 @@ class BuilderBase(object):
                 self._apply_rule(child, crule, rootrule)
 
         # append the properties and handlers to our final resolution task
-        if rule.properties:
-            rctx['set'].append((widget.proxy_ref,
-                                list(rule.properties.values())))
-        if rule.handlers:
-            rctx['hdl'].append((widget.proxy_ref, rule.handlers))
+        if plan.properties:
+            rctx['set'].append((widget.proxy_ref, plan.properties))
+        if plan.handlers:
+            rctx['hdl'].append((widget.proxy_ref, plan.handlers))
 
         # if we are applying another rule that the root one, then it's done for
         # us!
         if rootrule is not rule:
-            del self.rulectx[rule]
             return
 
-        # normally, we can apply a list of properties with a proper context
+        # normally, we can apply a list of properties with a proper context.
+        # The handlers of a widget share the same idmap.
         try:
             rule = None
+            base_idmap = copy(ids)
+            base_idmap.update(global_idmap)
             for widget_set, rules in reversed(rctx['set']):
+                idmap = None
                 for rule in rules:
                     assert(isinstance(rule, ParserRuleProperty))
                     key = rule.name
                     value = rule.co_value
                     if type(value) is CodeType:
-                        value = create_handler(widget_set, widget_set, key,
-                                               value, rule, rctx['ids'])
+                        if idmap is None:
+                            idmap = copy(base_idmap)
+                            idmap['self'] = widget_set.proxy_ref
+                        value = _create_handler(widget_set, widget_set, key,
+                                                value, rule, idmap)
                     setattr(widget_set, key, value)
         except Exception as e:
             if rule is not None:
@@ -1809,6 +2044,8 @@ class BuilderBase(object):
         # build handlers
         try:
             crule = None
+            base_idmap = copy(global_idmap)
+            base_idmap.update(ids)
             for widget_set, rules in rctx['hdl']:
                 for crule in rules:
                     assert(isinstance(crule, ParserRuleProperty))
@@ -1816,8 +2053,7 @@ class BuilderBase(object):
                     key = crule.name
                     if not widget_set.is_event_type(key):
                         key = key[3:]
-                    idmap = copy(global_idmap)
-                    idmap.update(rctx['ids'])
+                    idmap = copy(base_idmap)
                     idmap['self'] = widget_set.proxy_ref
                     widget_set.bind(**{key: partial(custom_callback,
                                                     crule, idmap)})
@@ -1872,27 +2108,33 @@ class BuilderBase(object):
 
         .. versionadded:: 1.7.2
         '''
-        if uid not in _handlers:
+        handlers = _handlers.pop(uid, None)
+        if handlers is None:
             return
-        for f, k, fn in _handlers[uid]:
+        for f, handle in handlers.values():
             try:
-                f.unbind(**{k: fn})
+                f.unbind_many(handle)
             except ReferenceError:
                 # proxy widget is already gone, that's cool :)
                 pass
-        del _handlers[uid]
 
     def _build_canvas(self, canvas, widget, rule, rootrule):
         global Instruction
         if Instruction is None:
             Instruction = Factory.get('Instruction')
-        idmap = copy(self.rulectx[rootrule]['ids'])
-        for crule in rule.children:
-            name = crule.name
-            if name == 'Clear':
+        plan = rule.plan
+        if plan is None:
+            plan = rule.plan = ParserRulePlan(rule)
+        idmap = None
+        classes = Factory.classes
+        for entry in plan.children:
+            crule = entry[0]
+            if crule.name == 'Clear':
                 canvas.clear()
                 continue
-            instr = Factory.get(name)()
+            if classes.get(crule.name) is not entry[1]:
+                plan.resolve(entry)
+            instr = entry[2]()
             if not isinstance(instr, Instruction):
                 raise BuilderException(
                     crule.ctx, crule.line,
@@ -1902,7 +2144,13 @@ class BuilderBase(object):
                     key = prule.name
                     value = prule.co_value
                     if type(value) is CodeType:
-                        value = create_handler(
+                        if idmap is None:
+                            # the instructions of the canvas share the same
+                            # idmap
+                            idmap = copy(self.rulectx[rootrule]['ids'])
+                            idmap.update(global_idmap)
+                            idmap['self'] = widget.proxy_ref
+                        value = _create_handler(
                             widget, instr.proxy_ref,
                             key, value, prule, idmap, True)
                     setattr(instr, key, value)
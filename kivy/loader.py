@@ -30,6 +30,43 @@ parameters:
   loading images.
 - :attr:`Loader.max_upload_per_frame` - define the maximum image uploads in
   GPU to do per frame.
+- :attr:`Loader.upload_budget` and :attr:`Loader.upload_byte_budget` - define
+  how much time and how many bytes can be spent per frame on the GPU uploads.
+- :attr:`Loader.target_frametime` - let the Loader adapt the
+  :attr:`Loader.upload_budget` to hold a frame time.
+- :attr:`Loader.http_cache_dir` - define a directory where the images
+  downloaded over http are kept, and revalidated with the server on the next
+  load.
+
+.. versionchanged:: 1.8.1
+    The http and https images are downloaded through a pool of keep-alive
+    connections (see :mod:`kivy.network.connectionpool`), and decoded from
+    memory when the image provider supports it.
+
+Priority and cancellation
+-------------------------
+
+.. versionadded:: 1.8.1
+
+Each request can be given a priority, the requests with the highest priority
+are loaded first. The priority can be changed while the image is waiting to
+be loaded, for example according to the scroll position of the widget
+displaying it::
+
+    image = Loader.image('http://mysite.com/test.png', priority=10)
+    ...
+    Loader.set_priority(image, 0)
+
+When the same filename is requested several times while it is still loading,
+it is loaded only once and all the :class:`ProxyImage` are updated.
+
+.. important::
+
+    The Loader keeps only a weak reference to the returned
+    :class:`ProxyImage`: you are responsible for keeping a reference to it
+    until it's loaded. When all the :class:`ProxyImage` waiting for a file are
+    gone, or cancelled with :meth:`LoaderBase.cancel`, the file is not loaded
+    anymore.
 
 '''
 
@@ -41,13 +78,26 @@ from kivy.clock import Clock
 from kivy.cache import Cache
 from kivy.core.image import ImageLoader, Image
 from kivy.compat import PY2
+from kivy.network.connectionpool import HTTPConnectionPool
 
 from collections import deque
-from time import sleep
-from os.path import join
-from os import write, close, unlink, environ
+from heapq import heappop, heappush
+from itertools import count
+from os.path import join, exists
+from os import write, close, unlink, environ, makedirs, rename
+from hashlib import sha1
+from io import BytesIO
+from json import dump, load
 import threading
+import weakref
 import mimetypes
+import tempfile
+from timeit import default_timer as _upload_time
+
+if PY2:
+    from urlparse import urljoin
+else:
+    from urllib.parse import urljoin
 
 # Register a cache for loader
 Cache.register('kv.loader', limit=500, timeout=60)
@@ -89,12 +139,29 @@ class LoaderBase(object):
         self._error_image = None
         self._num_workers = 2
         self._max_upload_per_frame = 2
+        self._upload_budget = None
+        self._upload_byte_budget = None
+        self._target_frametime = None
+        # estimated upload time per byte, measured on the previous uploads
+        self._upload_cost = None
+        self._upload_stats = {
+            'frames': 0, 'uploads': 0, 'bytes': 0, 'time': 0.,
+            'max_frame_time': 0., 'deferred_frames': 0}
         self._paused = False
         self._resume_cond = threading.Condition()
 
-        self._q_load = deque()
+        # heap of (-priority, counter, request), with the outdated entries
+        # dropped when popped. _q_cond protects the requests and the heap.
+        self._q_load = []
+        self._q_counter = count()
+        self._q_cond = threading.Condition()
+        # number of requests queued but not yet given to a worker
+        self._q_unassigned = 0
         self._q_done = deque()
-        self._client = []
+        self._q_done_cond = threading.Condition()
+        self._requests = {}
+        self._http_pool = HTTPConnectionPool()
+        self._http_cache_dir = None
         self._running = False
         self._start_wanted = False
         self._trigger_update = Clock.create_trigger(self._update)
@@ -157,6 +224,104 @@ class LoaderBase(object):
     .. versionadded:: 1.6.0
     '''
 
+    def _set_upload_budget(self, budget):
+        if budget is not None and budget <= 0:
+            raise Exception('The upload budget must be positive')
+        self._upload_budget = budget
+
+    def _get_upload_budget(self):
+        return self._upload_budget
+
+    upload_budget = property(_get_upload_budget, _set_upload_budget)
+    '''Time in seconds that can be spent per frame on uploading images to the
+    GPU, defaults to None (no time limit). The cost of the next image is
+    estimated from its size and the time taken by the previous uploads, and
+    the image is kept for the next frame if it doesn't fit in the remaining
+    budget. At least one image is uploaded per frame::
+
+        Loader.max_upload_per_frame = None
+        Loader.upload_budget = 1 / 240.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def _set_upload_byte_budget(self, budget):
+        if budget is not None and budget <= 0:
+            raise Exception('The upload byte budget must be positive')
+        self._upload_byte_budget = budget
+
+    def _get_upload_byte_budget(self):
+        return self._upload_byte_budget
+
+    upload_byte_budget = property(_get_upload_byte_budget,
+                                  _set_upload_byte_budget)
+    '''Number of bytes that can be uploaded to the GPU per frame, defaults to
+    None (no size limit). At least one image is uploaded per frame, whatever
+    its size.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def _set_target_frametime(self, frametime):
+        if frametime is not None and frametime <= 0:
+            raise Exception('The target frame time must be positive')
+        self._target_frametime = frametime
+
+    def _get_target_frametime(self):
+        return self._target_frametime
+
+    target_frametime = property(_get_target_frametime, _set_target_frametime)
+    '''Frame time in seconds to hold while uploading images, defaults to None
+    (disabled). When set, the :attr:`upload_budget` is adjusted on every
+    frame: it's reduced when the last frame took longer than the target, and
+    grows with the remaining slack otherwise::
+
+        Loader.max_upload_per_frame = None
+        Loader.target_frametime = 1 / 60.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def upload_stats(self):
+        '''Return a dict with the statistics of the GPU uploads, to tune the
+        budgets:
+
+        - `frames`: number of frames with at least one upload,
+        - `uploads`: number of images uploaded,
+        - `bytes`: number of bytes uploaded,
+        - `time`: total time spent uploading, in seconds,
+        - `max_frame_time`: longest time spent uploading in one frame,
+        - `deferred_frames`: number of frames that stopped uploading because
+          of a budget while images were waiting,
+        - `cost_per_byte`: current estimation of the upload time per byte,
+        - `upload_budget`: current :attr:`upload_budget`.
+
+        .. versionadded:: 1.8.1
+        '''
+        stats = dict(self._upload_stats)
+        stats['cost_per_byte'] = self._upload_cost
+        stats['upload_budget'] = self._upload_budget
+        return stats
+
+    def _set_http_cache_dir(self, path):
+        self._http_cache_dir = path
+
+    def _get_http_cache_dir(self):
+        return self._http_cache_dir
+
+    http_cache_dir = property(_get_http_cache_dir, _set_http_cache_dir)
+    '''Directory used to keep the images downloaded over http or https,
+    defaults to None (no cache). When an image served with an `ETag` or a
+    `Last-Modified` header is requested again, even after restarting the
+    application, the server is asked whether it changed, and the cached copy
+    is used if it didn't::
+
+        Loader.http_cache_dir = join(App.get_running_app().user_data_dir,
+                                     'images')
+
+    .. versionadded:: 1.8.1
+    '''
+
     def _get_loading_image(self):
         if not self._loading_image:
             loading_png_fn = join(kivy_data_dir, 'images', 'image-loading.gif')
@@ -213,6 +378,9 @@ class LoaderBase(object):
     def stop(self):
         '''Stop the loader thread/process.'''
         self._running = False
+        with self._q_done_cond:
+            self._q_done_cond.notify_all()
+        self._http_pool.clear()
 
     def pause(self):
         '''Pause the loader, can be useful during interactions.
@@ -237,18 +405,63 @@ class LoaderBase(object):
             self._resume_cond.wait(0.25)
             self._resume_cond.release()
 
+    def _is_done_queue_full(self):
+        max_upload_per_frame = self.max_upload_per_frame
+        if max_upload_per_frame is None:
+            return False
+        return len(self._q_done) >= max_upload_per_frame * self._num_workers
+
+    def _push_request(self, request):
+        heappush(self._q_load, (-request['priority'], next(self._q_counter),
+                                request))
+
+    def _pop_request(self):
+        '''(internal) Return the queued request with the highest priority,
+        or None.
+        '''
+        with self._q_cond:
+            q_load = self._q_load
+            while q_load:
+                priority, counter, request = heappop(q_load)
+                if request['state'] != 'queued':
+                    continue
+                if -priority != request['priority']:
+                    # outdated entry, a newer one has been pushed
+                    continue
+                request['state'] = 'loading'
+                return request
+
+    def _load_next(self):
+        '''(internal) Wait for room in the done queue, then load the queued
+        request with the highest priority. Called by the thread.
+        '''
+        with self._q_done_cond:
+            while self._running and self._is_done_queue_full():
+                self._q_done_cond.wait()
+
+        self._wait_for_resume()
+        if not self._running:
+            return
+
+        request = self._pop_request()
+        if request is None:
+            return
+        try:
+            self._load(request)
+        except Exception:
+            # let the next request of this file try again
+            with self._q_cond:
+                request['state'] = 'done'
+                if self._requests.get(request['filename']) is request:
+                    del self._requests[request['filename']]
+            raise
+
     def _load(self, kwargs):
         '''(internal) Loading function, called by the thread.
         Will call _load_local() if the file is local,
         or _load_urllib() if the file is on Internet.
         '''
 
-        while len(self._q_done) >= (
-                self.max_upload_per_frame * self._num_workers):
-            sleep(0.1)
-
-        self._wait_for_resume()
-
         filename = kwargs['filename']
         load_callback = kwargs['load_callback']
         post_callback = kwargs['post_callback']
@@ -267,7 +480,7 @@ class LoaderBase(object):
         if post_callback:
             data = post_callback(data)
 
-        self._q_done.appendleft((filename, data))
+        self._q_done.appendleft((kwargs, data))
         self._trigger_update()
 
     def _load_local(self, filename, kwargs):
@@ -277,46 +490,25 @@ class LoaderBase(object):
         return ImageLoader.load(filename, keep_data=True, **kwargs)
 
     def _load_urllib(self, filename, kwargs):
-        '''(internal) Loading a network file. First download it, save it to a
-        temporary file, and pass it to _load_local().'''
-        if PY2:
-            import urllib2 as urllib_request
-
-            def gettype(info):
-                return info.gettype()
-        else:
-            import urllib.request as urllib_request
-
-            def gettype(info):
-                return info.get_content_type()
+        '''(internal) Loading a network file. First download it in memory,
+        then decode it from there if an image provider supports it. Otherwise,
+        save it to a temporary file, and pass it to _load_local().'''
         proto = filename.split(':', 1)[0]
-        if proto == 'smb':
-            try:
-                # note: it's important to load SMBHandler every time
-                # otherwise the data is occasionaly not loaded
-                from smb.SMBHandler import SMBHandler
-            except ImportError:
-                Logger.warning(
-                    'Loader: can not load PySMB: make sure it is installed')
-                return
-        import tempfile
-        data = fd = _out_osfd = None
+        data = _out_osfd = None
+        _out_filename = ''
         try:
-            _out_filename = ''
-
-            if proto == 'smb':
-                # read from samba shares
-                fd = urllib_request.build_opener(SMBHandler).open(filename)
+            if proto in ('http', 'https'):
+                idata, ctype = self._fetch_http(filename)
             else:
-                # read from internet
-                fd = urllib_request.urlopen(filename)
+                idata, ctype = self._fetch_urllib(filename)
+                if idata is None:
+                    return
 
             if '#.' in filename:
                 # allow extension override from URL fragment
                 suffix = '.' + filename.split('#.')[-1]
             else:
-                ctype = gettype(fd.info())
-                suffix = mimetypes.guess_extension(ctype)
+                suffix = mimetypes.guess_extension(ctype) if ctype else None
                 if not suffix:
                     # strip query string and split on path
                     parts = filename.split('?')[0].split('/')[1:]
@@ -326,35 +518,33 @@ class LoaderBase(object):
                     if len(parts) > 1 and '.' in parts[-1]:
                         # we don't want '.com', '.net', etc. as the extension
                         suffix = '.' + parts[-1].split('.')[-1]
-            _out_osfd, _out_filename = tempfile.mkstemp(
-                prefix='kivyloader', suffix=suffix)
-
-            idata = fd.read()
-            fd.close()
-            fd = None
+            ext = suffix[1:].lower() if suffix else ''
+
+            for loader in ImageLoader.loaders:
+                if ext in loader.extensions() and loader.can_load_memory():
+                    # decode directly from the downloaded buffer
+                    data = ImageLoader.load(filename, keep_data=True,
+                                            rawdata=idata, ext=ext, **kwargs)
+                    break
+            else:
+                _out_osfd, _out_filename = tempfile.mkstemp(
+                    prefix='kivyloader', suffix=suffix)
 
-            # write to local filename
-            write(_out_osfd, idata)
-            close(_out_osfd)
-            _out_osfd = None
+                # write to local filename
+                write(_out_osfd, idata.getvalue())
+                close(_out_osfd)
+                _out_osfd = None
 
-            # load data
-            data = self._load_local(_out_filename, kwargs)
+                # load data
+                data = self._load_local(_out_filename, kwargs)
 
             # FIXME create a clean API for that
             for imdata in data._data:
                 imdata.source = filename
         except Exception:
             Logger.exception('Loader: Failed to load image <%s>' % filename)
-            # close file when remote file not found or download error
-            try:
-                close(_out_osfd)
-            except OSError:
-                pass
             return self.error_image
         finally:
-            if fd:
-                fd.close()
             if _out_osfd:
                 close(_out_osfd)
             if _out_filename != '':
@@ -362,6 +552,151 @@ class LoaderBase(object):
 
         return data
 
+    def _fetch_urllib(self, filename):
+        '''(internal) Download a ftp or smb file with urllib. Return a tuple
+        (buffer, content type), or (None, None) if PySMB is missing.'''
+        if PY2:
+            import urllib2 as urllib_request
+
+            def gettype(info):
+                return info.gettype()
+        else:
+            import urllib.request as urllib_request
+
+            def gettype(info):
+                return info.get_content_type()
+        proto = filename.split(':', 1)[0]
+        if proto == 'smb':
+            try:
+                # note: it's important to load SMBHandler every time
+                # otherwise the data is occasionaly not loaded
+                from smb.SMBHandler import SMBHandler
+            except ImportError:
+                Logger.warning(
+                    'Loader: can not load PySMB: make sure it is installed')
+                return None, None
+            # read from samba shares
+            fd = urllib_request.build_opener(SMBHandler).open(filename)
+        else:
+            fd = urllib_request.urlopen(filename)
+        try:
+            return BytesIO(fd.read()), gettype(fd.info())
+        finally:
+            fd.close()
+
+    def _fetch_http(self, url, max_redirects=5):
+        '''(internal) Download a http or https file through the connection
+        pool and the http cache. Return a tuple (buffer, content type).'''
+        pool = self._http_pool
+        cache_fn, meta = self._http_cache_get(url)
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        location = url
+        for x in range(max_redirects + 1):
+            resp = pool.request(location, headers=headers)
+            try:
+                status = resp.status
+                if status in (301, 302, 303, 307, 308):
+                    resp.read()
+                    location = urljoin(location, resp.getheader('location'))
+                    continue
+                if status == 304 and meta is not None:
+                    resp.read()
+                    try:
+                        with open(cache_fn, 'rb') as fd:
+                            return (BytesIO(fd.read()),
+                                    meta.get('content_type'))
+                    except (IOError, OSError):
+                        # the cached data is gone: forget the metadata and
+                        # download the file again without the validators
+                        self._http_cache_drop(url)
+                        meta = None
+                        headers = {}
+                        location = url
+                        continue
+                if status != 200:
+                    resp.read()
+                    raise Exception('HTTP error %d' % status)
+
+                # stream the body in memory
+                idata = BytesIO()
+                while True:
+                    chunk = resp.read(65536)
+                    if not chunk:
+                        break
+                    idata.write(chunk)
+
+                ctype = resp.getheader('content-type')
+                if ctype:
+                    ctype = ctype.split(';')[0].strip()
+                etag = resp.getheader('etag')
+                last_modified = resp.getheader('last-modified')
+            finally:
+                pool.release(resp)
+
+            if etag or last_modified:
+                self._http_cache_set(url, idata, {
+                    'etag': etag, 'last_modified': last_modified,
+                    'content_type': ctype})
+            return idata, ctype
+
+        raise Exception('Too many redirections')
+
+    def _http_cache_get(self, url):
+        '''(internal) Return a tuple (data filename, metadata) of the cached
+        copy of `url`. The metadata is None if there is no valid copy.'''
+        cache_dir = self._http_cache_dir
+        if not cache_dir:
+            return None, None
+        fn = join(cache_dir, sha1(url.encode('utf-8')).hexdigest())
+        try:
+            with open(fn + '.json') as fd:
+                meta = load(fd)
+            if meta.get('url') != url:
+                return None, None
+            return fn + '.data', meta
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def _http_cache_drop(self, url):
+        '''(internal) Remove the cached metadata of `url`, so the next
+        request doesn't revalidate a copy that cannot be read anymore.'''
+        cache_dir = self._http_cache_dir
+        if not cache_dir:
+            return
+        fn = join(cache_dir, sha1(url.encode('utf-8')).hexdigest())
+        try:
+            unlink(fn + '.json')
+        except OSError:
+            pass
+
+    def _http_cache_set(self, url, idata, meta):
+        '''(internal) Save the downloaded `idata` in the http cache. The
+        metadata are written last, so an interrupted write is never read
+        back.'''
+        cache_dir = self._http_cache_dir
+        if not cache_dir:
+            return
+        fn = join(cache_dir, sha1(url.encode('utf-8')).hexdigest())
+        meta['url'] = url
+        try:
+            if not exists(cache_dir):
+                makedirs(cache_dir)
+            if exists(fn + '.json'):
+                unlink(fn + '.json')
+            with open(fn + '.data', 'wb') as fd:
+                fd.write(idata.getvalue())
+            with open(fn + '.tmp', 'w') as fd:
+                dump(meta, fd)
+            rename(fn + '.tmp', fn + '.json')
+        except (IOError, OSError):
+            Logger.exception('Loader: Unable to cache <%s>' % url)
+
     def _update(self, *largs):
         '''(internal) Check if a data is loaded, and pass to the client.'''
         # want to start it ?
@@ -375,31 +710,168 @@ class LoaderBase(object):
             self._trigger_update()
             return
 
-        for x in range(self.max_upload_per_frame):
-            try:
-                filename, data = self._q_done.pop()
-            except IndexError:
-                return
-
-            # create the image
+        if self._target_frametime is not None:
+            self._adapt_upload_budget(Clock.frametime)
+
+        max_upload = self.max_upload_per_frame
+        budget = self._upload_budget
+        byte_budget = self._upload_byte_budget
+        upload_cost = self._upload_cost
+        q_done = self._q_done
+        uploads = upload_bytes = 0
+        upload_time = 0.
+
+        while q_done:
+            if max_upload is not None and uploads >= max_upload:
+                break
+            if uploads:
+                # check if the next image fits in the budgets
+                request, data = q_done[-1]
+                size = self._get_upload_size(data)
+                if (byte_budget is not None and
+                        upload_bytes + size > byte_budget):
+                    self._upload_stats['deferred_frames'] += 1
+                    break
+                if (budget is not None and upload_cost is not None and
+                        upload_time + size * upload_cost > budget):
+                    self._upload_stats['deferred_frames'] += 1
+                    break
+
+            request, data = q_done.pop()
+            with self._q_done_cond:
+                self._q_done_cond.notify()
+
+            # create the image, and upload its texture now to measure it
+            filename = request['filename']
             image = data  # ProxyImage(data)
+            size = self._get_upload_size(image)
+            start = _upload_time()
+            image.texture
+            elapsed = _upload_time() - start
+            if size:
+                cost = elapsed / size
+                upload_cost = cost if upload_cost is None else \
+                    upload_cost * .8 + cost * .2
+            uploads += 1
+            upload_bytes += size
+            upload_time += elapsed
             if not image.nocache:
                 Cache.append('kv.loader', filename, image)
 
-            # update client
-            for c_filename, client in self._client[:]:
-                if filename != c_filename:
+            with self._q_cond:
+                request['state'] = 'done'
+                if self._requests.get(filename) is request:
+                    del self._requests[filename]
+                clients = [ref() for ref, priority in request['clients']]
+
+            # update clients
+            for client in clients:
+                if client is None:
                     continue
-                # got one client to update
                 client.image = image
                 client.loaded = True
                 client.dispatch('on_load')
-                self._client.remove((c_filename, client))
 
-        self._trigger_update()
+        if uploads:
+            self._upload_cost = upload_cost
+            stats = self._upload_stats
+            stats['frames'] += 1
+            stats['uploads'] += uploads
+            stats['bytes'] += upload_bytes
+            stats['time'] += upload_time
+            stats['max_frame_time'] = max(stats['max_frame_time'],
+                                          upload_time)
+
+        # the workers trigger us when the queue is empty
+        if q_done:
+            self._trigger_update()
+
+    def _get_upload_size(self, image):
+        '''(internal) Return the size in bytes of the data of an image.'''
+        image = getattr(image, 'image', image)
+        return sum(getattr(imdata, 'cache_size', 0)
+                   for imdata in getattr(image, '_data', None) or ())
+
+    def _adapt_upload_budget(self, frametime):
+        '''(internal) Adjust the upload budget to hold the target frame time:
+        reduce it multiplicatively when the last frame was too long, and
+        increase it with a part of the slack otherwise.'''
+        target = self._target_frametime
+        budget = self._upload_budget
+        if budget is None:
+            budget = target / 4.
+        if frametime > target:
+            budget *= .75
+        else:
+            budget += (target - frametime) / 4.
+        self._upload_budget = min(max(budget, target / 100.), target)
+
+    def _add_client(self, request, client, priority):
+        def remove_client(ref):
+            self._remove_client(request, ref)
+        request['clients'].append([weakref.ref(client, remove_client),
+                                   priority])
+        client._loader_request = request
+
+    def _remove_client(self, request, ref):
+        with self._q_cond:
+            request['clients'] = [x for x in request['clients']
+                                  if x[0] is not ref]
+            self._update_request(request)
+
+    def _update_request(self, request):
+        # update the priority of a queued request from the priorities of its
+        # clients, or cancel it if all of them are gone.
+        with self._q_cond:
+            if request['state'] != 'queued':
+                return
+            priorities = [priority for ref, priority in request['clients']
+                          if ref() is not None]
+            if not priorities:
+                request['state'] = 'cancelled'
+                filename = request['filename']
+                if self._requests.get(filename) is request:
+                    del self._requests[filename]
+                return
+            priority = max(priorities)
+            if priority != request['priority']:
+                request['priority'] = priority
+                self._push_request(request)
+
+    def set_priority(self, client, priority):
+        '''Change the priority of the request of a :class:`ProxyImage`
+        returned by :meth:`image`. It has no effect if the image is already
+        loading or loaded.
+
+        .. versionadded:: 1.8.1
+        '''
+        request = getattr(client, '_loader_request', None)
+        if request is None:
+            return
+        with self._q_cond:
+            for item in request['clients']:
+                if item[0]() is client:
+                    item[1] = priority
+            self._update_request(request)
+
+    def cancel(self, client):
+        '''Stop waiting for the image of a :class:`ProxyImage` returned by
+        :meth:`image`. If no other :class:`ProxyImage` waits for the same
+        file, and it's not loading yet, the file will not be loaded.
+
+        .. versionadded:: 1.8.1
+        '''
+        request = getattr(client, '_loader_request', None)
+        if request is None:
+            return
+        with self._q_cond:
+            request['clients'] = [x for x in request['clients']
+                                  if x[0]() is not client]
+            self._update_request(request)
+        client._loader_request = None
 
     def image(self, filename, load_callback=None, post_callback=None,
-              **kwargs):
+              priority=0, **kwargs):
         '''Load a image using the Loader. A ProxyImage is returned with a
         loading image. You can use it as follows::
 
@@ -413,14 +885,20 @@ class LoaderBase(object):
                         self.image.texture = proxyImage.image.texture
 
                 def build(self):
-                    proxyImage = Loader.image("myPic.jpg")
-                    proxyImage.bind(on_load=self._image_loaded)
+                    # keep a reference, the Loader doesn't
+                    self.proxyImage = Loader.image("myPic.jpg")
+                    self.proxyImage.bind(on_load=self._image_loaded)
                     self.image = Image()
                     return self.image
 
             TestApp().run()
 
         In order to cancel all background loading, call *Loader.stop()*.
+
+        .. versionchanged:: 1.8.1
+            `priority` has been added. The requests with the highest
+            priority are loaded first. Concurrent requests of the same
+            filename are loaded only once.
         '''
         data = Cache.get('kv.loader', filename)
         if data not in (None, False):
@@ -431,23 +909,27 @@ class LoaderBase(object):
 
         client = ProxyImage(self.loading_image,
                             loading_image=self.loading_image, **kwargs)
-        self._client.append((filename, client))
-
-        if data is None:
-            # if data is None, this is really the first time
-            self._q_load.appendleft({
-                'filename': filename,
-                'load_callback': load_callback,
-                'post_callback': post_callback,
-                'kwargs': kwargs})
-            if not kwargs.get('nocache', False):
-                Cache.append('kv.loader', filename, False)
-            self._start_wanted = True
-            self._trigger_update()
-        else:
-            # already queued for loading
-            pass
 
+        with self._q_cond:
+            request = self._requests.get(filename)
+            if request is None:
+                # first request for this file
+                request = self._requests[filename] = {
+                    'filename': filename,
+                    'load_callback': load_callback,
+                    'post_callback': post_callback,
+                    'kwargs': kwargs,
+                    'priority': priority,
+                    'state': 'queued',
+                    'clients': []}
+                self._push_request(request)
+                self._q_unassigned += 1
+            # else, already queued for loading
+            self._add_client(request, client, priority)
+            self._update_request(request)
+
+        self._start_wanted = True
+        self._trigger_update()
         return client
 
 #
@@ -521,12 +1003,11 @@ else:
             self.pool.stop()
 
         def run(self, *largs):
-            while self._running:
-                try:
-                    parameters = self._q_load.pop()
-                except:
-                    return
-                self.pool.add_task(self._load, parameters)
+            # one task per queued request, the worker picks the request
+            # with the highest priority when it starts the task.
+            while self._running and self._q_unassigned:
+                self._q_unassigned -= 1
+                self.pool.add_task(self._load_next)
 
     Loader = LoaderThreadPool()
     Logger.info('Loader: using a thread pool of {} workers'.format(
@@ -13,6 +13,20 @@ Usage
 
 For normal module usage, please see the :mod:`~kivy.modules` documentation.
 
+Profiling
+---------
+
+.. versionadded:: 1.8.1
+
+With the `profile` option, the module starts the profiling of the
+:class:`~kivy.clock.Clock` callbacks, shows the number of frames that took
+more than `1 / maxfps` next to the FPS, and writes the most expensive
+callbacks to the log when the module is stopped::
+
+    python main.py -m monitor:profile
+
+Add `dump_interval=10` to also write them every 10 seconds.
+
 '''
 
 __all__ = ('start', 'stop')
@@ -20,6 +34,7 @@ __all__ = ('start', 'stop')
 from kivy.uix.label import Label
 from kivy.graphics import Rectangle, Color
 from kivy.clock import Clock
+from kivy.logger import Logger
 from functools import partial
 
 _statsinput = 0
@@ -28,6 +43,9 @@ _maxinput = -1
 
 def update_fps(ctx, *largs):
     ctx.label.text = 'FPS: %f' % Clock.get_fps()
+    profiler = Clock.profiler
+    if profiler is not None:
+        ctx.label.text += ' - Overruns: %d' % profiler.overruns
     ctx.rectangle.texture = ctx.label.texture
     ctx.rectangle.size = ctx.label.texture_size
 
@@ -74,7 +92,24 @@ def start(win, ctx):
                           size=(4, 0)))
     Clock.schedule_interval(partial(update_fps, ctx), .5)
     Clock.schedule_interval(partial(update_stats, ctx), 1 / 60.)
+    if ctx.config.get('profile'):
+        Clock.start_profiling()
+        interval = float(ctx.config.get('dump_interval', 0))
+        if interval > 0:
+            Clock.schedule_interval(dump_profile, interval)
+
+
+def dump_profile(*largs):
+    profiler = Clock.profiler
+    if profiler is None:
+        return
+    for line in profiler.dump().splitlines():
+        Logger.info('Monitor: %s' % line)
 
 
 def stop(win, ctx):
     win.canvas.remove(ctx.label)
+    if ctx.config.get('profile'):
+        Clock.unschedule(dump_profile)
+        dump_profile()
+        Clock.stop_profiling()
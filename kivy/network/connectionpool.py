@@ -0,0 +1,213 @@
+'''
+Connection pool
+===============
+
+.. versionadded:: 1.8.1
+
+The :class:`HTTPConnectionPool` keeps idle HTTP/1.1 connections open per
+host, so that consecutive requests to the same server can skip the TCP (and
+TLS) handshake. It is thread-safe and is used by the
+:class:`~kivy.loader.Loader` to download images::
+
+    from kivy.network.connectionpool import HTTPConnectionPool
+
+    pool = HTTPConnectionPool()
+    resp = pool.request('http://kivy.org/index.html')
+    try:
+        data = resp.read()
+    finally:
+        pool.release(resp)
+
+A connection goes back to the pool only when its response has been fully
+read and the server did not ask to close it. Otherwise, :meth:`release`
+closes it.
+
+A server may close an idle connection at any time. When a request on a
+reused connection finds it closed before any byte of the response has been
+received, the request is sent again on a new connection, only if its method
+is in :attr:`HTTPConnectionPool.retry_methods`. A timeout is never retried.
+'''
+
+__all__ = ('HTTPConnectionPool', )
+
+import errno
+from collections import deque
+from threading import Lock
+from socket import error as socket_error, getdefaulttimeout
+from kivy.compat import PY2
+
+if PY2:
+    from httplib import HTTPConnection, HTTPException, BadStatusLine
+    from urlparse import urlparse
+else:
+    from http.client import HTTPConnection, HTTPException, BadStatusLine
+    from urllib.parse import urlparse
+
+# errors of a connection closed before the request could be sent
+_closed_errnos = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED,
+                  errno.EBADF)
+
+try:
+    HTTPSConnection = None
+    if PY2:
+        from httplib import HTTPSConnection
+    else:
+        from http.client import HTTPSConnection
+except ImportError:
+    # depending the platform, if openssl support wasn't compiled before python,
+    # this class is not available.
+    pass
+
+
+class HTTPConnectionPool(object):
+    '''Pool of keep-alive HTTP connections, indexed by (scheme, host, port).
+
+    :Parameters:
+        `max_idle`: int, defaults to 4
+            Maximum number of idle connections kept for each host.
+        `timeout`: int, defaults to None
+            If set, blocking operations will timeout after this many seconds.
+    '''
+
+    #: Methods sent again on a new connection when a reused connection has
+    #: been closed by the server. Sending the other ones again could run
+    #: them twice on the server.
+    retry_methods = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def __init__(self, max_idle=4, timeout=None):
+        super(HTTPConnectionPool, self).__init__()
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = Lock()
+        #: Number of connections created by the pool
+        self.connections_created = 0
+        #: Number of requests sent on a reused connection
+        self.connections_reused = 0
+
+    def get_connection_for_scheme(self, scheme):
+        '''Return the Connection class for a particular scheme.
+
+        Actual supported schemes: http, https.
+        '''
+        if scheme == 'http':
+            return HTTPConnection
+        elif scheme == 'https' and HTTPSConnection is not None:
+            return HTTPSConnection
+        else:
+            raise Exception('No class for scheme %s' % scheme)
+
+    def _get_key(self, parse):
+        scheme = parse.scheme
+        port = parse.port
+        if port is None:
+            port = 443 if scheme == 'https' else 80
+        return scheme, parse.hostname, port
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            # the timeout may be different from the previous request
+            if timeout is None:
+                timeout = getdefaulttimeout()
+            if conn.timeout != timeout:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+            return conn, True
+        cls = self.get_connection_for_scheme(key[0])
+        args = {}
+        if timeout is not None:
+            args['timeout'] = timeout
+        self.connections_created += 1
+        return cls(key[1], key[2], **args), False
+
+    def request(self, url, method='GET', body=None, headers=None,
+                timeout=None):
+        '''Send a request and return the response once its headers have been
+        read. The response must be given back with :meth:`release` when you
+        are done with it.
+
+        If a reused connection has been closed by the server in the meantime,
+        a request using one of the :attr:`retry_methods` is sent again on a
+        new connection.
+
+        `timeout` overrides the :attr:`timeout` of the pool for this request.
+        '''
+        parse = urlparse(url)
+        key = self._get_key(parse)
+        if timeout is None:
+            timeout = self.timeout
+
+        # reconstruct path to pass on the request
+        path = parse.path or '/'
+        if parse.params:
+            path += ';' + parse.params
+        if parse.query:
+            path += '?' + parse.query
+
+        retry = method.upper() in self.retry_methods
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body, headers or {})
+            except socket_error as e:
+                conn.close()
+                # stale keep-alive connection, try again with a new one
+                if reused and retry and getattr(e, 'errno', None) in \
+                        _closed_errnos:
+                    continue
+                raise
+            except HTTPException:
+                conn.close()
+                raise
+            try:
+                resp = conn.getresponse()
+            except (HTTPException, socket_error) as e:
+                conn.close()
+                # closed by the server without a byte of response. In python
+                # 3, it's a RemoteDisconnected, in python 2 the status line is
+                # empty.
+                if reused and retry and isinstance(e, BadStatusLine) and (
+                        isinstance(e, socket_error) or
+                        e.line in ('', "''")):
+                    continue
+                raise
+            if reused:
+                self.connections_reused += 1
+            resp._pool_key = key
+            resp._pool_conn = conn
+            return resp
+
+    def release(self, resp):
+        '''Give back the connection used by the response `resp`. The
+        connection is kept for a next request only if the response has been
+        fully read and can be reused, otherwise it is closed.
+        '''
+        conn = resp._pool_conn
+        if conn is None:
+            return
+        resp._pool_conn = None
+        if not resp.isclosed() or resp.will_close:
+            resp.close()
+            conn.close()
+            return
+        with self._lock:
+            idle = self._idle.get(resp._pool_key)
+            if idle is None:
+                idle = self._idle[resp._pool_key] = deque()
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        '''Close all the idle connections.
+        '''
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
@@ -53,12 +53,39 @@ Example of Posting data (adapted from httplib example)::
 
 If you want a synchronous request, you can call the wait() method.
 
+Request engine
+--------------
+
+.. versionadded:: 1.8.1
+
+The requests are run by a :class:`UrlRequestEngine`, shared by all the
+requests: a bounded pool of worker threads, using a
+:class:`~kivy.network.connectionpool.HTTPConnectionPool` to reuse the
+keep-alive connections to the same host. Firing many requests at once queues
+them, instead of starting one thread and one connection for each::
+
+    from kivy.network.urlrequest import UrlRequest
+
+    UrlRequest.engine.max_workers = 8
+    for i in range(200):
+        UrlRequest('http://localhost:8000/api/item/%d' % i, on_success=got)
+
+The callbacks are still called in the main thread, by the
+:class:`~kivy.clock.Clock`.
+
+.. versionchanged:: 1.8.1
+    :class:`UrlRequest` is not a `Thread` anymore, and the requests are
+    run by the :attr:`UrlRequest.engine`. Only :meth:`UrlRequest.is_alive`,
+    :meth:`UrlRequest.join`, `name` and `daemon` are kept from `Thread`.
+
 '''
 
+__all__ = ('UrlRequest', 'UrlRequestEngine')
+
 from collections import deque
-from threading import Thread
+from itertools import count
+from threading import Condition, Event, Thread
 from json import loads
-from time import sleep
 from kivy.compat import PY2
 
 if PY2:
@@ -82,15 +109,95 @@ except ImportError:
 from kivy.clock import Clock
 from kivy.weakmethod import WeakMethod
 from kivy.logger import Logger
+from kivy.network.connectionpool import HTTPConnectionPool
 
 
-# list to save UrlRequest and prevent GC on un-referenced objects
-g_requests = []
+class UrlRequestEngine(object):
+    '''Run the :class:`UrlRequest` on a bounded pool of worker threads, with
+    keep-alive connections. See the module documentation for more
+    information.
 
+    :Parameters:
+        `max_workers`: int, defaults to 4
+            Maximum number of requests running at the same time.
+        `max_idle`: int, defaults to 4
+            Maximum number of idle connections kept for each host.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    def __init__(self, max_workers=4, max_idle=4):
+        super(UrlRequestEngine, self).__init__()
+        #: Maximum number of worker threads
+        self.max_workers = max_workers
+        #: :class:`~kivy.network.connectionpool.HTTPConnectionPool` used by
+        #: the workers
+        self.pool = HTTPConnectionPool(max_idle=max_idle)
+        self._requests = deque()
+        self._condition = Condition()
+        self._workers = []
+        self._idle_workers = 0
+        # requests not completely dispatched yet, main thread only. It also
+        # prevents the GC of the un-referenced requests.
+        self._active = []
 
-class UrlRequest(Thread):
+    @property
+    def num_workers(self):
+        '''Number of worker threads started.
+        '''
+        return len(self._workers)
+
+    def submit(self, request):
+        '''Queue the `request`, it will be run by the next available worker.
+        '''
+        with self._condition:
+            requests = self._requests
+            requests.append(request)
+            # start a worker if the idle ones are not enough
+            if (len(requests) > self._idle_workers and
+                    len(self._workers) < self.max_workers):
+                worker = Thread(target=self._run, name='UrlRequestWorker')
+                worker.daemon = True
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._condition.notify()
+        if not self._active:
+            Clock.schedule_interval(self._dispatch_results, 0)
+        self._active.append(request)
+
+    def _run(self):
+        requests = self._requests
+        condition = self._condition
+        while True:
+            with condition:
+                self._idle_workers += 1
+                while not requests:
+                    condition.wait()
+                self._idle_workers -= 1
+                request = requests.popleft()
+            request.run()
+
+    def _dispatch_results(self, dt):
+        active = self._active
+        for request in active[:]:
+            request._dispatch_result(dt)
+            if request._is_finished and not request._queue:
+                active.remove(request)
+        if not active:
+            return False
+
+
+class UrlRequest(object):
     '''A UrlRequest. See module documentation for usage.
 
+    .. versionchanged:: 1.8.1
+        The request is run by the :attr:`engine` instead of its own thread,
+        and :meth:`wait` returns on errors too. It's not a `Thread` anymore:
+        :meth:`is_alive`, :meth:`join`, `name` and `daemon` are kept for
+        compatibility, the other methods and attributes of `Thread` are
+        gone.
+
     .. versionchanged:: 1.5.1
         Add `debug` parameter
 
@@ -145,6 +252,16 @@ class UrlRequest(Thread):
         Parameter `on_failure` added.
     '''
 
+    #: :class:`UrlRequestEngine` running the requests, shared by all the
+    #: requests.
+    engine = UrlRequestEngine()
+
+    #: Always True, the workers of the :attr:`engine` don't prevent the
+    #: application from exiting. Kept for compatibility.
+    daemon = True
+
+    _counter = count(1)
+
     def __init__(self, url, on_success=None, on_redirect=None,
                  on_failure=None, on_error=None, on_progress=None,
                  req_body=None, req_headers=None, chunk_size=8192,
@@ -152,8 +269,9 @@ class UrlRequest(Thread):
                  file_path=None):
         super(UrlRequest, self).__init__()
         self._queue = deque()
-        self._trigger_result = Clock.create_trigger(self._dispatch_result, 0)
-        self.daemon = True
+        self._results_ready = Event()
+        # set when the request has run
+        self._done = Event()
         self.on_success = WeakMethod(on_success) if on_success else None
         self.on_redirect = WeakMethod(on_redirect) if on_redirect else None
         self.on_failure = WeakMethod(on_failure) if on_failure else None
@@ -181,13 +299,23 @@ class UrlRequest(Thread):
         #: Request headers passed in __init__
         self.req_headers = req_headers
 
-        # save our request to prevent GC
-        g_requests.append(self)
+        #: Name of the request, like the name of the `Thread` it was before
+        #: 1.8.1.
+        self.name = 'UrlRequest-%d' % next(UrlRequest._counter)
 
-        self.start()
+        self.engine.submit(self)
 
     def run(self):
-        q = self._queue.appendleft
+        '''Fetch the url. This is called in a worker thread of the
+        :attr:`engine`, the results are dispatched in the main thread.
+        '''
+        appendleft = self._queue.appendleft
+        results_ready = self._results_ready.set
+
+        def q(result):
+            appendleft(result)
+            results_ready()
+
         url = self.url
         req_body = self.req_body
         req_headers = self.req_headers
@@ -200,26 +328,12 @@ class UrlRequest(Thread):
             q(('error', None, e))
         else:
             q(('success', resp, result))
-
-        # using trigger can result in a missed on_success event
-        self._trigger_result()
-
-        # clean ourself when the queue is empty
-        while len(self._queue):
-            sleep(.1)
-            self._trigger_result()
-
-        # ok, authorize the GC to clean us.
-        if self in g_requests:
-            g_requests.remove(self)
+        finally:
+            self._done.set()
 
     def _fetch_url(self, url, body, headers, q):
         # Parse and fetch the current url
-        trigger = self._trigger_result
-        chunk_size = self._chunk_size
-        report_progress = self.on_progress is not None
         timeout = self._timeout
-        file_path = self.file_path
 
         if self._debug:
             Logger.debug('UrlRequest: {0} Fetch url <{1}>'.format(
@@ -229,12 +343,36 @@ class UrlRequest(Thread):
             Logger.debug('UrlRequest: {0} - headers: {1}'.format(
                 id(self), headers))
 
-        # parse url
-        parse = urlparse(url)
+        # send request
+        method = self._method
+        if method is None:
+            method = 'GET' if body is None else 'POST'
 
-        # translate scheme to connection class
+        # the connections of the usual schemes are reused, a custom
+        # connection class gets a connection for this request only
+        pool = self.engine.pool
+        parse = urlparse(url)
         cls = self.get_connection_for_scheme(parse.scheme)
+        if cls is pool.get_connection_for_scheme(parse.scheme):
+            req = None
+            resp = pool.request(url, method, body, headers, timeout=timeout)
+        else:
+            req = self._open_connection(cls, parse, timeout)
+            req.request(method, self._get_path(parse), body, headers or {})
+            resp = req.getresponse()
+
+        try:
+            result = self._read_response(resp, q)
+        finally:
+            if req is None:
+                pool.release(resp)
+            else:
+                req.close()
+
+        # return everything
+        return result, resp
 
+    def _open_connection(self, cls, parse, timeout):
         # correctly determine host/port
         port = None
         host = parse.netloc.split(':')
@@ -246,8 +384,9 @@ class UrlRequest(Thread):
         args = {}
         if timeout is not None:
             args['timeout'] = timeout
-        req = cls(host, port, **args)
+        return cls(host, port, **args)
 
+    def _get_path(self, parse):
         # reconstruct path to pass on the request
         path = parse.path
         if parse.params:
@@ -256,15 +395,12 @@ class UrlRequest(Thread):
             path += '?' + parse.query
         if parse.fragment:
             path += '#' + parse.fragment
+        return path
 
-        # send request
-        method = self._method
-        if method is None:
-            method = 'GET' if body is None else 'POST'
-        req.request(method, path, body, headers or {})
-
-        # read header
-        resp = req.getresponse()
+    def _read_response(self, resp, q):
+        chunk_size = self._chunk_size
+        report_progress = self.on_progress is not None
+        file_path = self.file_path
 
         # read content
         if report_progress or file_path is not None:
@@ -280,7 +416,8 @@ class UrlRequest(Thread):
 
             def get_chunks(fd=None):
                 bytes_so_far = 0
-                result = b''
+                # a bytearray grows in place, unlike bytes
+                result = bytearray()
                 while 1:
                     chunk = resp.read(chunk_size)
                     if not chunk:
@@ -289,14 +426,13 @@ class UrlRequest(Thread):
                     if fd:
                         fd.write(chunk)
                     else:
-                        result += chunk
+                        result.extend(chunk)
 
                     bytes_so_far += len(chunk)
                     # report progress to user
                     if report_progress:
                         q(('progress', resp, (bytes_so_far, total_size)))
-                        trigger()
-                return bytes_so_far, result
+                return bytes_so_far, bytes(result)
 
             if file_path is not None:
                 with open(file_path, 'wb') as fd:
@@ -304,19 +440,14 @@ class UrlRequest(Thread):
             else:
                 bytes_so_far, result = get_chunks()
 
-            # ensure that restults are dispatched for the last chunk,
-            # avoid trigger
+            # ensure that restults are dispatched for the last chunk
             if report_progress:
                 q(('progress', resp, (bytes_so_far, total_size)))
-                trigger()
         else:
             result = resp.read()
             if isinstance(result, bytes):
                 result = result.decode('utf-8')
-        req.close()
-
-        # return everything
-        return result, resp
+        return result
 
     def get_connection_for_scheme(self, scheme):
         '''Return the Connection class for a particular scheme.
@@ -466,9 +597,28 @@ class UrlRequest(Thread):
         '''
         return self._chunk_size
 
+    def is_alive(self):
+        '''Return True until the request has run in the :attr:`engine`,
+        like the `Thread` it was before 1.8.1. Its callbacks may not have been
+        dispatched yet.
+
+        .. versionadded:: 1.8.1
+        '''
+        return not self._done.is_set()
+
+    isAlive = is_alive
+
+    def join(self, timeout=None):
+        '''Wait until the request has run in the :attr:`engine`, or for
+        `timeout` seconds, like the `Thread` it was before 1.8.1. The
+        callbacks are not dispatched, use :meth:`wait` for that.
+
+        .. versionadded:: 1.8.1
+        '''
+        self._done.wait(timeout)
+
     def wait(self, delay=0.5):
-        '''Wait for the request to finish (until :attr:`resp_status` is not
-        None)
+        '''Wait for the request to finish, and dispatch its callbacks.
 
         .. note::
             This method is intended to be used in the main thread, and the
@@ -476,10 +626,17 @@ class UrlRequest(Thread):
             from which you're calling.
 
         .. versionadded:: 1.1.0
+
+        .. versionchanged:: 1.8.1
+            The callbacks are dispatched as soon as the results arrive,
+            `delay` is the maximum time between two dispatches. It returns
+            when the request has finished, even after an error.
         '''
-        while self.resp_status is None:
+        results_ready = self._results_ready
+        while not self._is_finished:
+            results_ready.wait(delay)
+            results_ready.clear()
             self._dispatch_result(delay)
-            sleep(delay)
 
 
 if __name__ == '__main__':
@@ -496,9 +653,7 @@ if __name__ == '__main__':
 
     req = UrlRequest('http://api.twitter.com/1/trends.json',
                      on_success, on_error)
-    while not req.is_finished:
-        sleep(1)
-        Clock.tick()
+    req.wait()
 
     print('result =', req.result)
     print('error =', req.error)
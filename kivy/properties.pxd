@@ -29,6 +29,8 @@ cdef class Property:
     cpdef link_deps(self, EventDispatcher obj, str name)
     cpdef bind(self, EventDispatcher obj, observer)
     cpdef unbind(self, EventDispatcher obj, observer)
+    cpdef bind_observers(self, EventDispatcher obj, list observers)
+    cpdef unbind_observers(self, EventDispatcher obj, list observers)
     cdef compare_value(self, a, b)
     cpdef set(self, EventDispatcher obj, value)
     cpdef get(self, EventDispatcher obj)
@@ -341,6 +341,36 @@ cdef class Property:
             if item == observer:
                 ps.observers.remove(item)
 
+    cpdef bind_observers(self, EventDispatcher obj, list observers):
+        '''Add many observers at once. Same as calling :meth:`bind` for each
+        of them.
+
+        .. versionadded:: 1.8.1
+        '''
+        cdef PropertyStorage ps = obj.__storage[self._name]
+        cdef list current = ps.observers
+        for observer in observers:
+            if observer not in current:
+                current.append(observer)
+
+    cpdef unbind_observers(self, EventDispatcher obj, list observers):
+        '''Remove many observers at once, with a single pass over the
+        observers list. Same as calling :meth:`unbind` for each of them.
+
+        .. versionadded:: 1.8.1
+        '''
+        cdef PropertyStorage ps = obj.__storage[self._name]
+        if not observers or not ps.observers:
+            return
+        try:
+            remove = set(observers)
+            ps.observers[:] = [item for item in ps.observers
+                               if item not in remove]
+        except TypeError:
+            # unhashable observers, compare them one by one
+            ps.observers[:] = [item for item in ps.observers
+                               if item not in observers]
+
     def __set__(self, EventDispatcher obj, val):
         self.set(obj, val)
 
@@ -0,0 +1,133 @@
+'''
+Spatial index
+=============
+
+.. versionadded:: 1.8.1
+
+The :class:`SpatialGrid` stores objects by their axis-aligned bounding box in
+a uniform grid, and returns the objects whose box contains a point without
+looking at the others. It is used by the :class:`~kivy.uix.widget.Widget`
+when :attr:`~kivy.uix.widget.Widget.touch_index` is enabled, to find the
+children under a touch::
+
+    >>> from kivy.spatialindex import SpatialGrid
+    >>> grid = SpatialGrid(cell_size=100)
+    >>> grid.insert('a', 0, 0, 50, 50)
+    >>> grid.insert('b', 40, 40, 200, 200)
+    >>> sorted(grid.query(45, 45))
+    ['a', 'b']
+    >>> grid.query(150, 150)
+    ['b']
+
+Each object is stored in all the cells its box overlaps. An object covering
+more than :attr:`SpatialGrid.max_cells` cells is not stored in the cells,
+but checked for every query.
+'''
+
+__all__ = ('SpatialGrid', )
+
+from math import floor
+
+
+class SpatialGrid(object):
+    '''Uniform grid of axis-aligned bounding boxes.
+
+    :Parameters:
+        `cell_size`: int, defaults to 128
+            Width and height of a cell of the grid.
+        `max_cells`: int, defaults to 64
+            Maximum number of cells an object is stored in.
+    '''
+
+    def __init__(self, cell_size=128, max_cells=64):
+        super(SpatialGrid, self).__init__()
+        self.cell_size = float(cell_size)
+        self.max_cells = max_cells
+        self._cells = {}
+        # object -> (x, y, right, top, cells)
+        self._boxes = {}
+        # objects too big for the cells
+        self._large = set()
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, obj):
+        return obj in self._boxes
+
+    def insert(self, obj, x, y, width, height):
+        '''Add `obj` with the box (x, y, width, height), or move it if it's
+        already in the grid.
+        '''
+        if obj in self._boxes:
+            self.remove(obj)
+        right = x + width
+        top = y + height
+        size = self.cell_size
+        cx, cy = int(floor(x / size)), int(floor(y / size))
+        cr, ct = int(floor(right / size)), int(floor(top / size))
+        if (cr - cx + 1) * (ct - cy + 1) > self.max_cells:
+            self._large.add(obj)
+            cells = ()
+        else:
+            cells = [(i, j) for i in range(cx, cr + 1)
+                     for j in range(cy, ct + 1)]
+            grid = self._cells
+            for cell in cells:
+                content = grid.get(cell)
+                if content is None:
+                    grid[cell] = [obj]
+                else:
+                    content.append(obj)
+        self._boxes[obj] = (x, y, right, top, cells)
+
+    def remove(self, obj):
+        '''Remove `obj` from the grid. Does nothing if it's not in the grid.
+        '''
+        box = self._boxes.pop(obj, None)
+        if box is None:
+            return
+        cells = box[4]
+        if not cells:
+            self._large.discard(obj)
+            return
+        grid = self._cells
+        for cell in cells:
+            content = grid[cell]
+            # compare by identity, objects may override __eq__
+            for i, item in enumerate(content):
+                if item is obj:
+                    del content[i]
+                    break
+            if not content:
+                del grid[cell]
+
+    def clear(self):
+        '''Remove all the objects.
+        '''
+        self._cells = {}
+        self._boxes = {}
+        self._large = set()
+
+    def query(self, x, y):
+        '''Return the list of objects whose box contains the point (x, y),
+        borders included, in no particular order.
+        '''
+        boxes = self._boxes
+        result = []
+        for obj in self._grid_candidates(x, y):
+            bx, by, right, top = boxes[obj][:4]
+            if bx <= x <= right and by <= y <= top:
+                result.append(obj)
+        return result
+
+    def _grid_candidates(self, x, y):
+        size = self.cell_size
+        content = self._cells.get((int(floor(x / size)),
+                                   int(floor(y / size))))
+        large = self._large
+        if not large:
+            return content or ()
+        if not content:
+            return large
+        return list(content) + list(large)
@@ -91,6 +91,29 @@ result)`::
 #. `entry` is the result of the lookup for the `key`.
 
 
+Asynchronous operations in a thread
+-----------------------------------
+
+.. versionadded:: 1.8.1
+
+By default, the asynchronous operations are run by the main thread, in the
+next frame. If :attr:`~AbstractStore.threaded` is True, they are run on a
+thread dedicated to the store, so a slow store (a database, a big file...)
+doesn't block the application::
+
+    store = JsonStore('hello.json', threaded=True)
+    store.async_put(my_callback, 'tito', name='Mathieu')
+
+The operations are run in the order they are requested, and the callbacks are
+always called in the main thread. The requests made while the thread is busy
+are run together: the store is synchronized once for all of them, and the
+:class:`~kivy.storage.redisstore.RedisStore` sends them in a single pipeline.
+The synchronous methods can still be used, they wait for the operations
+running in the thread. An operation that fails calls its callback with a
+failed result (None, 0 or []) and doesn't stop the next ones. The thread ends
+when the store is garbage collected.
+
+
 Synchronous container type
 --------------------------
 
@@ -117,25 +140,186 @@ The storage API emulates the container type for the synchronous API::
     for key in store:
         pass
 
+
+Batches
+-------
+
+.. versionadded:: 1.8.1
+
+Each :meth:`~AbstractStore.put` or :meth:`~AbstractStore.delete` synchronizes
+the store, i.e. writes the changes in the file for the file-based stores. Use
+:meth:`~AbstractStore.batch` to synchronize the store only once for many
+changes::
+
+    with store.batch():
+        for name, entry in entries.items():
+            store.put(name, **entry)
+
+
+Indexes
+-------
+
+.. versionadded:: 1.8.1
+
+:meth:`~AbstractStore.find` looks at every entry of the store. For big stores,
+declare the fields used in the filters as :attr:`~AbstractStore.indexes`: a
+find with one of these fields only looks at the entries having the requested
+value::
+
+    store = JsonStore('contacts.json', indexes=['org'])
+    for key, entry in store.find(org='kivy', name='Mathieu'):
+        print(key, entry)
+
+The indexes are updated by :meth:`~AbstractStore.put` and
+:meth:`~AbstractStore.delete`. The :class:`~kivy.storage.dictstore.DictStore`
+and :class:`~kivy.storage.jsonstore.JsonStore` keep them in memory and build
+them when the store is loaded, the
+:class:`~kivy.storage.redisstore.RedisStore` keeps them in the database, as
+sets of keys.
+
 '''
 
 from kivy.clock import Clock
 from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.properties import BooleanProperty, ListProperty
+from collections import deque
+from contextlib import contextmanager
 from functools import partial
+from threading import Condition, RLock, Thread
+from weakref import ref
+
+
+class _StoreWorker(object):
+    # Thread running the asynchronous operations of a store, in the order of
+    # the requests. The callbacks are queued, and called in the main thread.
+    # The worker only keeps a weak reference to the store, the thread stops
+    # when the store is collected.
+
+    def __init__(self, store):
+        super(_StoreWorker, self).__init__()
+        self.store = ref(store, self._store_collected)
+        self.requests = deque()
+        self.results = deque()
+        self.condition = Condition()
+        self.closed = False
+        # number of requests not completely dispatched yet, main thread only
+        self.pending = 0
+        self.thread = thread = Thread(target=self.run, name='StoreWorker')
+        thread.daemon = True
+        thread.start()
+
+    def _store_collected(self, store_ref):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def submit(self, method, kwargs):
+        callback = kwargs['callback']
+        results_append = self.results.append
+
+        def queue_result(*args):
+            results_append((callback, args))
+
+        kwargs['callback'] = queue_result
+        with self.condition:
+            self.requests.append((method, kwargs))
+            self.condition.notify()
+        if not self.pending:
+            Clock.schedule_interval(self.dispatch_results, 0)
+        self.pending += 1
+
+    def run(self):
+        requests = self.requests
+        condition = self.condition
+        results_extend = self.results.extend
+        while True:
+            with condition:
+                while not requests and not self.closed:
+                    condition.wait()
+                if not requests:
+                    return
+                batch = list(requests)
+                requests.clear()
+            # the requests hold bound methods of the store, it's alive
+            store = self.store()
+            with store._lock:
+                try:
+                    store.store_execute_async(batch)
+                except Exception:
+                    Logger.exception('Store: unable to run the asynchronous '
+                                     'operations')
+            # mark the end of each request
+            results_extend([None] * len(batch))
+            # don't keep the store alive while waiting
+            del batch, store
+
+    def dispatch_results(self, dt):
+        results = self.results
+        while results:
+            result = results.popleft()
+            if result is None:
+                self.pending -= 1
+                continue
+            callback, args = result
+            callback(*args)
+        if not self.pending:
+            return False
 
 
 class AbstractStore(EventDispatcher):
     '''Abstract class used to implement a Store
     '''
 
+    threaded = BooleanProperty(False)
+    '''If True, the asynchronous operations are run on a thread dedicated to
+    the store, instead of the main thread. See the module documentation.
+
+    .. versionadded:: 1.8.1
+
+    :attr:`threaded` is a :class:`~kivy.properties.BooleanProperty` and
+    defaults to False.
+    '''
+
+    indexes = ListProperty([])
+    '''List of the fields of the entries to index. A :meth:`find` filtering
+    on one of these fields only looks at the entries having the requested
+    value. See the module documentation.
+
+    .. versionadded:: 1.8.1
+
+    :attr:`indexes` is a :class:`~kivy.properties.ListProperty` and defaults
+    to [].
+    '''
+
+    # number of batches in progress, and whether they have changed the store
+    _batch_depth = 0
+    _batch_changed = False
+
+    # in-memory indexes, {field: {value: set of keys}}, None until the store
+    # is loaded
+    _indexes = None
+
     def __init__(self, **kwargs):
+        self._lock = RLock()
+        self._worker = None
         super(AbstractStore, self).__init__(**kwargs)
         self.store_load()
+        self._indexes = {}
+        self.store_build_indexes()
+
+    def on_indexes(self, instance, value):
+        if self._indexes is None:
+            # built after the loading
+            return
+        with self._lock:
+            self.store_build_indexes()
 
     def exists(self, key):
         '''Check if a key exists in the store.
         '''
-        return self.store_exists(key)
+        with self._lock:
+            return self.store_exists(key)
 
     def async_exists(self, callback, key):
         '''Asynchronous version of :meth:`exists`.
@@ -155,7 +339,8 @@ class AbstractStore(EventDispatcher):
         '''Get the key/value pairs stored at `key`. If the key is not found, a
         `KeyError` exception will be thrown.
         '''
-        return self.store_get(key)
+        with self._lock:
+            return self.store_get(key)
 
     def async_get(self, callback, key):
         '''Asynchronous version of :meth:`get`.
@@ -174,10 +359,11 @@ class AbstractStore(EventDispatcher):
         '''Put new key/value pairs (given in *values*) into the storage. Any
         existing key/value pairs will be removed.
         '''
-        need_sync = self.store_put(key, values)
-        if need_sync:
-            self.store_sync()
-        return need_sync
+        with self._lock:
+            need_sync = self.store_put(key, values)
+            if need_sync:
+                self._sync()
+            return need_sync
 
     def async_put(self, callback, key, **values):
         '''Asynchronous version of :meth:`put`.
@@ -197,10 +383,11 @@ class AbstractStore(EventDispatcher):
     def delete(self, key):
         '''Delete a key from the storage. If the key is not found, a `KeyError`
         exception will be thrown.'''
-        need_sync = self.store_delete(key)
-        if need_sync:
-            self.store_sync()
-        return need_sync
+        with self._lock:
+            need_sync = self.store_delete(key)
+            if need_sync:
+                self._sync()
+            return need_sync
 
     def async_delete(self, callback, key):
         '''Asynchronous version of :meth:`delete`.
@@ -233,7 +420,11 @@ class AbstractStore(EventDispatcher):
             # get only the entry from (key, entry)
             entries = list((x[1] for x in store.find(name='Mathieu')))
         '''
-        return self.store_find(filters)
+        with self._lock:
+            if self._worker is None:
+                return self.store_find(filters)
+            # the entries can change in the thread, get them now
+            return iter(list(self.store_find(filters)))
 
     def async_find(self, callback, **filters):
         '''Asynchronous version of :meth:`find`.
@@ -253,10 +444,37 @@ class AbstractStore(EventDispatcher):
         self._schedule(self.store_find_async,
                        callback=callback, filters=filters)
 
+    @contextmanager
+    def batch(self):
+        '''Return a context manager that delays the synchronization of the
+        store until the end of the block: all the changes made in the block
+        are synchronized at once::
+
+            with store.batch():
+                store.put('tito', name='Mathieu')
+                store.delete('tshirtman')
+
+        Batches can be nested, the store is synchronized at the end of the
+        outermost one. The changes are not rolled back if an exception is
+        raised in the block: they are synchronized too.
+
+        .. versionadded:: 1.8.1
+        '''
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._batch_changed:
+                    self._batch_changed = False
+                    self.store_sync()
+
     def keys(self):
         '''Return a list of all the keys in the storage.
         '''
-        return self.store_keys()
+        with self._lock:
+            return self.store_keys()
 
     def async_keys(self, callback):
         '''Asynchronously return all the keys in the storage.
@@ -266,7 +484,8 @@ class AbstractStore(EventDispatcher):
     def count(self):
         '''Return the number of entries in the storage.
         '''
-        return self.store_count()
+        with self._lock:
+            return self.store_count()
 
     def async_count(self, callback):
         '''Asynchronously return the number of entries in the storage.
@@ -276,7 +495,8 @@ class AbstractStore(EventDispatcher):
     def clear(self):
         '''Wipe the whole storage.
         '''
-        return self.store_clear()
+        with self._lock:
+            return self.store_clear()
 
     def async_clear(self, callback):
         '''Asynchronous version of :meth:`clear`.
@@ -340,9 +560,26 @@ class AbstractStore(EventDispatcher):
         return len(self.store_keys())
 
     def store_clear(self):
-        for key in self.store_keys():
+        for key in list(self.store_keys()):
             self.store_delete(key)
 
+    def store_build_indexes(self):
+        '''Build the :attr:`indexes`. Called when the store is loaded, and
+        when :attr:`indexes` changes.
+
+        The default implementation builds them in memory, from
+        :meth:`store_keys` and :meth:`store_get`. The stores using it must
+        keep them up to date in :meth:`store_put` and :meth:`store_delete`,
+        and use them in :meth:`store_find`.
+
+        .. versionadded:: 1.8.1
+        '''
+        indexes = self._indexes = dict((field, {}) for field in self.indexes)
+        if not indexes:
+            return
+        for key in self.store_keys():
+            self._index_entry(key, self.store_get(key))
+
     def store_get_async(self, key, callback):
         try:
             value = self.store_get(key)
@@ -353,6 +590,8 @@ class AbstractStore(EventDispatcher):
     def store_put_async(self, key, value, callback):
         try:
             value = self.store_put(key, value)
+            if value:
+                self._sync()
             callback(self, key, value)
         except:
             callback(self, key, None)
@@ -367,13 +606,18 @@ class AbstractStore(EventDispatcher):
     def store_delete_async(self, key, callback):
         try:
             value = self.store_delete(key)
+            if value:
+                self._sync()
             callback(self, key, value)
         except:
             callback(self, key, None)
 
     def store_find_async(self, filters, callback):
-        for key, entry in self.store_find(filters):
-            callback(self, filters, key, entry)
+        try:
+            for key, entry in self.store_find(filters):
+                callback(self, filters, key, entry)
+        except:
+            pass
         callback(self, filters, None, None)
 
     def store_count_async(self, callback):
@@ -391,13 +635,118 @@ class AbstractStore(EventDispatcher):
             callback(self, [])
 
     def store_clear_async(self, callback):
-        self.store_clear()
+        try:
+            self.store_clear()
+        except:
+            pass
         callback(self)
 
+    def store_execute_async(self, requests):
+        '''Run asynchronous requests, a list of (method, kwargs), where
+        method is one of the `store_*_async` methods. The callbacks given in
+        the kwargs must be called with the results.
+
+        With :attr:`threaded`, it's called in the thread of the store, with
+        all the requests made since the previous call. The default
+        implementation runs them in order, in a :meth:`batch`. A request
+        raising an exception doesn't stop the next ones, its callback is
+        called with the result of a failure.
+
+        .. versionadded:: 1.8.1
+        '''
+        with self.batch():
+            for method, kwargs in requests:
+                self._execute_async(method, kwargs)
+
+    #
+    # In-memory indexes
+    #
+
+    def _index_entry(self, key, entry):
+        # add the key in the indexes of the fields of the entry. Unhashable
+        # values are not indexed: no hashable filter value can be equal to
+        # them.
+        for field, index in self._indexes.items():
+            if field not in entry:
+                continue
+            try:
+                keys = index.get(entry[field])
+            except TypeError:
+                continue
+            if keys is None:
+                keys = index[entry[field]] = set()
+            keys.add(key)
+
+    def _unindex_entry(self, key, entry):
+        for field, index in self._indexes.items():
+            if field not in entry:
+                continue
+            try:
+                keys = index.get(entry[field])
+            except TypeError:
+                continue
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[entry[field]]
+
+    def _lookup_index(self, filters):
+        # return the keys that may match the filters, or None if no index
+        # can be used
+        indexes = self._indexes
+        found = None
+        for field, value in filters.items():
+            index = indexes.get(field)
+            if index is None:
+                continue
+            try:
+                keys = index.get(value, ())
+            except TypeError:
+                continue
+            if found is None or len(keys) < len(found):
+                found = keys
+        if found is None:
+            return None
+        # the indexes can change while the result is read
+        return list(found)
+
     #
     # Privates
     #
 
-    def _schedule(self, callback, **kwargs):
+    def _execute_async(self, method, kwargs):
+        # run an asynchronous request, call its callback with the result of a
+        # failure if it raises
+        try:
+            method(**kwargs)
+        except Exception:
+            Logger.exception('Store: asynchronous operation %s failed' %
+                             method.__name__)
+            name = method.__name__
+            callback = kwargs['callback']
+            if name == 'store_find_async':
+                callback(self, kwargs['filters'], None, None)
+            elif name == 'store_count_async':
+                callback(self, 0)
+            elif name == 'store_keys_async':
+                callback(self, [])
+            elif name == 'store_clear_async':
+                callback(self)
+            else:
+                callback(self, kwargs['key'], None)
+
+    def _sync(self):
+        if self._batch_depth:
+            self._batch_changed = True
+        else:
+            self.store_sync()
+
+    def _schedule(self, method, **kwargs):
+        if self.threaded:
+            worker = self._worker
+            if worker is None:
+                worker = self._worker = _StoreWorker(self)
+            worker.submit(method, kwargs)
+            return
         # XXX not entirely sure about the best value (0 or -1).
-        Clock.schedule_once(partial(callback, **kwargs), 0)
+        Clock.schedule_once(partial(method, **kwargs), 0)
@@ -60,15 +60,25 @@ class DictStore(AbstractStore):
         return self._data[key]
 
     def store_put(self, key, value):
-        self._data[key] = value
+        data = self._data
+        if key in data:
+            self._unindex_entry(key, data[key])
+        data[key] = value
+        self._index_entry(key, value)
         return True
 
     def store_delete(self, key):
-        del self._data[key]
+        self._unindex_entry(key, self._data.pop(key))
         return True
 
     def store_find(self, filters):
-        for key, values in iteritems(self._data):
+        data = self._data
+        keys = self._lookup_index(filters)
+        if keys is None:
+            entries = iteritems(data)
+        else:
+            entries = ((key, data[key]) for key in keys if key in data)
+        for key, values in entries:
             found = True
             for fkey, fvalue in iteritems(filters):
                 if fkey not in values:
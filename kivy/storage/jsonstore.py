@@ -3,43 +3,190 @@ JSON store
 ==========
 
 Can be used to save/load key-value pairs from a json file.
+
+Journal
+-------
+
+.. versionadded:: 1.8.1
+
+By default, the whole file is written again on every change. With
+`journal=True`, the changes are appended to a journal, ``<filename>.journal``,
+one line per synchronization of the store, which is much faster for big
+stores::
+
+    store = JsonStore('cache.json', journal=True)
+    with store.batch():
+        for key, entry in entries.items():
+            store.put(key, **entry)
+
+When the store is loaded, the journal is replayed over the JSON file. An
+incomplete last line, left by an interrupted write, is discarded: the changes
+synchronized together, like the ones of a
+:meth:`~kivy.storage.AbstractStore.batch`, are recovered all or none.
+When the journal gets bigger than the JSON file, the store is compacted: all
+the entries are written in the JSON file and the journal is removed.
+
+The JSON file is always written in a temporary file first, then renamed, so an
+interrupted write never leaves a truncated file.
 '''
 
 __all__ = ('JsonStore', )
 
 
+from os import fsync, remove, rename
 from os.path import exists
 from kivy.compat import iteritems
 from kivy.storage import AbstractStore
-from json import loads, dump
+from kivy.utils import platform
+from json import loads, dumps
+
+try:
+    from os import replace as _replace
+except ImportError:
+    def _replace(src, dst):
+        # python 2 cannot rename over an existing file on windows
+        if platform == 'win' and exists(dst):
+            remove(dst)
+        rename(src, dst)
 
 
 class JsonStore(AbstractStore):
     '''Store implementation using a json file for storing the keys-value pairs.
     See the :mod:`kivy.storage` module documentation for more information.
+
+    :Parameters:
+        `filename`: str
+            Name of the JSON file.
+        `journal`: bool, defaults to False
+            If True, the changes are appended to a journal instead of
+            writing the whole file each time. See the module documentation.
+        `fsync`: bool, defaults to the value of `journal`
+            If True, the data is flushed to the disk after each write, with
+            `os.fsync`.
+
+    .. versionchanged:: 1.8.1
+        `journal` and `fsync` have been added.
     '''
-    def __init__(self, filename, **kwargs):
+
+    #: Minimum size of the journal before the store is compacted, in bytes
+    compact_size = 65536
+
+    def __init__(self, filename, journal=False, fsync=None, **kwargs):
         self.filename = filename
+        self.journal = journal
+        self.fsync = journal if fsync is None else fsync
         self._data = {}
         self._is_changed = True
+        self._changed_keys = set()
+        self._journal_size = 0
+        self._snapshot_size = 0
         super(JsonStore, self).__init__(**kwargs)
 
+    def _get_journal_filename(self):
+        return self.filename + '.journal'
+
+    journal_filename = property(_get_journal_filename,
+                                doc='Name of the journal file.')
+
     def store_load(self):
-        if not exists(self.filename):
-            return
-        with open(self.filename) as fd:
-            data = fd.read()
-            if len(data) == 0:
-                return
-            self._data = loads(data)
+        if exists(self.filename):
+            with open(self.filename) as fd:
+                data = fd.read()
+            self._snapshot_size = len(data)
+            if len(data) != 0:
+                self._data = loads(data)
+        if exists(self.journal_filename):
+            self._replay_journal()
+
+    def _replay_journal(self):
+        filename = self.journal_filename
+        with open(filename, 'rb') as fd:
+            content = fd.read()
+        data = self._data
+        valid = 0
+        for line in content.splitlines(True):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = loads(line.decode('utf-8'))
+            except ValueError:
+                break
+            data.update(record.get('put', {}))
+            for key in record.get('delete', ()):
+                data.pop(key, None)
+            valid += len(line)
+        if valid != len(content):
+            # the last record has not been completely written, drop it
+            with open(filename, 'r+b') as fd:
+                fd.truncate(valid)
+        self._journal_size = valid
 
     def store_sync(self):
         if self._is_changed is False:
             return
-        with open(self.filename, 'w') as fd:
-            dump(self._data, fd)
+        if self.journal:
+            self._append_journal()
+        else:
+            self.compact()
         self._is_changed = False
 
+    def _append_journal(self):
+        # write the last state of the changed keys on a single line
+        changed = self._changed_keys
+        if not changed:
+            return
+        data = self._data
+        put = {}
+        delete = []
+        for key in changed:
+            if key in data:
+                put[key] = data[key]
+            else:
+                delete.append(key)
+        changed.clear()
+        record = {}
+        if put:
+            record['put'] = put
+        if delete:
+            record['delete'] = delete
+        line = (dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+        # the journal is closed after each write, so no file is left open
+        # when the store is released
+        with open(self.journal_filename, 'ab') as fd:
+            fd.write(line)
+            fd.flush()
+            if self.fsync:
+                fsync(fd.fileno())
+        self._journal_size += len(line)
+        if self._journal_size > max(self.compact_size, self._snapshot_size):
+            self.compact()
+
+    def compact(self):
+        '''Write all the entries in the JSON file, and remove the journal.
+        This is done automatically when the journal gets too big.
+
+        .. versionadded:: 1.8.1
+        '''
+        filename = self.filename
+        data = dumps(self._data)
+        tmp_fn = filename + '.tmp'
+        with open(tmp_fn, 'w') as fd:
+            fd.write(data)
+            fd.flush()
+            if self.fsync:
+                fsync(fd.fileno())
+        _replace(tmp_fn, filename)
+        self._snapshot_size = len(data)
+        self._changed_keys.clear()
+        self._is_changed = False
+
+        # the journal is replayed over the new file if it's not removed
+        # here, which gives the same entries
+        if exists(self.journal_filename):
+            remove(self.journal_filename)
+        self._journal_size = 0
+
     def store_exists(self, key):
         return key in self._data
 
@@ -47,17 +194,29 @@ class JsonStore(AbstractStore):
         return self._data[key]
 
     def store_put(self, key, value):
-        self._data[key] = value
+        data = self._data
+        if key in data:
+            self._unindex_entry(key, data[key])
+        data[key] = value
+        self._index_entry(key, value)
         self._is_changed = True
+        self._changed_keys.add(key)
         return True
 
     def store_delete(self, key):
-        del self._data[key]
+        self._unindex_entry(key, self._data.pop(key))
         self._is_changed = True
+        self._changed_keys.add(key)
         return True
 
     def store_find(self, filters):
-        for key, values in iteritems(self._data):
+        data = self._data
+        keys = self._lookup_index(filters)
+        if keys is None:
+            entries = iteritems(data)
+        else:
+            entries = ((key, data[key]) for key in keys if key in data)
+        for key, values in entries:
             found = True
             for fkey, fvalue in iteritems(filters):
                 if fkey not in values:
@@ -22,6 +22,16 @@ You can instanciate the storage with another prefix like this::
 
 The params dictionary will be passed to the redis.StrictRedis class.
 
+With :attr:`~kivy.storage.AbstractStore.threaded`, the asynchronous get,
+exists, put and delete requests made while the thread is busy are sent to
+Redis in a single pipeline.
+
+The :attr:`~kivy.storage.AbstractStore.indexes` are kept in the database: for
+each indexed field and value, the set `<prefix>.i.<field>.<value>` holds the
+keys of the entries having this value. The values are compared by their JSON
+representation in the indexes. The indexes missing in the database are built
+when the store is loaded.
+
 See `redis-py <https://github.com/andymccurdy/redis-py>`_.
 '''
 
@@ -70,33 +80,168 @@ class RedisStore(AbstractStore):
         return result
 
     def store_put(self, key, values):
-        key = self.prefix + '.d.' + key
+        skey = self.prefix + '.d.' + key
+        indexes = self.indexes
+        old = self.r.hmget(skey, indexes) if indexes else ()
         pipe = self.r.pipeline()
-        pipe.delete(key)
-        for k, v in values.iteritems():
-            pipe.hset(key, k, dumps(v))
+        pipe.delete(skey)
+        for k, v in values.items():
+            pipe.hset(skey, k, dumps(v))
+        self._update_indexes(pipe, key, old, values)
         pipe.execute()
         return True
 
     def store_delete(self, key):
-        key = self.prefix + '.d.' + key
-        if not self.r.exists(key):
+        skey = self.prefix + '.d.' + key
+        if not self.r.exists(skey):
             raise KeyError(key)
-        return self.r.delete(key)
+        indexes = self.indexes
+        if not indexes:
+            return self.r.delete(skey)
+        old = self.r.hmget(skey, indexes)
+        pipe = self.r.pipeline()
+        pipe.delete(skey)
+        self._update_indexes(pipe, key, old, {})
+        return pipe.execute()[0]
 
     def store_keys(self):
         l = len(self.prefix + '.d.')
         return [x[l:] for x in self.r.keys(self.prefix + '.d.*')]
 
     def store_find(self, filters):
-        fkeys = filters.keys()
-        fvalues = filters.values()
-        for key in self.store_keys():
+        indexed = [self._index_key(field, value)
+                   for field, value in filters.items()
+                   if field in self.indexes]
+        filters = dict((field, value) for field, value in filters.items()
+                       if field not in self.indexes)
+        if indexed:
+            keys = self.r.sinter(indexed)
+        else:
+            keys = self.store_keys()
+        fkeys = list(filters.keys())
+        fvalues = list(filters.values())
+        for key in keys:
             skey = self.prefix + '.d.' + key
-            svalues = self.r.hmget(skey, fkeys)
-            if None in svalues:
+            if fkeys:
+                svalues = self.r.hmget(skey, fkeys)
+                if None in svalues:
+                    continue
+                svalues = [loads(x) for x in svalues]
+                if fvalues != svalues:
+                    continue
+            result = self.r.hgetall(skey)
+            if not result:
+                # deleted in the meantime
+                continue
+            yield key, dict((k, loads(v)) for k, v in result.items())
+
+    def store_build_indexes(self):
+        # the indexes are kept in the database, build only the missing ones
+        # and drop the ones not declared anymore
+        r = self.r
+        built_key = self.prefix + '.indexes'
+        indexes = self.indexes
+        built = r.smembers(built_key)
+        pipe = r.pipeline()
+        for field in built:
+            if field in indexes:
                 continue
-            svalues = [loads(x) for x in svalues]
-            if fvalues != svalues:
+            base = '%s.i.%s.' % (self.prefix, field)
+            for key in r.keys(base + '*'):
+                try:
+                    # skip the indexes of the fields starting with this one
+                    loads(key[len(base):])
+                except ValueError:
+                    continue
+                pipe.delete(key)
+            pipe.srem(built_key, field)
+        missing = [field for field in indexes if field not in built]
+        if missing:
+            for key in self.store_keys():
+                values = r.hmget(self.prefix + '.d.' + key, missing)
+                for field, value in zip(missing, values):
+                    if value is not None:
+                        pipe.sadd(self._index_key(field, loads(value)), key)
+            pipe.sadd(built_key, *missing)
+        pipe.execute()
+
+    def _index_key(self, field, value):
+        return '%s.i.%s.%s' % (self.prefix, field,
+                               dumps(value, sort_keys=True))
+
+    def _update_indexes(self, pipe, key, old, values):
+        # old are the previous values of the indexed fields, as stored
+        for field, value in zip(self.indexes, old):
+            if value is not None:
+                pipe.srem(self._index_key(field, loads(value)), key)
+        for field in self.indexes:
+            if field in values:
+                pipe.sadd(self._index_key(field, values[field]), key)
+
+    # asynchronous requests that can be sent in a pipeline
+    _pipelined = ('store_put_async', 'store_get_async', 'store_exists_async',
+                  'store_delete_async')
+    # asynchronous requests updating the indexes
+    _indexed = ('store_put_async', 'store_delete_async')
+
+    def store_execute_async(self, requests):
+        # send the get/exists/put/delete requests in a single pipeline, the
+        # other ones are run alone, in order
+        pipe = self.r.pipeline(transaction=False)
+        queued = []
+        prefix = self.prefix + '.d.'
+        for method, kwargs in requests:
+            name = method.__name__
+            if name not in self._pipelined or (
+                    self.indexes and name in self._indexed):
+                # the indexes need the previous values of the entry
+                self._execute_pipeline(pipe, queued)
+                self._execute_async(method, kwargs)
                 continue
-            yield key, self.r.hgetall(skey)
+            key = prefix + kwargs['key']
+            if name == 'store_put_async':
+                values = kwargs['value']
+                pipe.delete(key)
+                for k, v in values.items():
+                    pipe.hset(key, k, dumps(v))
+                count = len(values) + 1
+            elif name == 'store_get_async':
+                pipe.hgetall(key)
+                count = 1
+            elif name == 'store_exists_async':
+                pipe.exists(key)
+                count = 1
+            else:
+                pipe.delete(key)
+                count = 1
+            queued.append((name, kwargs, count))
+        self._execute_pipeline(pipe, queued)
+
+    def _execute_pipeline(self, pipe, queued):
+        if not queued:
+            return
+        try:
+            results = pipe.execute(raise_on_error=False)
+        except redis.RedisError:
+            results = None
+        index = 0
+        for name, kwargs, count in queued:
+            key = kwargs['key']
+            callback = kwargs['callback']
+            result = None
+            values = results[index:index + count] if results else ()
+            index += count
+            if not values or any(isinstance(x, Exception) for x in values):
+                # the request failed
+                pass
+            elif name == 'store_put_async':
+                result = True
+            elif name == 'store_get_async':
+                # a missing key gives an empty hash
+                if values[0]:
+                    result = dict((k, loads(v))
+                                  for k, v in values[0].items())
+            elif name == 'store_exists_async' or values[0]:
+                result = values[0]
+            callback(self, key, result)
+        del queued[:]
@@ -0,0 +1,86 @@
+'''
+Atlas benchmark
+===============
+
+Pack a few thousand sprites of random sizes (the seed is fixed, so the results
+are reproducible) with every packing algorithm, with and without rotation, and
+report the number of atlas images, the occupancy of these images and the
+packing time. If PIL is installed, build a real atlas from generated sprite
+files with the `maxrects` algorithm, serially and with a process pool::
+
+    python kivy/tests/perf_test_atlas.py [count] [size]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+import shutil
+import tempfile
+from random import Random
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.atlas import Atlas
+
+
+def sprite_sizes(count, seed=1):
+    # mostly small icons, with a few bigger images
+    random = Random(seed)
+    sizes = []
+    for x in range(count):
+        if random.random() < .9:
+            sizes.append((random.randint(8, 64), random.randint(8, 64)))
+        else:
+            sizes.append((random.randint(64, 256), random.randint(64, 256)))
+    return sizes
+
+
+def bench_pack(sizes, size):
+    area = sum(w * h for w, h in sizes)
+    print('{0} sprites in {1}x{1} images'.format(len(sizes), size))
+    print('{0:>12} {1:>9} {2:>7} {3:>10} {4:>10}'.format(
+        'algorithm', 'rotation', 'images', 'occupancy', 'time (s)'))
+    for algorithm in sorted(Atlas.packers):
+        for rotation in (False, True):
+            start = default_timer()
+            places, count = Atlas.pack(sizes, size, size, algorithm,
+                                       rotation)
+            elapsed = default_timer() - start
+            occupancy = area / float(count * size * size)
+            print('{0:>12} {1:>9} {2:>7} {3:>9.1f}% {4:>10.3f}'.format(
+                algorithm, str(rotation), count, occupancy * 100, elapsed))
+
+
+def bench_build(sizes, size):
+    try:
+        from PIL import Image
+    except ImportError:
+        print('PIL is missing, skip the atlas build')
+        return
+    directory = tempfile.mkdtemp()
+    try:
+        filenames = []
+        for index, (w, h) in enumerate(sizes):
+            filename = os.path.join(directory, 'sprite%d.png' % index)
+            Image.new('RGBA', (w, h), (index % 256, 0, 0, 255)).save(filename)
+            filenames.append(filename)
+        outname = os.path.join(directory, 'atlas')
+        for workers in (1, None):
+            start = default_timer()
+            Atlas.create(outname, filenames, size, algorithm='maxrects',
+                         rotation=True, workers=workers)
+            print('build with {0} worker(s): {1:.3f}s'.format(
+                workers or 'cpu count', default_timer() - start))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    sizes = sprite_sizes(count)
+    bench_pack(sizes, size)
+    print()
+    bench_build(sizes, size)
@@ -0,0 +1,89 @@
+'''
+Clock benchmark
+===============
+
+Measure the cost of a frame against the number of scheduled events, for every
+clock implementation. Most of the events are scheduled far in the future, only
+a few of them are due on each frame. Then measure the time needed to cancel
+all the events::
+
+    python kivy/tests/perf_test_clock.py
+'''
+
+from __future__ import print_function
+
+import os
+os.environ['KIVY_UNITTEST'] = '1'
+
+from timeit import default_timer
+from kivy.clock import ClockBase, ClockBaseHeap
+
+EVENTS = (100, 1000, 10000, 50000)
+DUE = 10
+FRAMES = 200
+
+
+class Callbacks(object):
+    # the clock only keeps weak references to the callbacks
+
+    def __init__(self, count):
+        self.callbacks = [self.make_callback() for x in range(count)]
+
+    def make_callback(self):
+        def callback(dt):
+            pass
+        return callback
+
+
+def bench(clock_cls, count):
+    clock = clock_cls()
+    clock._max_fps = 0
+    idle = Callbacks(count)
+    due = Callbacks(DUE)
+    for callback in idle.callbacks:
+        clock.schedule_interval(callback, 3600.)
+    for callback in due.callbacks:
+        clock.schedule_interval(callback, 0)
+    # let the clock release the strong references
+    clock.tick()
+    clock.tick_draw()
+
+    start = default_timer()
+    for x in range(FRAMES):
+        clock.tick()
+        clock.tick_draw()
+    return (default_timer() - start) / FRAMES
+
+
+def bench_cancel(clock_cls, count):
+    clock = clock_cls()
+    clock._max_fps = 0
+    # same callback name for all the events, like the triggers of many
+    # instances of the same widget class
+    idle = Callbacks(count)
+    triggers = [clock.create_trigger(callback, 1.)
+                for callback in idle.callbacks]
+    for trigger in triggers:
+        trigger()
+    clock.tick()
+
+    start = default_timer()
+    for trigger in triggers:
+        trigger.cancel()
+    return default_timer() - start
+
+
+def report(title, func, clocks):
+    print(title)
+    print('%10s %s' % ('events', ' '.join(
+        '%16s' % cls.__name__ for cls in clocks)))
+    for count in EVENTS:
+        results = ['%13.3f ms' % (func(cls, count) * 1000.)
+                   for cls in clocks]
+        print('%10d %s' % (count, ' '.join(results)))
+
+
+if __name__ == '__main__':
+    clocks = (ClockBase, ClockBaseHeap)
+    report('Frame time', bench, clocks)
+    report('Cancel all the events', bench_cancel, clocks)
@@ -0,0 +1,88 @@
+'''
+Event loop benchmark
+====================
+
+Run the event loop without window for a few seconds, with only a callback
+scheduled every 0.5 seconds (like a blinking cursor on a static screen), in
+the default mode and in lazy mode. Report the number of frames and the cpu
+time used. Then report the time needed to queue and dispatch bursts of
+updates of 10 touches, like a high-rate touch panel between two frames::
+
+    python kivy/tests/perf_test_eventloop.py [seconds]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from time import time
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+import kivy.base
+from kivy.base import EventLoopBase
+from kivy.clock import ClockBase
+from kivy.input.motionevent import MotionEvent
+from timeit import default_timer
+
+
+def bench(name, duration, lazy):
+    clock = kivy.base.Clock = ClockBase()
+    clock.schedule_interval(lambda dt: None, .5)
+    loop = EventLoopBase()
+    loop.lazy = lazy
+    loop.add_event_listener(loop)
+    frames = 0
+    start = time()
+    start_cpu = sum(os.times()[:2])
+    while time() - start < duration:
+        loop.idle()
+        frames += 1
+    elapsed = time() - start
+    cpu = sum(os.times()[:2]) - start_cpu
+    print('{0:<10} {1:>8} {2:>10.1f} {3:>8.2f}%'.format(
+        name, frames, frames / elapsed, cpu / elapsed * 100))
+
+
+class BenchMotionEvent(MotionEvent):
+
+    def depack(self, args):
+        self.is_touch = True
+        self.sx, self.sy = args
+        super(BenchMotionEvent, self).depack(args)
+
+
+class Listener(object):
+
+    def dispatch(self, event, etype, me):
+        pass
+
+
+def bench_input(updates, frames=20):
+    loop = EventLoopBase()
+    loop.add_event_listener(Listener())
+    touches = [BenchMotionEvent('bench', i, [0, 0]) for i in range(10)]
+    start = default_timer()
+    for frame in range(frames):
+        for i in range(updates):
+            touch = touches[i % 10]
+            touch.move([i / float(updates), .5])
+            loop._dispatch_input('update', touch)
+        loop.dispatch_input()
+    elapsed = (default_timer() - start) / frames
+    print('{0:>8} {1:>12.3f}'.format(updates, elapsed * 1000))
+
+
+def main(duration):
+    print('{0:<10} {1:>8} {2:>10} {3:>9}'.format(
+        'mode', 'frames', 'frames/s', 'cpu'))
+    bench('default', duration, False)
+    bench('lazy', duration, True)
+    print()
+    print('{0:>8} {1:>12}'.format('updates', 'ms/frame'))
+    for updates in (100, 1000, 5000):
+        bench_input(updates)
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.)
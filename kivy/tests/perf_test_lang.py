@@ -0,0 +1,97 @@
+'''
+Builder benchmark
+=================
+
+Instantiate rows made of a few widgets, with ids, bound properties, handlers
+and canvas instructions, as a ListView would do for its items. Rows are
+created from a kv rule and from a kv template, and the benchmark reports the
+number of rows created per second::
+
+    python kivy/tests/perf_test_lang.py [rows]
+
+The first row of each kind compiles the instantiation plan of its rules, the
+next ones replay it.
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.lang import Builder
+from kivy.factory import Factory
+
+Builder.load_string('''
+<BenchRow@Widget>:
+    text: ''
+    selected: False
+    canvas.before:
+        Color:
+            rgba: (.2, .2, .8, 1) if self.selected else (0, 0, 0, 0)
+        Rectangle:
+            pos: self.pos
+            size: self.size
+    Widget:
+        id: icon
+        pos: root.x, root.y
+        size: root.height, root.height
+    Widget:
+        id: label
+        x: icon.right
+        y: root.y
+        width: root.width - icon.width
+        height: root.height
+        on_touch_down: root.selected = not root.selected
+    Widget:
+        id: check
+        opacity: 1 if root.selected else 0
+        pos: label.right - self.width, root.y
+
+[BenchItem@Widget]:
+    text: ctx.text
+    is_selected: ctx.is_selected
+    canvas:
+        Color:
+            rgba: (.2, .2, .8, 1) if self.is_selected else (0, 0, 0, 0)
+        Rectangle:
+            pos: self.pos
+            size: self.size
+    Widget:
+        id: icon
+        pos: root.pos
+        size: root.height, root.height
+    Widget:
+        id: label
+        x: icon.right
+        y: root.y
+        width: root.width - icon.width
+''')
+
+
+def bench(name, create, count):
+    start = default_timer()
+    rows = [create(0)]
+    first = default_timer() - start
+    start = default_timer()
+    for index in range(1, count):
+        rows.append(create(index))
+    elapsed = default_timer() - start
+    print('{0:>10} {1:>14.1f} {2:>14.0f}'.format(
+        name, first * 1000, (count - 1) / elapsed))
+    return rows
+
+
+def main(count):
+    print('{0} rows'.format(count))
+    print('{0:>10} {1:>14} {2:>14}'.format(
+        'kind', 'first row (ms)', 'rows/s'))
+    bench('rule', lambda index: Factory.BenchRow(text=str(index)), count)
+    bench('template', lambda index: Builder.template(
+        'BenchItem', text=str(index), is_selected=index % 2 == 0), count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,81 @@
+'''
+Layout benchmark
+================
+
+Build a deep form, nested sections of rows, each section a grid layout
+growing with its content. Add a row in the deepest section and resize the
+root a few times, and report the number of layout passes, the number of
+frames until the form doesn't change anymore, and the time spent per
+change::
+
+    python kivy/tests/perf_test_layout.py [depth]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.layout import Layout, LayoutManager
+from kivy.uix.widget import Widget
+
+
+def add_row(section):
+    row = BoxLayout(size_hint_y=None, height=30)
+    row.add_widget(Widget(size_hint_x=.3))
+    row.add_widget(Widget())
+    section.add_widget(row)
+
+
+def build(depth, rows=4):
+    root = section = BoxLayout(orientation='vertical')
+    for level in range(depth):
+        sub = GridLayout(cols=1, size_hint_y=None, padding=4)
+        sub.bind(minimum_height=sub.setter('height'))
+        for i in range(rows):
+            add_row(sub)
+        section.add_widget(sub)
+        section = sub
+    return root, section
+
+
+def settle():
+    # tick until the layouts are done, return the number of frames with
+    # layout passes
+    frames = -1
+    passes = -1
+    while passes != LayoutManager.total_passes:
+        passes = LayoutManager.total_passes
+        Clock.tick()
+        frames += 1
+    return frames
+
+
+def main(depth):
+    root, deepest = build(depth)
+    settle()
+    LayoutManager.reset_counters()
+    changes = 20
+    frames = 0
+    start = default_timer()
+    for i in range(changes):
+        add_row(deepest)
+        root.size = (800 + i, 600 + i)
+        frames += settle()
+    elapsed = default_timer() - start
+    print('form depth {0}, {1} layouts'.format(
+        depth, sum(1 for w in root.walk() if isinstance(w, Layout))))
+    print('layout passes per change: {0:.1f}'.format(
+        LayoutManager.total_passes / float(changes)))
+    print('frames per change: {0:.1f}'.format(frames / float(changes)))
+    print('time per change: {0:.2f} ms'.format(elapsed * 1000. / changes))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 12)
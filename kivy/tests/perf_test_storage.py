@@ -0,0 +1,90 @@
+'''
+JsonStore benchmark
+===================
+
+Put entries in a JsonStore that already holds a few thousand entries, with
+the default mode, the journal mode, and in batches, and report the number of
+puts per second. Then report the number of finds per second on a field, with
+and without an index::
+
+    python kivy/tests/perf_test_storage.py [entries]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from os.path import exists, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.storage.jsonstore import JsonStore
+
+
+def fill(filename, count):
+    store = JsonStore(filename)
+    with store.batch():
+        for i in range(count):
+            store.put('setting%d' % i, value=i, section='cache',
+                      label='entry number %d' % i)
+
+
+def bench(name, filename, count, puts, batch=0, **kwargs):
+    fill(filename, count)
+    store = JsonStore(filename, **kwargs)
+    start = default_timer()
+    if batch:
+        for i in range(0, puts, batch):
+            with store.batch():
+                for j in range(i, i + batch):
+                    store.put('setting%d' % (j * 7 % count), value=-j)
+    else:
+        for i in range(puts):
+            store.put('setting%d' % (i * 7 % count), value=-i)
+    elapsed = default_timer() - start
+    print('{0:<28} {1:>12.0f}'.format(name, puts / elapsed))
+    store.compact()
+    os.remove(filename)
+
+
+def bench_find(name, filename, count, finds, **kwargs):
+    fill(filename, count)
+    store = JsonStore(filename, **kwargs)
+    with store.batch():
+        for i in range(count):
+            store.put('setting%d' % i, value=i, section='section%d' % (i % 50))
+    start = default_timer()
+    for i in range(finds):
+        list(store.find(section='section%d' % (i % 50)))
+    elapsed = default_timer() - start
+    print('{0:<28} {1:>12.0f}'.format(name, finds / elapsed))
+    os.remove(filename)
+
+
+def main(count):
+    tmpdir = mkdtemp()
+    filename = join(tmpdir, 'store.json')
+    try:
+        print('{0} entries in the store'.format(count))
+        print('{0:<28} {1:>12}'.format('mode', 'puts/s'))
+        bench('default', filename, count, 50)
+        bench('default, batches of 100', filename, count, 1000, batch=100)
+        bench('journal', filename, count, 500, journal=True)
+        bench('journal without fsync', filename, count, 5000, journal=True,
+              fsync=False)
+        bench('journal, batches of 100', filename, count, 5000, batch=100,
+              journal=True)
+        print('{0:<28} {1:>12}'.format('find', 'finds/s'))
+        bench_find('without index', filename, count, 20)
+        bench_find('with an index', filename, count, 2000,
+                   indexes=['section'])
+    finally:
+        if exists(tmpdir):
+            rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
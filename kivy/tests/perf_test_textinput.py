@@ -1,3 +1,19 @@
+'''
+TextInput benchmark
+===================
+
+Load a text in a TextInput and measure the time taken by the edition
+operations. The last tests work on a generated log document, to check that
+the operations don't depend on the size of the document::
+
+    python kivy/tests/perf_test_textinput.py [lines]
+
+The large document has 50000 lines by default.
+'''
+
+from __future__ import print_function
+
+import sys
 from kivy.app import App
 from kivy.uix.floatlayout import FloatLayout
 from kivy.lang import Builder
@@ -6,6 +22,8 @@ from kivy.clock import Clock
 
 import timeit
 
+LARGE_LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
 Builder.load_string('''
 <PerfApp>:
     value: 0
@@ -42,7 +60,10 @@ class PerfApp(App, FloatLayout):
         super(PerfApp, self).__init__(**kwargs)
         self.tests = []
         tests = (self.load_large_text, self.stress_insert,
-            self.stress_del, self.stress_selection)
+            self.stress_del, self.stress_selection,
+            self.load_large_document, self.stress_typing,
+            self.stress_backspace, self.stress_undo_redo,
+            self.stress_cursor_index)
         for test in tests:
             but = type(self.but)(text=test.__name__)
             self.but.parent.add_widget(but)
@@ -157,6 +178,78 @@ class PerfApp(App, FloatLayout):
             Clock.schedule_once(pste)
         Clock.schedule_once(pste)
 
+    def report(self, name, count, elapsed):
+        print('{}: {} operations, {:.3f} ms per operation'.format(
+            name, count, elapsed * 1000. / count))
+        print('------------------------------------------')
+
+    def load_large_document(self, *largs):
+        self.test_done = False
+        text = u''.join(
+            u'2014-06-01 12:{:02d}:{:02d} INFO request {} served in {} ms\n'
+            .format(i // 60 % 60, i % 60, i, i % 97)
+            for i in range(LARGE_LINES))
+
+        def load_text(*l):
+            self.text_input.text = text
+
+        ttk = timeit.Timer(load_text).timeit(1)
+        print('Loaded', len(self.text_input._lines), 'lines', ttk, 'secs')
+        print('------------------------------------------')
+        self.test_done = True
+
+    def stress_typing(self, *largs):
+        # type in the middle of the document, then at its end
+        self.test_done = False
+        text_input = self.text_input
+        for name, ratio in (('typing in the middle', .5),
+                            ('typing at the end', 1.)):
+            text_input.cursor = text_input.get_cursor_from_index(
+                int(len(text_input.text) * ratio))
+            t = timeit.default_timer()
+            for x in range(200):
+                text_input.insert_text(u'x' if x % 20 else u'\n')
+            self.report(name, 200, timeit.default_timer() - t)
+        self.test_done = True
+
+    def stress_backspace(self, *largs):
+        self.test_done = False
+        text_input = self.text_input
+        text_input.cursor = text_input.get_cursor_from_index(
+            len(text_input.text) // 3)
+        t = timeit.default_timer()
+        for x in range(200):
+            text_input.do_backspace()
+        self.report('backspace', 200, timeit.default_timer() - t)
+        self.test_done = True
+
+    def stress_undo_redo(self, *largs):
+        self.test_done = False
+        text_input = self.text_input
+        count = min(200, len(text_input._undo))
+        t = timeit.default_timer()
+        for x in range(count):
+            text_input.do_undo()
+        for x in range(count):
+            text_input.do_redo()
+        self.report('undo/redo', max(1, count * 2),
+                    timeit.default_timer() - t)
+        self.test_done = True
+
+    def stress_cursor_index(self, *largs):
+        # convert between text indices and cursors all over the document
+        self.test_done = False
+        text_input = self.text_input
+        length = len(text_input.text)
+        rows = len(text_input._lines)
+        t = timeit.default_timer()
+        for x in range(1000):
+            text_input.get_cursor_from_index(x * 7919 % length)
+            text_input.cursor_index((0, x * 7919 % rows))
+        self.report('cursor/index conversions', 2000,
+                    timeit.default_timer() - t)
+        self.test_done = True
+
     def start_test(self, *largs):
         self.but.text = 'test started'
         self.slider.max = len(self.tests)
@@ -0,0 +1,66 @@
+'''
+UrlRequest benchmark
+====================
+
+Fire a burst of requests at a local HTTP server, tick the clock until all the
+callbacks have been called, and report the number of requests per second,
+the number of worker threads and the number of connections opened::
+
+    python kivy/tests/perf_test_urlrequest.py [requests]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from threading import Thread
+from time import sleep
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.clock import Clock
+from kivy.network.urlrequest import UrlRequest, UrlRequestEngine
+from kivy.tests.test_urlrequest import Handler, Server
+
+
+def bench(url, count):
+    done = []
+
+    def on_success(req, result):
+        done.append(result)
+
+    start = default_timer()
+    for i in range(count):
+        UrlRequest('%s/item/%d' % (url, i), on_success=on_success,
+                   on_error=on_success, timeout=10)
+    while len(done) < count:
+        Clock.tick()
+        sleep(.001)
+    return count / (default_timer() - start)
+
+
+def main(count):
+    server = Server(('127.0.0.1', 0), Handler)
+    url = 'http://127.0.0.1:%d' % server.server_address[1]
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        print('{0:<10} {1:>12} {2:>8} {3:>12}'.format(
+            'workers', 'requests/s', 'threads', 'connections'))
+        for workers in (1, 4, 16):
+            engine = UrlRequest.engine = UrlRequestEngine(
+                max_workers=workers, max_idle=workers)
+            rate = bench(url, count)
+            print('{0:<10} {1:>12.0f} {2:>8} {3:>12}'.format(
+                workers, rate, engine.num_workers,
+                engine.pool.connections_created))
+            engine.pool.clear()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
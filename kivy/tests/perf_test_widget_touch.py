@@ -0,0 +1,80 @@
+'''
+Touch dispatching benchmark
+===========================
+
+Dispatch touches at random positions to a widget holding a grid of small
+widgets, like a dense dashboard, with and without
+:attr:`~kivy.uix.widget.Widget.touch_index`, and report the number of
+touches per second for several tree sizes::
+
+    python kivy/tests/perf_test_widget_touch.py [touches]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+from random import Random
+from timeit import default_timer
+
+os.environ['KIVY_UNITTEST'] = '1'
+
+from kivy.uix.widget import Widget
+
+
+class Touch(object):
+
+    def __init__(self, x, y):
+        self.x, self.y = self.pos = x, y
+
+
+class Cell(Widget):
+    # like most widgets, only handle the touches inside the widget
+
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos):
+            return True
+        return super(Cell, self).on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        if self.collide_point(*touch.pos):
+            return True
+        return super(Cell, self).on_touch_move(touch)
+
+
+def build(count, touch_index):
+    root = Widget(size=(1920, 1080), touch_index=touch_index)
+    columns = int(count ** .5) or 1
+    width = 1920. / columns
+    height = 1080. / ((count + columns - 1) // columns)
+    for i in range(count):
+        root.add_widget(Cell(
+            pos=(i % columns * width, i // columns * height),
+            size=(width - 2, height - 2)))
+    return root
+
+
+def bench(count, touches, touch_index):
+    root = build(count, touch_index)
+    rnd = Random(count)
+    events = [Touch(rnd.uniform(0, 1920), rnd.uniform(0, 1080))
+              for i in range(touches)]
+    start = default_timer()
+    for touch in events:
+        root.dispatch('on_touch_down', touch)
+        root.dispatch('on_touch_move', touch)
+    elapsed = default_timer() - start
+    return touches / elapsed
+
+
+def main(touches):
+    print('{0:>10} {1:>14} {2:>14}'.format(
+        'widgets', 'touches/s', 'with index'))
+    for count in (10, 100, 1000, 5000):
+        print('{0:>10} {1:>14.0f} {2:>14.0f}'.format(
+            count, bench(count, touches, False),
+            bench(count, touches, True)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -89,3 +89,56 @@ class SequentialAnimationTestCase(unittest.TestCase):
         self.a.start(self.w)
         self.sleep(.5)
         Animation.stop_all(self.w, 'x')
+
+
+class AnimationDriverTestCase(unittest.TestCase):
+
+    def sleep(self, t):
+        start = time()
+        while time() < start + t:
+            sleep(.01)
+            Clock.tick()
+
+    def test_shared_driver(self):
+        from kivy.animation import _AnimationDriver
+        widgets = [Widget() for x in range(20)]
+        anims = [Animation(x=100, size=(50, 50), d=.2) for x in range(4)]
+        for index, widget in enumerate(widgets):
+            anims[index % 4].start(widget)
+        driver = _AnimationDriver.drivers[1. / 60.]
+        self.assertEqual(len(driver.animations), 4)
+        self.sleep(.5)
+        self.assertEqual(driver.animations, [])
+        for widget in widgets:
+            self.assertAlmostEqual(widget.x, 100)
+            self.assertEqual(widget.size, [50, 50])
+
+    def test_events(self):
+        events = []
+        widget = Widget()
+        anim = Animation(x=100, d=.2)
+        anim.bind(on_start=lambda *largs: events.append('start'),
+                  on_progress=lambda a, w, p: events.append(p),
+                  on_complete=lambda *largs: events.append('complete'))
+        anim.start(widget)
+        self.sleep(.5)
+        self.assertEqual(events[0], 'start')
+        self.assertEqual(events[-1], 'complete')
+        progress = events[1:-1]
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 1.)
+
+    def test_coalesced_writes(self):
+        writes = []
+        widget = Widget()
+        widget.bind(x=lambda w, value: writes.append(value))
+        anim1 = Animation(x=50, d=1)
+        anim2 = Animation(x=200, d=1)
+        anim1.start(widget)
+        anim2.start(widget)
+        self.sleep(.5)
+        # the last started animation wins, without alternate writes
+        self.assertTrue(widget.x > 50)
+        self.assertEqual(writes, sorted(writes))
+        anim1.cancel(widget)
+        anim2.cancel(widget)
@@ -0,0 +1,58 @@
+'''
+Atlas tests
+===========
+'''
+
+import unittest
+from random import Random
+from kivy.atlas import Atlas
+
+
+class AtlasPackTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random = Random(42)
+        self.sizes = [(random.randint(4, 80), random.randint(4, 80))
+                      for x in range(300)]
+
+    def check(self, places, count, width, height):
+        self.assertEqual(len(places), len(self.sizes))
+        pages = [[] for x in range(count)]
+        for (idx, x, y, rotated), (w, h) in zip(places, self.sizes):
+            if rotated:
+                w, h = h, w
+            self.assertTrue(0 <= x and x + w <= width)
+            self.assertTrue(0 <= y and y + h <= height)
+            pages[idx].append((x, y, w, h))
+        for boxes in pages:
+            self.assertTrue(boxes)
+            for i, (x, y, w, h) in enumerate(boxes):
+                for ox, oy, ow, oh in boxes[i + 1:]:
+                    self.assertTrue(x >= ox + ow or ox >= x + w or
+                                    y >= oy + oh or oy >= y + h)
+
+    def test_algorithms(self):
+        for algorithm in Atlas.packers:
+            for rotation in (False, True):
+                places, count = Atlas.pack(self.sizes, 256, 256, algorithm,
+                                           rotation)
+                self.check(places, count, 256, 256)
+                if not rotation:
+                    self.assertFalse(any(place[3] for place in places))
+
+    def test_rotation(self):
+        # only fits when rotated
+        self.sizes = [(100, 20)] * 4
+        places, count = Atlas.pack(self.sizes, 40, 200, 'maxrects', True)
+        self.check(places, count, 40, 200)
+        self.assertEqual(count, 1)
+        self.assertTrue(all(place[3] for place in places))
+
+    def test_occupancy(self):
+        area = sum(w * h for w, h in self.sizes)
+        counts = {}
+        for algorithm in Atlas.packers:
+            counts[algorithm] = Atlas.pack(self.sizes, 256, 256,
+                                           algorithm)[1]
+        self.assertTrue(counts['maxrects'] <= counts['guillotine'])
+        self.assertTrue(area / float(counts['maxrects'] * 256 * 256) > .8)
@@ -0,0 +1,130 @@
+'''
+Cache tests
+===========
+'''
+
+import unittest
+
+
+class SizedObject(object):
+
+    def __init__(self, cache_size):
+        self.cache_size = cache_size
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.category = 'test.%s' % self._testMethodName
+
+    def tearDown(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        Cache._categories.pop(self.category, None)
+        Cache._objects.pop(self.category, None)
+        if hasattr(self, '_last_tick'):
+            Clock._last_tick = self._last_tick
+
+    def advance(self, seconds):
+        from kivy.clock import Clock
+        if not hasattr(self, '_last_tick'):
+            self._last_tick = Clock._last_tick
+        Clock._last_tick += seconds
+
+    def test_append_get(self):
+        from kivy.cache import Cache
+        Cache.register(self.category)
+        Cache.append(self.category, 'a', 1)
+        self.assertEqual(Cache.get(self.category, 'a'), 1)
+        self.assertEqual(Cache.get(self.category, 'b', 2), 2)
+        Cache.remove(self.category, 'a')
+        self.assertIsNone(Cache.get(self.category, 'a'))
+
+    def test_limit(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, limit=3)
+        for key in 'abc':
+            Cache.append(self.category, key, key)
+        # 'a' becomes the most recently used
+        Cache.get(self.category, 'a')
+        Cache.append(self.category, 'd', 'd')
+        self.assertEqual(len(Cache._objects[self.category]), 3)
+        self.assertIsNone(Cache.get(self.category, 'b'))
+        for key in 'acd':
+            self.assertEqual(Cache.get(self.category, key), key)
+
+    def test_replace(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, limit=2, size_limit=100)
+        Cache.append(self.category, 'a', SizedObject(40))
+        Cache.append(self.category, 'a', SizedObject(60))
+        Cache.append(self.category, 'b', 1)
+        self.assertEqual(len(Cache._objects[self.category]), 2)
+        self.assertEqual(Cache._categories[self.category]['size'], 60)
+
+    def test_size_limit(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, size_limit=100)
+        Cache.append(self.category, 'a', SizedObject(40))
+        Cache.append(self.category, 'b', SizedObject(40))
+        Cache.append(self.category, 'c', 'c', size=30)
+        self.assertIsNone(Cache.get(self.category, 'a'))
+        self.assertEqual(Cache._categories[self.category]['size'], 70)
+
+        # an object bigger than the limit is still kept alone
+        Cache.append(self.category, 'd', SizedObject(500))
+        self.assertEqual(list(Cache._objects[self.category].keys()), ['d'])
+        self.assertEqual(Cache._categories[self.category]['size'], 500)
+
+        Cache.remove(self.category)
+        self.assertEqual(Cache._categories[self.category]['size'], 0)
+
+    def test_timeout(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, timeout=5)
+        Cache.append(self.category, 'a', 'a')
+        Cache.append(self.category, 'b', 'b')
+        self.advance(4)
+        self.assertEqual(Cache.get(self.category, 'b'), 'b')
+        self.advance(2)
+        Cache._purge_by_timeout(0)
+        self.assertEqual(list(Cache._objects[self.category]), ['b'])
+        self.advance(4)
+        Cache._purge_by_timeout(0)
+        self.assertEqual(len(Cache._objects[self.category]), 0)
+
+    def test_sweep_limit(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, timeout=1)
+        sweep_limit = Cache.sweep_limit
+        try:
+            Cache.sweep_limit = 3
+            for x in range(10):
+                Cache.append(self.category, x, x)
+            self.advance(2)
+            Cache._purge_by_timeout(0)
+            self.assertEqual(len(Cache._objects[self.category]), 7)
+            Cache._purge_by_timeout(0)
+            self.assertEqual(len(Cache._objects[self.category]), 4)
+            # the rest is swept on the next frames, not after a second
+            self.assertTrue(Cache._trigger_sweep.is_triggered)
+        finally:
+            Cache._trigger_sweep.cancel()
+            Cache.sweep_limit = sweep_limit
+
+    def test_stats(self):
+        from kivy.cache import Cache
+        Cache.register(self.category, limit=1, timeout=1)
+        Cache.append(self.category, 'a', 'a')
+        Cache.get(self.category, 'a')
+        Cache.get(self.category, 'b')
+        Cache.append(self.category, 'b', 'b')
+        self.advance(2)
+        Cache._purge_by_timeout(0)
+        stats = Cache.stats(self.category)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['count'], 0)
+        self.assertIn(self.category, Cache.stats())
@@ -13,6 +13,38 @@ def callback(dt):
     counter += 1
 
 
+def schedule_from_threads(clock, threads=4, count=2000):
+    # schedule and cancel events from several threads while the main thread
+    # ticks the clock, return the number of callbacks called and expected
+    import sys
+    from threading import Thread
+    calls = []
+    # switch between the threads as often as possible
+    interval = getattr(sys, 'getswitchinterval', lambda: None)()
+    if interval is not None:
+        sys.setswitchinterval(1e-6)
+
+    def worker():
+        for i in range(count):
+            clock.schedule_once(calls.append)
+            clock.schedule_once(calls.append, 10.).cancel()
+
+    workers = [Thread(target=worker) for i in range(threads)]
+    try:
+        for thread in workers:
+            thread.start()
+        while any(thread.is_alive() for thread in workers):
+            clock.tick()
+        for thread in workers:
+            thread.join()
+    finally:
+        if interval is not None:
+            sys.setswitchinterval(interval)
+    clock.tick()
+    clock.tick()
+    return len(calls), threads * count
+
+
 class ClockTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -73,3 +105,346 @@ class ClockTestCase(unittest.TestCase):
         Clock.unschedule(callback)
         Clock.tick()
         self.assertEqual(counter, 0)
+
+    def test_cancel(self):
+        from kivy.clock import Clock
+        event = Clock.schedule_once(callback)
+        event.cancel()
+        Clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_unschedule_event(self):
+        from kivy.clock import Clock
+        events = [Clock.schedule_once(callback) for x in range(10)]
+        for event in events[::2]:
+            Clock.unschedule(event)
+        Clock.unschedule(events[0])
+        Clock.tick()
+        self.assertEqual(counter, 5)
+        self.assertEqual(len(Clock._events['callback']), 0)
+
+    def test_unschedule_from_callback(self):
+        from kivy.clock import Clock
+        events = []
+
+        def cancel_all(dt):
+            callback(dt)
+            for event in events:
+                event.cancel()
+
+        events.extend(Clock.schedule_once(cancel_all) for x in range(3))
+        Clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_trigger_from_callback(self):
+        from kivy.clock import Clock
+
+        def retrigger(dt):
+            callback(dt)
+            trigger()
+
+        trigger = Clock.create_trigger(retrigger)
+        trigger()
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+        self.assertTrue(trigger.is_triggered)
+        self.assertEqual(len(Clock._events['retrigger']), 1)
+        trigger.cancel()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_schedule_from_threads(self):
+        from kivy.clock import ClockBase
+        clock = ClockBase()
+        clock._max_fps = 0
+        called, expected = schedule_from_threads(clock)
+        self.assertEqual(called, expected)
+        self.assertEqual(sum(map(len, clock._events.values())), 0)
+
+    def test_next_timeout(self):
+        from kivy.clock import Clock
+        Clock.tick()
+        self.assertEqual(Clock.get_next_timeout(), None)
+        event = Clock.schedule_once(callback, 10.)
+        Clock.schedule_interval(callback, 20.)
+        self.assertTrue(9.9 < Clock.get_next_timeout() <= 10.)
+        event.cancel()
+        self.assertTrue(19.9 < Clock.get_next_timeout() <= 20.)
+        Clock.schedule_once(callback, -1)
+        self.assertEqual(Clock.get_next_timeout(), 0)
+
+
+class HeapClockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import ClockBaseHeap
+        global counter
+        counter = 0
+        self.clock = ClockBaseHeap()
+        self.clock._max_fps = 0
+
+    def test_schedule_once(self):
+        clock = self.clock
+        clock.schedule_once(callback)
+        clock.tick()
+        self.assertEqual(counter, 1)
+        clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_once_twice(self):
+        clock = self.clock
+        clock.schedule_once(callback)
+        clock.schedule_once(callback)
+        clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_schedule_once_draw_after(self):
+        clock = self.clock
+        clock.schedule_once(callback, 0)
+        clock.tick_draw()
+        self.assertEqual(counter, 0)
+        clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_once_draw_before(self):
+        clock = self.clock
+        clock.schedule_once(callback, -1)
+        clock.tick_draw()
+        self.assertEqual(counter, 1)
+        clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_once_not_due(self):
+        clock = self.clock
+        clock.schedule_once(callback, 5.)
+        clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_schedule_interval(self):
+        clock = self.clock
+        clock.schedule_interval(callback, 0)
+        clock.tick()
+        clock.tick()
+        clock.tick()
+        self.assertEqual(counter, 3)
+        clock.unschedule(callback)
+        clock.tick()
+        self.assertEqual(counter, 3)
+
+    def test_schedule_interval_return_false(self):
+        clock = self.clock
+
+        def stop(dt):
+            callback(dt)
+            return False
+
+        clock.schedule_interval(stop, 0)
+        clock.tick()
+        clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_schedule_from_callback(self):
+        clock = self.clock
+
+        def reschedule(dt):
+            callback(dt)
+            clock.schedule_once(reschedule)
+
+        clock.schedule_once(reschedule)
+        clock.tick()
+        self.assertEqual(counter, 1)
+        clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_unschedule(self):
+        clock = self.clock
+        clock.schedule_once(callback)
+        clock.unschedule(callback)
+        clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_unschedule_after_tick(self):
+        clock = self.clock
+        clock.schedule_once(callback, 5.)
+        clock.tick()
+        clock.unschedule(callback)
+        clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_unschedule_event(self):
+        clock = self.clock
+        event = clock.schedule_once(callback)
+        clock.unschedule(event)
+        clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_trigger(self):
+        clock = self.clock
+        trigger = clock.create_trigger(callback)
+        trigger()
+        trigger()
+        clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        trigger.cancel()
+        clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_trigger_from_callback(self):
+        clock = self.clock
+
+        def retrigger(dt):
+            callback(dt)
+            trigger()
+
+        trigger = clock.create_trigger(retrigger)
+        trigger()
+        entry = trigger._entry
+        clock.tick()
+        clock.tick()
+        self.assertEqual(counter, 2)
+        self.assertTrue(trigger.is_triggered)
+        # re-arming reuses the same heap entry
+        self.assertIs(trigger._entry, entry)
+
+    def test_unschedule_from_callback(self):
+        clock = self.clock
+        events = []
+
+        def cancel_all(dt):
+            callback(dt)
+            for event in events:
+                event.cancel()
+
+        events.extend(clock.schedule_once(cancel_all) for x in range(3))
+        clock.tick()
+        self.assertEqual(counter, 1)
+
+    def test_unschedule_before_frame(self):
+        clock = self.clock
+        event = clock.schedule_once(callback, -1)
+        event.cancel()
+        clock.tick_draw()
+        clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_next_timeout(self):
+        clock = self.clock
+        self.assertEqual(clock.get_next_timeout(), None)
+        event = clock.schedule_once(callback, 10.)
+        clock.schedule_interval(callback, 20.)
+        self.assertTrue(9.9 < clock.get_next_timeout() <= 10.)
+        event.cancel()
+        self.assertTrue(19.9 < clock.get_next_timeout() <= 20.)
+        event = clock.schedule_once(callback, -1)
+        self.assertEqual(clock.get_next_timeout(), 0)
+        event.cancel()
+        clock.schedule_once(callback)
+        self.assertEqual(clock.get_next_timeout(), 0)
+
+    def test_schedule_from_threads(self):
+        clock = self.clock
+        called, expected = schedule_from_threads(clock)
+        self.assertEqual(called, expected)
+        self.assertEqual(clock.get_next_timeout(), None)
+
+    def test_heap_compaction(self):
+        clock = self.clock
+        events = [clock.schedule_once(callback, 10.) for x in range(200)]
+        for event in events[:150]:
+            clock.unschedule(event)
+        self.assertTrue(len(clock._heap) < 200)
+        clock._last_tick += 20.
+        clock._process_events()
+        self.assertEqual(counter, 50)
+
+
+class ClockProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.clock import ClockBase
+        global counter
+        counter = 0
+        self.clock = ClockBase()
+        self.clock._max_fps = 0
+
+    def test_disabled(self):
+        clock = self.clock
+        self.assertIsNone(clock.profiler)
+        clock.schedule_once(callback)
+        clock.tick()
+        self.assertEqual(counter, 1)
+        self.assertIsNone(clock.stop_profiling())
+
+    def test_callbacks(self):
+        clock = self.clock
+        profiler = clock.start_profiling()
+        self.assertIs(clock.profiler, profiler)
+        clock.schedule_interval(callback, 0)
+        clock.tick()
+        clock.tick()
+        clock.tick()
+        clock.end_frame()
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot['frames'], 3)
+        stats = snapshot['callbacks'][0]
+        self.assertEqual(stats['name'], __name__ + '.callback')
+        self.assertEqual(stats['count'], 3)
+        self.assertTrue(stats['total'] >= stats['max'] >= 0)
+        self.assertIn(__name__ + '.callback', profiler.dump())
+
+        self.assertIs(clock.stop_profiling(), profiler)
+        clock.tick()
+        self.assertEqual(counter, 4)
+        self.assertEqual(profiler.snapshot()['callbacks'][0]['count'], 3)
+
+    def test_overruns(self):
+        clock = self.clock
+        profiler = clock.start_profiling()
+        profiler.budget = 0.01
+        profiler.add_frame(1, 0.005)
+        profiler.add_frame(2, 0.05)
+        self.assertEqual(profiler.overruns, 1)
+        self.assertEqual(profiler.snapshot()['overrun_frames'], [(2, 0.05)])
+        profiler.reset()
+        self.assertEqual(profiler.snapshot()['overruns'], 0)
+
+    def test_overruns_without_sleep(self):
+        from time import sleep
+        # the time slept by the clock to honor maxfps is not an overrun
+        clock = self.clock
+        clock._max_fps = 50.
+        profiler = clock.start_profiling()
+        for i in range(10):
+            clock.tick()
+            clock.end_frame()
+        self.assertEqual(profiler.frames, 10)
+        self.assertEqual(profiler.overruns, 0)
+        clock.schedule_once(lambda dt: sleep(.03))
+        clock.tick()
+        clock.end_frame()
+        self.assertEqual(profiler.overruns, 1)
+        self.assertEqual(profiler.overrun_frames[0][0], clock.frames)
+        self.assertTrue(profiler.overrun_frames[0][1] >= .03)
+
+    def test_overruns_drawing(self):
+        from time import sleep
+        # the work done after the callbacks, like the drawing, is part of the
+        # frame, until end_frame() or the next tick()
+        clock = self.clock
+        clock._max_fps = 50.
+        profiler = clock.start_profiling()
+        clock.tick()
+        sleep(.03)
+        clock.end_frame()
+        clock.end_frame()
+        self.assertEqual((profiler.frames, profiler.overruns), (1, 1))
+        clock.tick()
+        sleep(.03)
+        clock.tick()
+        self.assertEqual((profiler.frames, profiler.overruns), (2, 2))
+        self.assertEqual(profiler.overrun_frames[-1][0], clock.frames - 1)
@@ -0,0 +1,144 @@
+'''
+Connection pool tests
+=====================
+'''
+
+import unittest
+from socket import timeout as socket_timeout
+from threading import Thread
+from time import sleep
+
+try:
+    # py3k
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    # py27
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from kivy.network.connectionpool import HTTPConnectionPool
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # requests received, as (method, path)
+    received = []
+
+    def do_GET(self):
+        self.received.append(('GET', self.path))
+        if self.path == '/slow':
+            sleep(.5)
+        if self.path == '/drop':
+            # the connection is closed without a response
+            self.close_connection = True
+            return
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        if self.path == '/close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == '/silent-close':
+            # closed without telling the client
+            self.close_connection = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append(('POST', self.path))
+        self.close_connection = True
+
+    def log_message(self, *largs):
+        pass
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.pool = HTTPConnectionPool(timeout=5)
+        del Handler.received[:]
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path, read=True):
+        resp = self.pool.request(self.url + path)
+        try:
+            return resp.read() if read else resp.status
+        finally:
+            self.pool.release(resp)
+
+    def test_reuse(self):
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertEqual(self.get('/b?x=1'), b'/b?x=1')
+        self.assertEqual(self.get('/c'), b'/c')
+        self.assertEqual(self.pool.connections_created, 1)
+        self.assertEqual(self.pool.connections_reused, 2)
+
+    def test_unread_response(self):
+        self.assertEqual(self.get('/a', read=False), 200)
+        self.assertEqual(self.get('/b'), b'/b')
+        self.assertEqual(self.pool.connections_created, 2)
+
+    def test_connection_close(self):
+        self.assertEqual(self.get('/close'), b'/close')
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertEqual(self.pool.connections_created, 2)
+
+    def test_stale_connection(self):
+        self.assertEqual(self.get('/a'), b'/a')
+        # close the idle connection behind the pool's back
+        for idle in self.pool._idle.values():
+            for conn in idle:
+                conn.sock.close()
+        self.assertEqual(self.get('/b'), b'/b')
+        self.assertEqual(self.pool.connections_created, 2)
+
+    def test_closed_by_server(self):
+        self.assertEqual(self.get('/silent-close'), b'/silent-close')
+        # the server has closed the idle connection, the GET is sent again
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertEqual(self.pool.connections_created, 2)
+
+    def test_no_retry(self):
+        pool = self.pool
+        # a POST received by the server is not sent again, even on a reused
+        # connection
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertRaises(Exception, pool.request, self.url + '/drop',
+                          method='POST', body=b'data',
+                          headers={'Content-Length': '4'})
+        self.assertEqual(Handler.received, [('GET', '/a'), ('POST', '/drop')])
+        # a GET is sent again on a new connection
+        del Handler.received[:]
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertRaises(Exception, self.get, '/drop')
+        self.assertEqual(Handler.received,
+                         [('GET', '/a'), ('GET', '/drop'), ('GET', '/drop')])
+        # a timeout is never retried
+        del Handler.received[:]
+        self.assertEqual(self.get('/a'), b'/a')
+        self.assertRaises(socket_timeout, pool.request, self.url + '/slow',
+                          timeout=.1)
+        sleep(.6)
+        self.assertEqual(Handler.received, [('GET', '/a'), ('GET', '/slow')])
+
+    def test_timeout(self):
+        pool = self.pool
+        resp = pool.request(self.url + '/a', timeout=2)
+        conn = resp._pool_conn
+        self.assertEqual(conn.sock.gettimeout(), 2)
+        resp.read()
+        pool.release(resp)
+        # the reused connection gets the timeout of the new request
+        resp = pool.request(self.url + '/b')
+        self.assertTrue(resp._pool_conn is conn)
+        self.assertEqual(conn.sock.gettimeout(), 5)
+        resp.read()
+        pool.release(resp)
@@ -0,0 +1,263 @@
+'''
+Event loop tests
+================
+'''
+
+import os
+import unittest
+from threading import Thread
+from time import sleep, time
+
+
+def cpu_time():
+    user, system = os.times()[:2]
+    return user + system
+
+
+class LazyEventLoopTestCase(unittest.TestCase):
+    # run a lazy event loop without window, with its own clock
+
+    def create_clock(self):
+        from kivy.clock import ClockBase
+        return ClockBase()
+
+    def setUp(self):
+        import kivy.base
+        from kivy.base import EventLoopBase
+        self.clock = self.create_clock()
+        self._clock = kivy.base.Clock
+        kivy.base.Clock = self.clock
+        self.loop = EventLoopBase()
+        self.loop.lazy = True
+        self.loop.add_event_listener(self)
+
+    def tearDown(self):
+        import kivy.base
+        kivy.base.Clock = self._clock
+
+    def run_loop(self, condition, timeout=3.):
+        # run the loop until condition() is True, return the number of frames,
+        # the elapsed time and the cpu time used
+        start = time()
+        start_cpu = cpu_time()
+        frames = 0
+        while not condition() and time() - start < timeout:
+            self.loop.idle()
+            frames += 1
+        return frames, time() - start, cpu_time() - start_cpu
+
+    def test_wait_next_event(self):
+        calls = []
+        self.clock.schedule_once(calls.append, .5)
+        frames, elapsed, cpu = self.run_loop(lambda: calls)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(.45 < elapsed < 1., elapsed)
+        # the loop has slept instead of running a frame every 1 / maxfps
+        self.assertTrue(frames <= 3, frames)
+        self.assertTrue(cpu < elapsed / 5., (cpu, elapsed))
+
+    def test_wakeup_from_thread(self):
+        calls = []
+        clock = self.clock
+        # nothing is due before 10 seconds
+        clock.schedule_once(calls.append, 10.)
+
+        def schedule():
+            sleep(.3)
+            clock.schedule_once(calls.append)
+
+        thread = Thread(target=schedule)
+        thread.start()
+        frames, elapsed, cpu = self.run_loop(lambda: calls)
+        thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(.25 < elapsed < 1., elapsed)
+        self.assertTrue(frames <= 3, frames)
+
+        # wakeup() stops the wait too
+        def wakeup():
+            sleep(.3)
+            calls.append(None)
+            self.loop.wakeup()
+
+        thread = Thread(target=wakeup)
+        thread.start()
+        frames, elapsed, cpu = self.run_loop(lambda: len(calls) > 1)
+        thread.join()
+        self.assertTrue(elapsed < 1., elapsed)
+
+    def test_wakeup_after_schedule(self):
+        # the loop must be woken up once the new event is visible, or it
+        # would compute the same timeout and wait again without it
+        clock = self.clock
+        clock.schedule_once(lambda dt: None, 10.)
+        waker = self.loop._waker
+        wake = waker.wake
+        timeouts = []
+
+        def record_wake():
+            timeouts.append(clock.get_next_timeout())
+            wake()
+        waker.wake = record_wake
+
+        calls = []
+        for timeout in (-1, .1):
+            def schedule():
+                sleep(.3)
+                clock.schedule_once(calls.append, timeout)
+
+            del timeouts[:]
+            count = len(calls)
+            thread = Thread(target=schedule)
+            thread.start()
+            frames, elapsed, cpu = self.run_loop(
+                lambda: len(calls) > count)
+            thread.join()
+            self.assertTrue(elapsed < 1., elapsed)
+            self.assertTrue(timeouts[0] <= max(0, timeout), timeouts)
+
+    def test_no_wait(self):
+        # the loop doesn't wait while there is something to do
+        clock = self.clock
+        clock.schedule_once(lambda dt: None, 10.)
+        event = clock.schedule_interval(lambda dt: None, 0)
+        start = time()
+        self.assertFalse(self.loop.wait())
+        event.cancel()
+        self.loop.me_list.append(None)
+        self.assertFalse(self.loop.wait())
+        self.assertTrue(time() - start < .1)
+
+
+class LazyEventLoopHeapTestCase(LazyEventLoopTestCase):
+    # the same tests with the clock using a heap of events
+
+    def create_clock(self):
+        from kivy.clock import ClockBaseHeap
+        return ClockBaseHeap()
+
+
+class LazyGlobalClockTestCase(unittest.TestCase):
+    # the modules scheduling events on the global clock at import must not
+    # keep a lazy loop awake
+
+    def test_wait_with_cache(self):
+        import kivy.cache
+        from kivy.base import EventLoopBase
+        from kivy.clock import Clock
+        loop = EventLoopBase()
+        loop.lazy = True
+        try:
+            for i in range(3):
+                Clock.tick()
+            timeout = Clock.get_next_timeout()
+            self.assertTrue(timeout is None or timeout > .5, timeout)
+            start = time()
+            self.assertTrue(loop.wait())
+            self.assertTrue(time() - start > .4, time() - start)
+        finally:
+            Clock._wakeup = None
+
+
+class InputQueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.base import EventLoopBase
+        from kivy.input.motionevent import MotionEvent
+        from kivy.input.provider import MotionEventProvider
+
+        class TestMotionEvent(MotionEvent):
+            def depack(self, args):
+                self.is_touch = True
+                self.sx, self.sy = args
+                super(TestMotionEvent, self).depack(args)
+
+        class TestProvider(MotionEventProvider):
+            events = []
+
+            def update(self, dispatch_fn):
+                for event in self.events:
+                    dispatch_fn(*event)
+                del self.events[:]
+
+        self.event_class = TestMotionEvent
+        self.provider = TestProvider('test', '')
+        self.loop = EventLoopBase()
+        self.loop.add_input_provider(self.provider)
+        self.loop.add_event_listener(self)
+        self.dispatched = []
+
+    def tearDown(self):
+        from kivy.input.motionevent import MotionEvent
+        MotionEvent.keep_history = False
+
+    def dispatch(self, name, etype, me):
+        self.dispatched.append((etype, me.id, me.spos, list(me.history)))
+
+    def move(self, me, count):
+        # move the event like a provider thread, queuing each position
+        for i in range(count):
+            me.move([i / float(count), .5])
+            self.provider.events.append(('update', me))
+
+    def test_coalescing(self):
+        a = self.event_class('test', 'a', [0, 0])
+        b = self.event_class('test', 'b', [0, 0])
+        events = self.provider.events
+        events.extend([('begin', a), ('begin', b)])
+        self.move(a, 100)
+        self.move(b, 100)
+        self.move(a, 4)
+        self.loop.dispatch_input()
+        self.assertEqual([event[:3] for event in self.dispatched],
+                         [('begin', 'a', (.75, .5)), ('begin', 'b', (.99, .5)),
+                          ('update', 'a', (.75, .5)),
+                          ('update', 'b', (.99, .5))])
+        self.assertEqual(self.loop.touches, [a, b])
+        self.assertEqual(self.loop.input_events, [])
+
+        # a new frame dispatches the new updates
+        del self.dispatched[:]
+        self.move(a, 2)
+        events.append(('end', a))
+        self.loop.dispatch_input()
+        self.assertEqual([event[:3] for event in self.dispatched],
+                         [('update', 'a', (.5, .5)), ('end', 'a', (.5, .5))])
+        self.assertEqual(self.loop.touches, [b])
+
+    def test_history(self):
+        from kivy.input.motionevent import MotionEvent
+        MotionEvent.keep_history = True
+        a = self.event_class('test', 'a', [0, 0])
+        self.provider.events.append(('begin', a))
+        self.move(a, 10)
+        self.loop.dispatch_input()
+        # the positions are given to the update, not to the begin
+        begin, update = self.dispatched
+        self.assertEqual(begin[3], [])
+        self.assertEqual([(sx, sy) for sx, sy, t in update[3]],
+                         [(i / 10., .5) for i in range(10)])
+        del self.dispatched[:]
+        self.move(a, 2)
+        self.loop.dispatch_input()
+        self.assertEqual([(sx, sy) for sx, sy, t in self.dispatched[0][3]],
+                         [(0, .5), (.5, .5)])
+
+        # the end takes the positions not given to an update
+        del self.dispatched[:]
+        self.move(a, 2)
+        self.provider.events.append(('end', a))
+        self.loop.dispatch_input()
+        update, end = self.dispatched
+        self.assertEqual([(sx, sy) for sx, sy, t in update[3]],
+                         [(0, .5), (.5, .5)])
+        self.assertEqual(end[3], [])
+        b = self.event_class('test', 'b', [0, 0])
+        self.provider.events.append(('begin', b))
+        self.loop.dispatch_input()
+        b.move([.7, .5])
+        self.provider.events.append(('end', b))
+        self.loop.dispatch_input()
+        self.assertEqual(self.dispatched[-1][:2], ('end', 'b'))
+        self.assertEqual([(sx, sy) for sx, sy, t in self.dispatched[-1][3]],
+                         [(.7, .5)])
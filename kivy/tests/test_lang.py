@@ -224,3 +224,140 @@ class LangTestCase(unittest.TestCase):
         self.assertTrue('on_press' in wid.binded_func)
         wid.binded_func['on_press']()
         self.assertEquals(wid.a, 1)
+
+    def test_compiled_rules_cache(self):
+        import os
+        import shutil
+        import tempfile
+        from kivy.lang import Parser
+        content = '''
+<TestClass>:
+    obj: 1 + 1
+    on_press:
+        self.a = self.obj
+'''
+        cache_dir = tempfile.mkdtemp()
+        try:
+            for x in range(2):
+                Builder = self.import_builder()
+                Builder.cache_dir = cache_dir
+                Builder.load_string(content, filename='test_cache.kv')
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                wid = TestClass()
+                Builder.apply(wid)
+                self.assertEqual(wid.obj, 2)
+                wid.binded_func['on_press']()
+                self.assertEqual(wid.a, 2)
+
+            # the restored rules are the same as the parsed ones
+            parser = Parser(content=content)
+            restored = Parser(content=content, cached=parser.dump_cached())
+            self.assertEqual(restored.dump_cached(), parser.dump_cached())
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_instantiation_plan(self):
+        Builder = self.import_builder()
+        from kivy.factory import Factory
+        Builder.load_string('''
+<TestClass>:
+    TestClass2:
+        id: child1
+        obj: 'a'
+        TestClass3:
+            id: child2 # the comment is not a part of the id
+            obj: child1.obj + 'b'
+''')
+        rule = Builder.match(TestClass())[0]
+        for x in range(2):
+            wid = TestClass()
+            Builder.apply(wid)
+            self.assertEqual(sorted(wid.ids.keys()), ['child1', 'child2'])
+            child1 = wid.children[0]
+            child2 = child1.children[0]
+            self.assertTrue(isinstance(child1, TestClass2))
+            self.assertTrue(wid.ids['child2'] == child2)
+            self.assertEqual(child2.obj, 'ab')
+
+            # the plan is compiled once, and replayed for the next widgets
+            plan = rule.plan
+            self.assertTrue(plan is not None)
+            if x:
+                self.assertTrue(plan is first_plan)
+            first_plan = plan
+
+        # the class of a child is resolved again when it is registered again
+        class TestClass2Bis(BaseClass):
+            obj = None
+        Factory.unregister('TestClass2')
+        Factory.register('TestClass2', cls=TestClass2Bis)
+        try:
+            wid = TestClass()
+            Builder.apply(wid)
+            self.assertTrue(isinstance(wid.children[0], TestClass2Bis))
+        finally:
+            Factory.unregister('TestClass2')
+            Factory.register('TestClass2', cls=TestClass2)
+
+    def test_bind_many_handlers(self):
+        Builder = self.import_builder()
+        from kivy.event import EventDispatcher
+        from kivy.properties import NumericProperty
+        from kivy.lang import global_idmap
+
+        class Source(EventDispatcher):
+            a = NumericProperty(1)
+            b = NumericProperty(2)
+
+        source = global_idmap['test_source'] = Source()
+        try:
+            Builder.load_string('''
+<TestClass>:
+    obj: test_source.a + test_source.b
+    obj2: test_source.a * 10
+''')
+            wid = TestClass()
+            Builder.apply(wid)
+            self.assertEqual(wid.obj, 3)
+            self.assertEqual(wid.obj2, 10)
+            self.assertEqual(len(source.get_property_observers('a')), 2)
+            source.a = 2
+            self.assertEqual(wid.obj, 4)
+            self.assertEqual(wid.obj2, 20)
+
+            # all the handlers of the widget are unbound at once
+            Builder.unbind_widget(wid.uid)
+            self.assertEqual(source.get_property_observers('a'), [])
+            self.assertEqual(source.get_property_observers('b'), [])
+            source.b = 10
+            self.assertEqual(wid.obj, 4)
+        finally:
+            del global_idmap['test_source']
+
+    def test_compiled_rules_cache_entries(self):
+        import os
+        import shutil
+        import tempfile
+        content = '''
+<TestClass>:
+    obj: %d
+'''
+        cache_dir = tempfile.mkdtemp()
+        try:
+            # a modified file replaces its entry
+            for x in range(3):
+                Builder = self.import_builder()
+                Builder.cache_dir = cache_dir
+                Builder.load_string(content % x, filename='test_cache.kv')
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                wid = TestClass()
+                Builder.apply(wid)
+                self.assertEqual(wid.obj, x)
+
+            # a string without filename is not cached
+            Builder = self.import_builder()
+            Builder.cache_dir = cache_dir
+            Builder.load_string(content % 42)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+        finally:
+            shutil.rmtree(cache_dir)
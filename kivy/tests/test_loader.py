@@ -0,0 +1,266 @@
+'''
+Loader tests
+============
+'''
+
+import unittest
+import shutil
+import tempfile
+from threading import Thread
+
+try:
+    # py3k
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    # py27
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+
+class FakeClient(object):
+    pass
+
+
+class LoaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.loader import LoaderBase
+        self.loader = LoaderBase()
+
+    def request(self, filename, priority=0):
+        loader = self.loader
+        request = loader._requests[filename] = {
+            'filename': filename,
+            'load_callback': None,
+            'post_callback': None,
+            'kwargs': {},
+            'priority': priority,
+            'state': 'queued',
+            'clients': []}
+        loader._push_request(request)
+        client = FakeClient()
+        loader._add_client(request, client, priority)
+        return request, client
+
+    def test_priority(self):
+        loader = self.loader
+        r1, c1 = self.request('a.png', 0)
+        r2, c2 = self.request('b.png', 5)
+        r3, c3 = self.request('c.png', 1)
+        self.assertIs(loader._pop_request(), r2)
+        loader.set_priority(c1, 10)
+        self.assertIs(loader._pop_request(), r1)
+        self.assertIs(loader._pop_request(), r3)
+        self.assertIsNone(loader._pop_request())
+
+    def test_shared_request(self):
+        loader = self.loader
+        r1, c1 = self.request('a.png', 0)
+        r2, c2 = self.request('b.png', 1)
+        c3 = FakeClient()
+        loader._add_client(r1, c3, 2)
+        loader._update_request(r1)
+        self.assertIs(loader._pop_request(), r1)
+        self.assertEqual(r1['state'], 'loading')
+
+    def test_cancel(self):
+        loader = self.loader
+        r1, c1 = self.request('a.png')
+        r2, c2 = self.request('b.png')
+        loader.cancel(c1)
+        self.assertEqual(r1['state'], 'cancelled')
+        self.assertNotIn('a.png', loader._requests)
+        # the request is cancelled as well when the client is collected
+        del c2
+        import gc
+        gc.collect()
+        self.assertEqual(r2['state'], 'cancelled')
+        self.assertIsNone(loader._pop_request())
+
+
+class FakeImageData(object):
+
+    def __init__(self, size):
+        self.cache_size = size
+
+
+class FakeUploadImage(object):
+    # an image whose upload takes 1us per byte of a fake timer
+    nocache = True
+    timer = [0.]
+
+    def __init__(self, size):
+        self._data = [FakeImageData(size)]
+
+    @property
+    def texture(self):
+        self.timer[0] += self._data[0].cache_size * 1e-6
+
+
+class LoaderUploadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import kivy.loader
+        from kivy.loader import LoaderBase
+        self._upload_time = kivy.loader._upload_time
+        kivy.loader._upload_time = lambda: FakeUploadImage.timer[0]
+        self.loader = LoaderBase()
+        self.loader.max_upload_per_frame = None
+
+    def tearDown(self):
+        import kivy.loader
+        kivy.loader._upload_time = self._upload_time
+
+    def queue(self, *sizes):
+        for size in sizes:
+            request = {'filename': 'img%d' % size, 'state': 'loading',
+                       'clients': []}
+            self.loader._q_done.appendleft((request, FakeUploadImage(size)))
+
+    def test_count(self):
+        loader = self.loader
+        loader.max_upload_per_frame = 2
+        self.queue(100, 200, 300)
+        loader._update()
+        self.assertEqual(len(loader._q_done), 1)
+
+    def test_byte_budget(self):
+        loader = self.loader
+        loader.upload_byte_budget = 250
+        self.queue(100, 100, 1000, 100)
+        loader._update()
+        self.assertEqual(len(loader._q_done), 2)
+        # at least one image per frame, whatever its size
+        loader._update()
+        self.assertEqual(len(loader._q_done), 1)
+        stats = loader.upload_stats()
+        self.assertEqual(stats['uploads'], 3)
+        self.assertEqual(stats['bytes'], 1200)
+        self.assertEqual(stats['frames'], 2)
+        self.assertEqual(stats['deferred_frames'], 2)
+
+    def test_time_budget(self):
+        loader = self.loader
+        loader.upload_budget = 250e-6
+        self.queue(100, 100, 100, 100)
+        loader._update()
+        self.assertEqual(len(loader._q_done), 2)
+        stats = loader.upload_stats()
+        self.assertAlmostEqual(stats['cost_per_byte'], 1e-6)
+        self.assertAlmostEqual(stats['time'], 200e-6)
+        self.assertAlmostEqual(stats['max_frame_time'], 200e-6)
+
+    def test_adaptive_budget(self):
+        loader = self.loader
+        target = loader.target_frametime = 1 / 60.
+        loader._adapt_upload_budget(target)
+        budget = loader.upload_budget
+        loader._adapt_upload_budget(target * 2)
+        self.assertLess(loader.upload_budget, budget)
+        for x in range(100):
+            loader._adapt_upload_budget(target * 2)
+        self.assertAlmostEqual(loader.upload_budget, target / 100.)
+        for x in range(100):
+            loader._adapt_upload_budget(0)
+        self.assertAlmostEqual(loader.upload_budget, target)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    body = b'GIF89a-fake-image'
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/image')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        server.downloads += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/gif')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *largs):
+        pass
+
+
+class LoaderHttpTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.loader import LoaderBase
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+        self.server.downloads = self.server.not_modified = 0
+        self.url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        thread = Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.cache_dir = tempfile.mkdtemp()
+        self.loader = LoaderBase()
+
+    def tearDown(self):
+        self.loader._http_pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_fetch(self):
+        loader = self.loader
+        for x in range(3):
+            idata, ctype = loader._fetch_http(self.url + '/image')
+            self.assertEqual(idata.getvalue(), ETagHandler.body)
+            self.assertEqual(ctype, 'image/gif')
+        self.assertEqual(self.server.downloads, 3)
+        self.assertEqual(loader._http_pool.connections_created, 1)
+
+    def test_redirect(self):
+        idata, ctype = self.loader._fetch_http(self.url + '/redirect')
+        self.assertEqual(idata.getvalue(), ETagHandler.body)
+
+    def test_http_cache(self):
+        from kivy.loader import LoaderBase
+        self.loader.http_cache_dir = self.cache_dir
+        idata, ctype = self.loader._fetch_http(self.url + '/image')
+        # a new loader, like after restarting the application
+        loader = LoaderBase()
+        loader.http_cache_dir = self.cache_dir
+        idata, ctype = loader._fetch_http(self.url + '/image')
+        loader._http_pool.clear()
+        self.assertEqual(idata.getvalue(), ETagHandler.body)
+        self.assertEqual(ctype, 'image/gif')
+        self.assertEqual(self.server.downloads, 1)
+        self.assertEqual(self.server.not_modified, 1)
+
+    def test_http_cache_missing_data(self):
+        from os import unlink
+        from kivy.loader import LoaderBase
+        self.loader.http_cache_dir = self.cache_dir
+        self.loader._fetch_http(self.url + '/image')
+        cache_fn, meta = self.loader._http_cache_get(self.url + '/image')
+        unlink(cache_fn)
+        # the server answers 304, but the cached data cannot be read
+        loader = LoaderBase()
+        loader.http_cache_dir = self.cache_dir
+        idata, ctype = loader._fetch_http(self.url + '/image')
+        loader._http_pool.clear()
+        self.assertEqual(idata.getvalue(), ETagHandler.body)
+        self.assertEqual(ctype, 'image/gif')
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(self.server.downloads, 2)
+        # and the new download is cached again
+        cache_fn, meta = loader._http_cache_get(self.url + '/image')
+        self.assertEqual(meta['etag'], '"v1"')
@@ -391,3 +391,29 @@ class PropertiesTestCase(unittest.TestCase):
 
         bnp.set(wid, -10)
         self.assertEqual(bnp.get(wid), -5)
+
+    def test_bind_many(self):
+        from kivy.properties import NumericProperty
+
+        class Dispatcher(EventDispatcher):
+            x = NumericProperty(0)
+            y = NumericProperty(0)
+
+        calls = []
+        x_cb = lambda obj, value: calls.append(('x', value))
+        xy_cb = lambda obj, value: calls.append(('xy', value))
+
+        obj = Dispatcher()
+        handle = obj.bind_many([('x', x_cb), ('x', xy_cb), ('y', xy_cb),
+                                ('missing', x_cb)])
+        obj.x = 1
+        obj.y = 2
+        self.assertEqual(calls, [('x', 1), ('xy', 1), ('xy', 2)])
+
+        # the other observers are kept
+        obj.bind(x=xy_cb)
+        other_cb = lambda obj, value: calls.append(('other', value))
+        obj.bind(x=other_cb)
+        obj.unbind_many(handle)
+        self.assertEqual(obj.get_property_observers('x'), [other_cb])
+        self.assertEqual(obj.get_property_observers('y'), [])
@@ -0,0 +1,39 @@
+'''
+Spatial index tests
+===================
+'''
+
+import unittest
+
+
+class SpatialGridTestCase(unittest.TestCase):
+
+    def test_query(self):
+        from kivy.spatialindex import SpatialGrid
+        grid = SpatialGrid(cell_size=100, max_cells=16)
+        grid.insert('a', 0, 0, 50, 50)
+        grid.insert('b', 40, 40, 200, 200)
+        grid.insert('c', -150, -150, 100, 100)
+        grid.insert('large', 0, 0, 1000, 1000)
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(sorted(grid.query(45, 45)), ['a', 'b', 'large'])
+        self.assertEqual(sorted(grid.query(50, 50)), ['a', 'b', 'large'])
+        self.assertEqual(sorted(grid.query(150, 150)), ['b', 'large'])
+        self.assertEqual(grid.query(-100, -100), ['c'])
+        self.assertEqual(grid.query(-10, -10), [])
+        self.assertEqual(grid.query(2000, 2000), [])
+
+        # move and remove
+        grid.insert('a', 500, 500, 10, 10)
+        self.assertEqual(sorted(grid.query(45, 45)), ['b', 'large'])
+        self.assertEqual(sorted(grid.query(505, 505)), ['a', 'large'])
+        grid.remove('large')
+        grid.remove('unknown')
+        self.assertEqual(grid.query(505, 505), ['a'])
+        self.assertFalse('large' in grid)
+        grid.remove('b')
+        self.assertEqual(grid.query(150, 150), [])
+        self.assertEqual(len(grid), 2)
+        grid.clear()
+        self.assertEqual(grid.query(505, 505), [])
+        self.assertEqual(len(grid), 0)
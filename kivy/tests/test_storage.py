@@ -4,6 +4,85 @@ Storage tests
 '''
 
 import unittest
+from fnmatch import fnmatch
+
+
+class FakeRedis(object):
+    # the commands of redis.StrictRedis used by the RedisStore, on a dict
+
+    db = {}
+
+    def __init__(self, **kwargs):
+        self.commands = []
+
+    def _log(self, name):
+        self.commands.append(name)
+
+    def exists(self, key):
+        self._log('exists')
+        return key in self.db
+
+    def keys(self, pattern):
+        self._log('keys')
+        return [key for key in self.db if fnmatch(key, pattern)]
+
+    def delete(self, *keys):
+        self._log('delete')
+        return len([key for key in keys if self.db.pop(key, None)])
+
+    def hset(self, key, field, value):
+        self._log('hset')
+        self.db.setdefault(key, {})[field] = value
+
+    def hgetall(self, key):
+        self._log('hgetall')
+        return dict(self.db.get(key, {}))
+
+    def hmget(self, key, fields):
+        self._log('hmget')
+        entry = self.db.get(key, {})
+        return [entry.get(field) for field in fields]
+
+    def sadd(self, key, *members):
+        self._log('sadd')
+        self.db.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        self._log('srem')
+        values = self.db.get(key, set())
+        values.difference_update(members)
+        if not values:
+            self.db.pop(key, None)
+
+    def smembers(self, key):
+        self._log('smembers')
+        return set(self.db.get(key, ()))
+
+    def sinter(self, keys):
+        self._log('sinter')
+        result = set(self.db.get(keys[0], ()))
+        for key in keys[1:]:
+            result &= self.db.get(key, set())
+        return result
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline(object):
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.queued.append((name, args))
+        return queue
+
+    def execute(self, raise_on_error=True):
+        queued, self.queued = self.queued, []
+        return [getattr(self.redis, name)(*args) for name, args in queued]
 
 
 class StorageTestCase(unittest.TestCase):
@@ -26,6 +105,232 @@ class StorageTestCase(unittest.TestCase):
         finally:
             unlink(tmpfn)
 
+    def test_json_storage_journal(self):
+        from kivy.storage.jsonstore import JsonStore
+        from tempfile import mkstemp
+        from os import unlink, close
+        from os.path import exists
+
+        try:
+            tmpfd, tmpfn = mkstemp('.json')
+            close(tmpfd)
+            self._do_store_test_empty(JsonStore(tmpfn, journal=True))
+            self._do_store_test_filled(JsonStore(tmpfn, journal=True))
+
+            # one journal line per batch
+            store = JsonStore(tmpfn, journal=True, fsync=False)
+            with store.batch():
+                for i in range(10):
+                    store.put('item%d' % i, value=i)
+                with store.batch():
+                    store.delete('item0')
+                self.assertEqual(store.count(), 12)
+            with open(store.journal_filename, 'rb') as fd:
+                lines = fd.read().splitlines()
+            store.put('item1', value=-1)
+            self.assertEqual(len(lines) + 1, len(
+                open(store.journal_filename, 'rb').read().splitlines()))
+
+            # an interrupted write is ignored, and removed from the journal
+            with open(store.journal_filename, 'ab') as fd:
+                fd.write(b'{"put":{"item2":{"val')
+            store = JsonStore(tmpfn, journal=True)
+            self.assertEqual(store.count(), 12)
+            self.assertFalse(store.exists('item0'))
+            self.assertEqual(store.get('item1'), {'value': -1})
+            self.assertEqual(store.get('item2'), {'value': 2})
+            store.put('item2', value=-2)
+            self.assertEqual(JsonStore(tmpfn).get('item2'), {'value': -2})
+
+            # the compaction writes everything in the json file
+            store.compact()
+            self.assertFalse(exists(store.journal_filename))
+            store = JsonStore(tmpfn)
+            self.assertEqual(store.count(), 12)
+            self.assertEqual(store.get('item2'), {'value': -2})
+
+            # the journal is closed after each write: once removed, it is
+            # created again by the next write
+            store = JsonStore(tmpfn, journal=True)
+            store.put('item3', value=3)
+            unlink(store.journal_filename)
+            store.put('item4', value=4)
+            self.assertEqual(JsonStore(tmpfn).get('item4'), {'value': 4})
+        finally:
+            unlink(tmpfn)
+            if exists(tmpfn + '.journal'):
+                unlink(tmpfn + '.journal')
+
+    def test_threaded_storage(self):
+        from kivy.storage.dictstore import DictStore
+        from kivy.clock import Clock
+        from threading import current_thread
+        from time import time
+
+        threads = set()
+
+        class ThreadedStore(DictStore):
+            def store_get(self, key):
+                threads.add(current_thread())
+                return super(ThreadedStore, self).store_get(key)
+
+        store = ThreadedStore({}, threaded=True)
+        results = []
+
+        def callback(store, key, result):
+            results.append((key, result, current_thread()))
+
+        for i in range(20):
+            store.async_put(callback, 'key%d' % (i % 5), value=i)
+            store.async_get(callback, 'key%d' % (i % 5))
+        store.async_delete(callback, 'key0')
+        store.async_get(callback, 'key0')
+        start = time()
+        while len(results) < 42 and time() - start < 5:
+            Clock.tick()
+        self.assertEqual(len(results), 42)
+
+        # the requests are run in order, in the thread of the store, and the
+        # callbacks are called in the main thread
+        for i in range(20):
+            self.assertEqual(results[i * 2][:2], ('key%d' % (i % 5), True))
+            self.assertEqual(results[i * 2 + 1][:2],
+                             ('key%d' % (i % 5), {'value': i}))
+        self.assertEqual(results[-2][:2], ('key0', True))
+        self.assertEqual(results[-1][:2], ('key0', None))
+        main = current_thread()
+        self.assertTrue(all(result[2] is main for result in results))
+        self.assertTrue(threads and main not in threads)
+        self.assertEqual(store.get('key1'), {'value': 16})
+
+    def test_threaded_storage_errors(self):
+        from kivy.storage.dictstore import DictStore
+        from kivy.clock import Clock
+        from time import time
+
+        class FailingStore(DictStore):
+            def store_find(self, filters):
+                yield 'key', {'value': 1}
+                raise IOError()
+
+            def store_clear(self):
+                raise IOError()
+
+            def store_count_async(self, callback):
+                raise IOError()
+
+        store = FailingStore({}, threaded=True)
+        results = []
+
+        def callback(store, *args):
+            results.append(args)
+
+        store.async_find(callback, value=1)
+        store.async_clear(callback)
+        store.async_count(callback)
+        store.async_put(callback, 'key', value=1)
+        start = time()
+        while len(results) < 5 and time() - start < 5:
+            Clock.tick()
+        # each failure is reported to its callback, and the next requests
+        # are run
+        filters = {'value': 1}
+        self.assertEqual(results, [
+            (filters, 'key', {'value': 1}), (filters, None, None), (),
+            (0, ), ('key', True)])
+
+    def test_threaded_storage_collected(self):
+        import gc
+        from kivy.storage.dictstore import DictStore
+        from kivy.clock import Clock
+        from time import time
+
+        store = DictStore({}, threaded=True)
+        results = []
+        store.async_put(lambda *args: results.append(args[2]), 'key', a=1)
+        start = time()
+        while not results and time() - start < 5:
+            Clock.tick()
+        self.assertEqual(results, [True])
+
+        # the thread of the store stops when the store is collected
+        thread = store._worker.thread
+        del store
+        gc.collect()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_indexed_storage(self):
+        from kivy.storage.dictstore import DictStore
+        from kivy.storage.jsonstore import JsonStore
+        from tempfile import mkstemp
+        from os import unlink, close
+
+        data = {}
+        self._do_store_test_empty(DictStore(data, indexes=['attr1']))
+        self._do_store_test_filled(DictStore(data, indexes=['name']))
+        self._do_store_test_indexes(DictStore(data, indexes=['category']))
+
+        try:
+            tmpfd, tmpfn = mkstemp('.json')
+            close(tmpfd)
+            store = JsonStore(tmpfn, indexes=['category', 'value'])
+            self._do_store_test_indexes(store)
+            # the indexes are built when the store is loaded
+            store = JsonStore(tmpfn, indexes=['category'])
+            self.assertEqual(store._lookup_index({'category': 'c1'}),
+                             ['item7'])
+            self.assertEqual(list(store.find(category='c1')),
+                             [('item7', {'category': 'c1', 'value': 7})])
+        finally:
+            unlink(tmpfn)
+
+    def test_redis_storage_indexes(self):
+        import sys
+        from types import ModuleType
+
+        fake = ModuleType('redis')
+        fake.StrictRedis = FakeRedis
+        fake.RedisError = Exception
+        FakeRedis.db = {}
+        modules = sys.modules
+        saved = modules.get('redis')
+        imported = 'kivy.storage.redisstore' in modules
+        modules['redis'] = fake
+        try:
+            from kivy.storage import redisstore
+            redisstore.redis = fake
+            RedisStore = redisstore.RedisStore
+            self._do_store_test_empty(RedisStore({}, indexes=['attr1']))
+            self._do_store_test_filled(RedisStore({}, indexes=['attr1']))
+            store = RedisStore({}, indexes=['category', 'value'])
+            self._do_store_test_indexes(store)
+
+            # the keys are not scanned to find an indexed value
+            store = RedisStore({}, prefix='other')
+            for i in range(10):
+                store.put('item%d' % i, category=i % 2)
+            store.indexes = ['category']
+            del store.r.commands[:]
+            self.assertEqual(sorted(key for key, entry in
+                                    store.find(category=1)),
+                             ['item1', 'item3', 'item5', 'item7', 'item9'])
+            self.assertEqual(store.r.commands,
+                             ['sinter'] + ['hgetall'] * 5)
+            store.indexes = []
+            self.assertEqual(
+                [key for key in FakeRedis.db if key.startswith('other.i.')],
+                [])
+        finally:
+            if saved is None:
+                del modules['redis']
+            else:
+                modules['redis'] = saved
+            if not imported:
+                del modules['kivy.storage.redisstore']
+            else:
+                redisstore.redis = saved
+
     def test_redis_storage(self):
         try:
             from kivy.storage.redisstore import RedisStore
@@ -77,3 +382,26 @@ class StorageTestCase(unittest.TestCase):
         self.assertTrue(store.delete('plop'))
         self.assertRaises(KeyError, lambda: store.delete('plop'))
         self.assertRaises(KeyError, lambda: store.get('plop'))
+
+    def _do_store_test_indexes(self, store):
+        store.clear()
+        for i in range(30):
+            store.put('item%d' % i, category='c%d' % (i % 3), value=i,
+                      tags=[i % 2])
+        self.assertEqual(
+            sorted(key for key, entry in store.find(category='c1')),
+            sorted('item%d' % i for i in range(1, 30, 3)))
+        store.put('item1', category='c2', value=1)
+        store.delete('item4')
+        self.assertEqual(list(store.find(category='c1', value=7)),
+                         [('item7', {'category': 'c1', 'value': 7,
+                                     'tags': [1]})])
+        self.assertEqual(len(list(store.find(category='c1'))), 8)
+        self.assertEqual(len(list(store.find(category='c2'))), 11)
+        self.assertEqual(len(list(store.find(category='c1', tags=[0]))), 4)
+        self.assertEqual(list(store.find(category='c3')), [])
+        self.assertEqual(list(store.find(value=4)), [])
+        for i in range(30):
+            if i != 7 and store.exists('item%d' % i):
+                store.delete('item%d' % i)
+        store.put('item7', category='c1', value=7)
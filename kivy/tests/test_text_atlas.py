@@ -0,0 +1,113 @@
+'''
+Glyph atlas tests
+=================
+'''
+
+import unittest
+
+
+class GlyphAtlasTestCase(unittest.TestCase):
+
+    def overlap(self, a, b):
+        return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+                a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+    def test_add_and_grow(self):
+        from kivy.core.text.text_atlas import GlyphAtlas
+        atlas = GlyphAtlas(size=(32, 32), max_size=(128, 64))
+        data = bytearray(b'\x01\x02\x03\x04' * (10 * 12))
+        boxes = {}
+        for i in range(30):
+            boxes[i] = atlas.add(i, 10, 12, data)
+        self.assertEqual(atlas.size, (128, 64))
+        self.assertEqual(atlas.version, 3)
+        # the glyphs don't move when the atlas grows
+        for key, box in boxes.items():
+            self.assertEqual(atlas.get(key), box)
+            x, y, w, h = box
+            self.assertTrue(x + w <= 128 and y + h <= 64)
+        values = list(boxes.values())
+        for i, a in enumerate(values):
+            for b in values[i + 1:]:
+                self.assertFalse(self.overlap(a, b))
+        # the pixels are copied in the atlas
+        x, y, w, h = boxes[0]
+        offset = (y * 128 + x) * 4
+        self.assertEqual(atlas._buffer[offset:offset + 4], b'\x01\x02\x03\x04')
+        u, v, u2, v2 = atlas.uvs(boxes[0])
+        self.assertEqual((u, u2), (x / 128., (x + 10) / 128.))
+        self.assertEqual((v, v2), ((y + 12) / 64., y / 64.))
+
+        self.assertRaises(ValueError, atlas.add, 'big', 200, 10)
+        atlas.clear()
+        self.assertEqual(atlas.size, (32, 32))
+        self.assertEqual(atlas.get(0), None)
+        self.assertEqual(atlas.version, 4)
+
+
+class LabelAtlasTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.core.text import LabelBase
+        from kivy.core.image import ImageData
+
+        class FakeLabel(LabelBase):
+            # every glyph is 8x16 pixels
+            rendered = []
+
+            def get_extents(self, text):
+                return len(text) * 8, 16
+
+            def _render_begin(self):
+                self._text_rendered = u''
+
+            def _render_text(self, text, x, y):
+                self._text_rendered += text
+
+            def _render_end(self):
+                FakeLabel.rendered.append(self._text_rendered)
+                w, h = self._size
+                return ImageData(w, h, 'rgba', b'\xff' * (w * h * 4))
+
+        self.provider = FakeLabel
+
+    def test_quads(self):
+        from kivy.core.text.text_atlas import LabelAtlas
+        provider = self.provider
+        label = LabelAtlas(text=u'ab a', provider=provider, font_size=31)
+        label.refresh()
+        self.assertEqual(label.texture, None)
+        self.assertEqual(label.size, (32, 16))
+        quads = label.get_quads()
+        self.assertEqual([q[:4] for q in quads],
+                         [(0, 0, 8, 16), (8, 0, 8, 16), (24, 0, 8, 16)])
+        atlas = label.atlas
+        self.assertEqual(quads[0][4:], atlas.uvs(atlas.get(u'a')))
+        self.assertEqual(quads[2][4:], quads[0][4:])
+
+        # the glyphs are rendered once, for all the labels of the same font
+        self.assertEqual(sorted(provider.rendered), [u'a', u'b'])
+        other = LabelAtlas(text=u'ba\nc', provider=provider, font_size=31)
+        other.refresh()
+        self.assertTrue(other.atlas is atlas)
+        self.assertEqual(sorted(provider.rendered), [u'a', u'b', u'c'])
+        self.assertEqual([q[:4] for q in other.get_quads()],
+                         [(0, 16, 8, 16), (8, 16, 8, 16), (0, 0, 8, 16)])
+
+        vertices, indices = label.get_mesh(x=100, y=50)
+        self.assertEqual(len(vertices), 3 * 16)
+        self.assertEqual(indices[:12], [0, 1, 2, 2, 3, 0, 4, 5, 6, 6, 7, 4])
+        self.assertEqual(vertices[:4], [100, 50] + list(quads[0][4:6]))
+
+    def test_change_text(self):
+        from kivy.core.text.text_atlas import LabelAtlas
+        provider = self.provider
+        label = LabelAtlas(text=u'12', provider=provider, font_size=32,
+                           text_size=(100, None), halign='right')
+        label.refresh()
+        del provider.rendered[:]
+        label.text = u'21'
+        label.refresh()
+        quads = label.get_quads()
+        self.assertEqual(provider.rendered, [])
+        self.assertEqual([q[0] for q in quads], [84, 92])
@@ -0,0 +1,70 @@
+'''
+Text buffer tests
+=================
+'''
+
+import unittest
+from random import Random
+
+
+class LineIndexTestCase(unittest.TestCase):
+
+    def check(self, index, lengths):
+        self.assertEqual(len(index), len(lengths))
+        self.assertEqual(list(index), lengths)
+        self.assertEqual(index.total, sum(lengths))
+        total = 0
+        for row, length in enumerate(lengths):
+            self.assertEqual(index.start_of(row), total)
+            total += length
+        self.assertEqual(index.start_of(len(lengths)), total)
+        # find() returns the first line where the running sum reaches the
+        # index
+        for value in range(-1, total + 2):
+            running = 0
+            expected = len(lengths) - 1 if lengths else 0
+            for row, length in enumerate(lengths):
+                running += length
+                if running >= value:
+                    expected = row
+                    break
+            if value <= 0:
+                expected = 0
+            self.assertEqual(index.find(value), expected)
+
+    def test_basic(self):
+        from kivy.textbuffer import LineIndex
+        index = LineIndex([5, 6, 1])
+        self.check(index, [5, 6, 1])
+        index[1] = 2
+        self.check(index, [5, 2, 1])
+        self.assertEqual(index[-1], 1)
+        index.splice(1, 2, [3, 0, 4])
+        self.check(index, [5, 3, 0, 4, 1])
+        index.splice(0, 5, [])
+        self.check(index, [])
+        index.splice(0, 0, [2, 2])
+        self.check(index, [2, 2])
+        self.assertRaises(IndexError, index.__getitem__, 2)
+
+    def test_random_splices(self):
+        from kivy.textbuffer import LineIndex
+        random = Random(0)
+
+        class SmallLineIndex(LineIndex):
+            block_size = 4
+
+        lengths = [random.randint(0, 5) for x in range(50)]
+        index = SmallLineIndex(lengths)
+        self.check(index, lengths)
+        for x in range(300):
+            start = random.randint(0, len(lengths))
+            finish = random.randint(start, min(len(lengths), start + 12))
+            new = [random.randint(0, 5)
+                   for y in range(random.choice((0, 1, 2, 20)))]
+            lengths[start:finish] = new
+            index.splice(start, finish, new)
+            if lengths:
+                row = random.randint(0, len(lengths) - 1)
+                lengths[row] = index[row] = random.randint(0, 5)
+            self.check(index, lengths)
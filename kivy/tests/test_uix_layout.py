@@ -0,0 +1,129 @@
+'''
+Layout manager tests
+====================
+'''
+
+import unittest
+
+
+class LayoutManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.uix.layout import Layout, LayoutManager
+
+        self.manager = LayoutManager
+        self.ran = ran = []
+
+        class Recorder(Layout):
+            # lay out the children like a box, record the passes
+            def __init__(self, **kwargs):
+                super(Recorder, self).__init__(**kwargs)
+                self.bind(size=self._trigger_layout,
+                          children=self._trigger_layout)
+
+            def do_layout(self, *largs):
+                ran.append(self)
+                for child in self.children:
+                    child.size = self.width / 2., self.height / 2.
+
+        self.cls = Recorder
+
+    def tree(self):
+        root = self.cls(size=(400, 400))
+        mid = self.cls()
+        leaf = self.cls()
+        root.add_widget(mid)
+        mid.add_widget(leaf)
+        self.manager.process()
+        self.manager.reset_counters()
+        del self.ran[:]
+        return root, mid, leaf
+
+    def test_top_down(self):
+        manager = self.manager
+        root, mid, leaf = self.tree()
+        self.assertEqual((mid.size, leaf.size), ([200, 200], [100, 100]))
+
+        leaf._trigger_layout()
+        mid._trigger_layout()
+        root._trigger_layout()
+        manager.process()
+        # each layout runs once, from the root to the leaves
+        self.assertEqual(self.ran, [root, mid, leaf])
+        self.assertEqual(manager.passes, 3)
+
+        # the size of the root changes the size of mid, which changes the
+        # size of leaf: everything is done in the same pass
+        del self.ran[:]
+        root.size = (800, 800)
+        manager.process()
+        self.assertEqual(self.ran, [root, mid, leaf])
+        self.assertEqual(leaf.size, [200, 200])
+        self.assertEqual(manager.passes, 3)
+        manager.process()
+        self.assertEqual(self.ran, [root, mid, leaf])
+        self.assertEqual((manager.total_passes, manager.frames), (6, 2))
+
+    def test_retrigger(self):
+        manager = self.manager
+        root, mid, leaf = self.tree()
+
+        # a layout triggered again during the pass runs again, before the
+        # deeper layouts
+        def resized(*largs):
+            leaf.unbind(size=resized)
+            root._trigger_layout()
+        leaf.bind(size=resized)
+        root.size = (800, 800)
+        manager.process()
+        self.assertEqual(self.ran, [root, mid, root, leaf])
+        self.assertEqual(manager.passes, 4)
+
+    def test_self_resize(self):
+        from kivy.uix.stacklayout import StackLayout
+        from kivy.uix.widget import Widget
+        manager = self.manager
+
+        # the layout changes its own height after placing its children from
+        # its top: it runs again in the same pass, with its new height
+        layout = StackLayout(size_hint_y=None, width=100, height=100)
+        layout.bind(minimum_height=layout.setter('height'))
+        for i in range(4):
+            layout.add_widget(Widget(size_hint=(None, None), size=(100, 50)))
+        manager.process()
+        self.assertEqual(layout.height, 200)
+        self.assertEqual([child.top for child in reversed(layout.children)],
+                         [200, 150, 100, 50])
+        self.assertEqual(manager.passes, 2)
+
+        # the changes done to the children only don't run it again
+        manager.process()
+        layout._trigger_layout()
+        manager.process()
+        self.assertEqual(manager.passes, 1)
+
+    def test_max_passes(self):
+        from kivy.clock import Clock
+        manager = self.manager
+        root, mid, leaf = self.tree()
+
+        # mid and leaf trigger each other forever: they are stopped after
+        # max_passes
+        def ping(*largs):
+            self.ran.append(mid)
+            leaf._trigger_layout()
+
+        def pong(*largs):
+            self.ran.append(leaf)
+            mid._trigger_layout()
+        mid.do_layout = ping
+        leaf.do_layout = pong
+        mid._trigger_layout()
+        manager.process()
+        self.assertEqual(self.ran, [mid, leaf] * manager.max_passes)
+        self.assertEqual(manager.passes, manager.max_passes * 2)
+        # mid continues at the next frame
+        del self.ran[:]
+        del mid.do_layout, leaf.do_layout
+        Clock.tick()
+        self.assertEqual(self.ran, [mid])
@@ -0,0 +1,150 @@
+'''
+TextInput tests
+===============
+'''
+
+import unittest
+
+
+class TextInputLinesTestCase(unittest.TestCase):
+
+    def large_textinput(self, lines=5000, **kwargs):
+        from kivy.uix.textinput import TextInput
+        ti = TextInput(size=(300, 200), **kwargs)
+        ti.text = u'\n'.join(u'line %d' % x for x in range(lines))
+        ti.cursor = (0, 0)
+        ti.scroll_x = ti.scroll_y = 0
+        return ti
+
+    def labelled(self, ti):
+        return [line_num for line_num, label in enumerate(ti._lines_labels)
+                if label is not None]
+
+    def visible_lines(self, ti):
+        return int(ti.height / (ti.line_height + ti.line_spacing)) + 2
+
+    def scroll_to(self, ti, line_num):
+        ti.scroll_y = line_num * (ti.line_height + ti.line_spacing)
+        ti._update_graphics()
+
+    def test_lazy_labels(self):
+        ti = self.large_textinput()
+        visible = self.visible_lines(ti)
+        self.scroll_to(ti, 0)
+        labelled = self.labelled(ti)
+        self.assertTrue(0 < len(labelled) <= visible)
+        self.assertTrue(labelled[-1] <= visible)
+
+        # only the lines around the viewport get a label
+        self.scroll_to(ti, 2500)
+        labelled = [x for x in self.labelled(ti) if x > visible]
+        self.assertTrue(labelled)
+        self.assertTrue(len(labelled) <= visible)
+        for line_num in labelled:
+            self.assertTrue(2499 <= line_num <= 2500 + visible)
+
+    def test_evict_bounded(self):
+        ti = self.large_textinput(lines_pool_size=20)
+        visible = self.visible_lines(ti)
+        # the lines outside of the viewport and its margins are evicted once
+        # lines_pool_size labels have been created, see _evict_lines()
+        bound = ti.lines_pool_size + 4 * visible
+        inserted = False
+        for line_num in range(0, 4000, visible // 2):
+            if line_num >= 2000 and not inserted:
+                # lines inserted in the middle of the viewport move the
+                # following labels
+                ti.cursor = (0, line_num)
+                ti.insert_text(u'new\nlines\n')
+                inserted = True
+            self.scroll_to(ti, line_num)
+            labelled = self.labelled(ti)
+            self.assertTrue(len(labelled) <= bound)
+            self.assertTrue(len(ti._lines_rects_pool) <= ti.lines_pool_size)
+        # the lines of the viewport still have their label
+        self.assertTrue(set(range(line_num + 1, line_num + visible - 2)) <=
+                        set(labelled))
+
+
+class TextInputWidthsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.uix.textinput import TextInput
+        self.ti = ti = TextInput(size=(400, 300))
+        ti.text = u'\n'.join((
+            u'The quick brown fox',
+            u'\tjumps over',
+            u'',
+            u'the lazy dog, WWWW iiii',
+            u'x' * 80))
+
+    def text_width(self, text):
+        ti = self.ti
+        return ti._get_text_width(text, ti.tab_width, ti._label_cached)
+
+    def linear_cursor_from_xy(self, x, y):
+        # the search of the column before the binary search of the prefixes
+        ti = self.ti
+        row = ti.get_cursor_from_xy(x, y)[1]
+        line = ti._lines[row]
+        cx = x - ti.x
+        col = 0
+        for i in range(1, len(line) + 1):
+            if (self.text_width(line[:i]) + ti.padding[0] >=
+                    cx + ti.scroll_x):
+                break
+            col = i
+        return col, row
+
+    def check_offsets(self):
+        ti = self.ti
+        for row, line in enumerate(ti._lines):
+            for col in range(len(line) + 1):
+                ti.cursor = (col, row)
+                self.assertEqual(ti.cursor_offset(),
+                                 self.text_width(line[:col]) if col else 0)
+
+    def test_cursor_from_xy(self):
+        ti = self.ti
+        dy = ti.line_height + ti.line_spacing
+        for scroll_x in (0, 37):
+            ti.scroll_x = scroll_x
+            for row in range(len(ti._lines)):
+                y = ti.top - ti.padding[1] - row * dy - dy / 2.
+                for x in range(int(ti.x) - 5, int(ti.right) + 5, 3):
+                    self.assertEqual(ti.get_cursor_from_xy(x, y),
+                                     self.linear_cursor_from_xy(x, y))
+
+    def test_cursor_offset(self):
+        self.check_offsets()
+
+    def test_set_line_text(self):
+        ti = self.ti
+        self.check_offsets()
+        ti._set_line_text(0, u'WWW')
+        self.assertEqual(ti._lines_widths[0], None)
+        self.check_offsets()
+
+    def test_insert_lines(self):
+        ti = self.ti
+        self.check_offsets()
+        ti.cursor = (3, 0)
+        ti.insert_text(u'iii\nWWWWW\n')
+        self.assertEqual(ti._lines_widths[1], None)
+        self.check_offsets()
+
+    def test_delete_line(self):
+        ti = self.ti
+        self.check_offsets()
+        ti._delete_line(1)
+        self.assertEqual(ti._lines[1], u'')
+        self.check_offsets()
+
+    def test_font_size(self):
+        ti = self.ti
+        self.check_offsets()
+        ti.font_size = ti.font_size * 2
+        self.assertEqual(ti._lines_widths, [None] * len(ti._lines))
+        # the line options are updated on the next frame
+        ti._refresh_line_options()
+        self.check_offsets()
@@ -3,16 +3,24 @@ UrlRequest tests
 ================
 '''
 
+import os
 import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
 
 try:
     # py3k
     import _thread
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
 except ImportError:
     # py27
     import thread as _thread
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
 
-from kivy.network.urlrequest import UrlRequest
+from kivy.network.urlrequest import UrlRequest, UrlRequestEngine
 from time import sleep
 from kivy.clock import Clock
 
@@ -64,3 +72,144 @@ class UrlRequestTest(unittest.TestCase):
 
         self.assertEqual(self.queue[0][2][0], 0)
         self.assertEqual(self.queue[-2][2][0], self.queue[-2][2][1])
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # send the headers and the body without waiting for an ack
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        content_type = 'text/plain'
+        if self.path == '/big':
+            body = b'0123456789' * 10000
+        elif self.path == '/json':
+            body = b'{"items": [1, 2]}'
+            content_type = 'application/json'
+        else:
+            body = self.path.encode('utf-8')
+        self.send_response(404 if self.path == '/missing' else 200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *largs):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+
+class LocalUrlRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        thread = Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.engine = UrlRequest.engine
+        UrlRequest.engine = UrlRequestEngine(max_workers=2)
+        self.results = []
+
+    def tearDown(self):
+        UrlRequest.engine.pool.clear()
+        UrlRequest.engine = self.engine
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _on_success(self, req, result):
+        self.results.append(('success', req, result))
+
+    def _on_failure(self, req, result):
+        self.results.append(('failure', req, result))
+
+    def _on_error(self, req, error):
+        self.results.append(('error', req, error))
+
+    def _on_progress(self, req, current, total):
+        self.results.append(('progress', current, total))
+
+    def test_engine(self):
+        requests = [UrlRequest(self.url + '/item/%d' % i,
+                               on_success=self._on_success, timeout=5)
+                    for i in range(20)]
+        for i in range(100):
+            Clock.tick()
+            if all(req.is_finished for req in requests):
+                break
+            sleep(.05)
+        self.assertEqual(sorted(result for kind, req, result in self.results),
+                         sorted('/item/%d' % i for i in range(20)))
+        for req in requests:
+            self.assertEqual(req.resp_status, 200)
+            self.assertEqual(req.result, req.url[len(self.url):])
+
+        # the requests share the workers and the connections
+        engine = UrlRequest.engine
+        self.assertEqual(engine.num_workers, 2)
+        self.assertTrue(engine.pool.connections_created <= 2)
+        self.assertEqual(engine.pool.connections_reused,
+                         20 - engine.pool.connections_created)
+        Clock.tick()
+        self.assertEqual(engine._active, [])
+
+    def test_wait(self):
+        req = UrlRequest(self.url + '/json', on_success=self._on_success)
+        req.wait()
+        self.assertEqual(req.result, {'items': [1, 2]})
+        self.assertEqual(self.results, [('success', req, req.result)])
+
+        req = UrlRequest(self.url + '/missing', on_failure=self._on_failure)
+        req.wait()
+        self.assertEqual(req.resp_status, 404)
+        self.assertEqual(self.results[-1], ('failure', req, '/missing'))
+
+        # nobody is listening on this port anymore
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        url = 'http://127.0.0.1:%d/' % server.server_address[1]
+        server.server_close()
+        req = UrlRequest(url, on_error=self._on_error, timeout=5)
+        req.wait()
+        self.assertEqual(req.resp_status, None)
+        self.assertTrue(req.error is not None)
+        self.assertEqual(self.results[-1], ('error', req, req.error))
+
+    def test_thread_compatibility(self):
+        # the methods of the Thread the request was are still there
+        req = UrlRequest(self.url + '/json', on_success=self._on_success)
+        self.assertTrue(req.daemon)
+        self.assertTrue(req.name.startswith('UrlRequest-'))
+        req.join(5)
+        self.assertFalse(req.is_alive())
+        # the callbacks are dispatched later, in the main thread
+        self.assertFalse(req.is_finished)
+        self.assertEqual(self.results, [])
+        req.wait()
+        self.assertEqual(req.resp_status, 200)
+        self.assertEqual(self.results, [('success', req, req.result)])
+
+    def test_progress_file(self):
+        tmpdir = mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'big.txt')
+            req = UrlRequest(self.url + '/big', on_progress=self._on_progress,
+                             file_path=filename, chunk_size=4096)
+            req.wait()
+            with open(filename, 'rb') as fd:
+                self.assertEqual(fd.read(), b'0123456789' * 10000)
+        finally:
+            rmtree(tmpdir)
+        progress = self.results
+        self.assertEqual(progress[0], ('progress', 0, 100000))
+        self.assertEqual(progress[-1], ('progress', 100000, 100000))
+        self.assertTrue(len(progress) > 20)
+
+        # without file, the chunks are gathered in the result
+        req = UrlRequest(self.url + '/big', on_progress=self._on_progress,
+                         decode=False)
+        req.wait()
+        self.assertEqual(req.result, b'0123456789' * 10000)
@@ -64,3 +64,64 @@ class WidgetTestCase(unittest.TestCase):
         self.assertEqual(wid.collide_point(100, 100), True)
         self.assertEqual(wid.collide_point(200, 0), False)
         self.assertEqual(wid.collide_point(500, 500), False)
+
+    def test_touch_index(self):
+        received = []
+
+        class Touch(object):
+            def __init__(self, x, y):
+                self.x, self.y = self.pos = x, y
+
+        class Recorder(self.cls):
+            def on_touch_down(self, touch):
+                received.append(self)
+
+            def on_touch_move(self, touch):
+                received.append(self)
+
+        class Round(Recorder):
+            def collide_point(self, x, y):
+                return (x - self.center_x) ** 2 + (y - self.center_y) ** 2 \
+                    <= (self.width / 2.) ** 2
+
+        def touched(x, y, event='on_touch_down'):
+            del received[:]
+            root.dispatch(event, Touch(x, y))
+            return received[:]
+
+        root = self.root
+        a = Recorder(pos=(0, 0), size=(100, 100))
+        b = Recorder(pos=(50, 50), size=(100, 100))
+        c = Recorder(pos=(1000, 1000), size=(10, 10))
+        round = Round(pos=(2000, 2000))
+        for wid in (a, b, round):
+            root.add_widget(wid)
+        root.touch_index = True
+        root.add_widget(c, index=1)
+        self.assertEqual(root.children, [round, c, b, a])
+
+        # round overrides collide_point, it always receives the touch
+        self.assertEqual(touched(75, 75), [round, b, a])
+        self.assertEqual(touched(10, 10), [round, a])
+        self.assertEqual(touched(1005, 1005), [round, c])
+        self.assertEqual(touched(500, 500), [round])
+        self.assertEqual(touched(75, 75, 'on_touch_move'), [round, b, a])
+        root.remove_widget(round)
+
+        # the index follows the children
+        a.pos = (1000, 1000)
+        self.assertEqual(touched(10, 10, 'on_touch_move'), [])
+        self.assertEqual(touched(1005, 1005, 'on_touch_move'), [c, a])
+        c.size = (1, 1)
+        self.assertEqual(touched(1005, 1005, 'on_touch_move'), [a])
+        root.remove_widget(a)
+        self.assertEqual(touched(1005, 1005, 'on_touch_move'), [])
+        root.remove_widget(b)
+        root.add_widget(b, index=1)
+        self.assertEqual(touched(75, 75, 'on_touch_move'), [b])
+
+        # without the index, all the children receive the touch
+        root.touch_index = False
+        self.assertEqual(touched(75, 75), [c, b])
+        a.pos = (0, 0)
+        self.assertEqual(touched(10, 10, 'on_touch_move'), [c, b])
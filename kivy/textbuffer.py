@@ -0,0 +1,233 @@
+'''
+Text buffer
+===========
+
+.. versionadded:: 1.8.1
+
+This module contains the data structures used by the
+:class:`~kivy.uix.textinput.TextInput` to handle large documents.
+
+The :class:`LineIndex` stores the length of every line of a document, and
+converts between a line number and a text index in logarithmic time::
+
+    >>> from kivy.textbuffer import LineIndex
+    >>> lines = LineIndex([5, 6, 1])   # 'hello\\nworld\\n'
+    >>> lines.start_of(2)
+    11
+    >>> lines.find(8)
+    1
+    >>> lines.splice(1, 2, [3, 4])     # replace the second line by two lines
+    >>> len(lines), lines.total
+    (4, 13)
+
+The lines are kept in blocks of at most :attr:`LineIndex.block_size` lines.
+The sums of the blocks are indexed by `Fenwick trees
+<http://en.wikipedia.org/wiki/Fenwick_tree>`_. This makes every operation
+cost O(log(n) + block_size), whatever the number of lines of the document.
+'''
+
+__all__ = ('LineIndex', )
+
+
+class _Fenwick(object):
+    # Fenwick tree (binary indexed tree) of integers, for prefix sums
+
+    __slots__ = ('tree', 'size', 'top')
+
+    def __init__(self, values):
+        super(_Fenwick, self).__init__()
+        self.size = size = len(values)
+        self.tree = tree = [0] + list(values)
+        for i in range(1, size + 1):
+            j = i + (i & -i)
+            if j <= size:
+                tree[j] += tree[i]
+        top = 1
+        while top * 2 <= size:
+            top *= 2
+        self.top = top
+
+    def add(self, i, delta):
+        # add delta to the value i
+        tree = self.tree
+        size = self.size
+        i += 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # sum of the first i values
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, value):
+        # return (i, rest): i is the first value where the running sum
+        # reaches value, and rest is value minus the sum of the values
+        # before i. If value is never reached, i is the number of values.
+        tree = self.tree
+        size = self.size
+        pos = 0
+        step = self.top
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] < value:
+                pos = nxt
+                value -= tree[nxt]
+            step //= 2
+        return pos, value
+
+
+class LineIndex(object):
+    '''Index of the lengths of the lines of a document.
+
+    :Parameters:
+        `lengths`: list of int, defaults to []
+            Initial length of each line. The length of a line must include
+            the newline character that separates it from the previous line,
+            if any.
+    '''
+
+    #: Maximum number of lines per block, before it gets split
+    block_size = 128
+
+    def __init__(self, lengths=None):
+        super(LineIndex, self).__init__()
+        self.reset(lengths or [])
+
+    def reset(self, lengths):
+        '''Replace all the lines of the index by new ones.
+        '''
+        size = self.block_size // 2
+        self._blocks = [list(lengths[i:i + size])
+                        for i in range(0, len(lengths), size)]
+        self._rebuild()
+
+    def _rebuild(self):
+        blocks = self._blocks
+        self._counts = _Fenwick([len(x) for x in blocks])
+        self._sums = _Fenwick([sum(x) for x in blocks])
+        self._count = sum(len(x) for x in blocks)
+        self._total = sum(sum(x) for x in blocks)
+
+    def __len__(self):
+        return self._count
+
+    def _get_total(self):
+        return self._total
+
+    total = property(_get_total, doc='''Sum of the lengths of all the lines,
+    i.e. the length of the document.''')
+
+    def _locate(self, row):
+        # return the block and the offset of a line in it
+        block, rest = self._counts.search(row + 1)
+        if block >= len(self._blocks):
+            raise IndexError('line index out of range')
+        return block, rest - 1
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._count
+        if row < 0:
+            raise IndexError('line index out of range')
+        block, offset = self._locate(row)
+        return self._blocks[block][offset]
+
+    def __setitem__(self, row, length):
+        if row < 0:
+            row += self._count
+        if row < 0:
+            raise IndexError('line index out of range')
+        block, offset = self._locate(row)
+        values = self._blocks[block]
+        delta = length - values[offset]
+        if delta:
+            values[offset] = length
+            self._sums.add(block, delta)
+            self._total += delta
+
+    def __iter__(self):
+        for values in self._blocks:
+            for length in values:
+                yield length
+
+    def start_of(self, row):
+        '''Return the sum of the lengths of the lines before `row`. If `row`
+        is the number of lines, the total is returned.
+        '''
+        if row <= 0:
+            return 0
+        if row >= self._count:
+            return self._total
+        block, offset = self._locate(row)
+        return self._sums.prefix(block) + sum(self._blocks[block][:offset])
+
+    def find(self, index):
+        '''Return the first line where the sum of the lengths of the lines up
+        to it (included) reaches `index`. For an index greater than the total,
+        the last line is returned.
+        '''
+        count = self._count
+        if count == 0:
+            return 0
+        if index <= 0:
+            return 0
+        if index > self._total:
+            return count - 1
+        block, rest = self._sums.search(index)
+        row = self._counts.prefix(block)
+        for length in self._blocks[block]:
+            if length >= rest:
+                return row
+            rest -= length
+            row += 1
+        return count - 1
+
+    def splice(self, start, finish, lengths):
+        '''Replace the lines from `start` to `finish` (excluded) by lines of
+        the given `lengths`, as a list slice assignment would do.
+        '''
+        count = self._count
+        start = max(0, min(start, count))
+        finish = max(start, min(finish, count))
+        blocks = self._blocks
+        if not blocks:
+            self.reset(lengths)
+            return
+        if start == count:
+            first, offset = len(blocks) - 1, len(blocks[-1])
+        else:
+            first, offset = self._locate(start)
+        if finish == start:
+            last, end = first, offset
+        else:
+            last, end = self._locate(finish - 1)
+            end += 1
+
+        if first == last:
+            # the lines are in a single block
+            merged = blocks[first]
+            removed = merged[offset:end]
+            merged[offset:end] = lengths
+            if 0 < len(merged) <= self.block_size:
+                delta_count = len(lengths) - len(removed)
+                delta_sum = sum(lengths) - sum(removed)
+                self._counts.add(first, delta_count)
+                self._sums.add(first, delta_sum)
+                self._count += delta_count
+                self._total += delta_sum
+                return
+        else:
+            merged = blocks[first][:offset] + list(lengths) + \
+                blocks[last][end:]
+
+        # the blocks have changed, split them again
+        size = self.block_size // 2
+        blocks[first:last + 1] = [merged[i:i + size]
+                                  for i in range(0, len(merged), size)]
+        self._rebuild()
@@ -309,6 +309,9 @@ class AsyncImage(Image):
 
     def _load_source(self, *args):
         source = self.source
+        if self._coreimage is not None:
+            # don't load the previous source if it's not loaded yet
+            Loader.cancel(self._coreimage)
         if not source:
             if self._coreimage is not None:
                 self._coreimage.unbind(on_texture=self._on_tex_change)
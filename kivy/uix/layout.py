@@ -43,14 +43,170 @@ height, do::
     The `reposition_child` internal method (made public by mistake) has
     been removed.
 
+Layout manager
+--------------
+
+.. versionadded:: 1.8.1
+
+The layouts don't lay out their children as soon as something changes: they
+call :meth:`Layout._trigger_layout`, which marks them dirty in the
+:attr:`LayoutManager`. Before the next frame, the manager runs
+:meth:`Layout.do_layout` on all the dirty layouts in a single pass, from the
+root of the tree to the leaves: a parent sets the size of its children before
+they lay out their own children, so each layout runs once in most frames.
+The changes done by a layout to its children, like their size, don't trigger
+it again. A layout changing its own size or position during its pass, like a
+:class:`~kivy.uix.stacklayout.StackLayout` whose height is bound to its
+`minimum_height`, is run again with its new geometry.
+
+A layout that becomes dirty again during the pass, for example a parent whose
+child changed its `minimum_height`, is run again in the same pass, still
+ordered by depth. A layout running more than
+:attr:`LayoutManagerBase.max_passes` times is left for the next frame, with a
+warning.
+
+The manager counts the layout passes, which helps to find the layouts that
+trigger each other::
+
+    from kivy.uix.layout import LayoutManager
+    print('passes in the last frame:', LayoutManager.passes)
+    print('passes per frame:', LayoutManager.total_passes /
+          float(max(1, LayoutManager.frames)))
+
 '''
 
-__all__ = ('Layout', )
+__all__ = ('Layout', 'LayoutManagerBase', 'LayoutManager')
 
+from heapq import heappush, heappop
+from weakref import WeakSet
 from kivy.clock import Clock
+from kivy.context import register_context
+from kivy.logger import Logger
 from kivy.uix.widget import Widget
 
 
+class LayoutManagerBase(object):
+    '''Collect the dirty layouts and lay them out before the next frame. See
+    the module documentation for more information.
+
+    .. versionadded:: 1.8.1
+    '''
+
+    #: Maximum number of times a layout is run in a pass
+    max_passes = 10
+
+    def __init__(self):
+        super(LayoutManagerBase, self).__init__()
+        #: Number of :meth:`Layout.do_layout` calls in the last pass
+        self.passes = 0
+        #: Total number of :meth:`Layout.do_layout` calls
+        self.total_passes = 0
+        #: Number of passes done, usually one per frame with dirty layouts
+        self.frames = 0
+        self._dirty = WeakSet()
+        self._scheduled = False
+        # during a pass, the layouts to run ordered by depth
+        self._queue = None
+        self._queued = None
+        self._running = None
+        self._running_triggered = False
+        self._count = 0
+
+    def trigger(self, layout):
+        '''Mark the `layout` dirty. It will be laid out before the next
+        frame, or later in the current pass if the manager is running.
+        '''
+        if self._queue is not None:
+            # the changes done by a layout to its children don't trigger it
+            # again, the changes to its own size or position are checked
+            # after its pass
+            if layout is self._running:
+                self._running_triggered = True
+            else:
+                self._push(layout)
+            return
+        self._dirty.add(layout)
+        if not self._scheduled:
+            self._scheduled = True
+            Clock.schedule_once(self.process, -1)
+
+    def _push(self, layout):
+        if layout in self._queued:
+            return
+        self._queued.add(layout)
+        # the depth of the layout, the window is its own parent
+        depth = 0
+        widget = layout
+        parent = layout.parent
+        while parent is not None and parent is not widget:
+            depth += 1
+            widget, parent = parent, getattr(parent, 'parent', None)
+        self._count += 1
+        heappush(self._queue, (depth, self._count, layout))
+
+    def process(self, *largs):
+        '''Lay out all the dirty layouts now. This is called automatically
+        before the next frame.
+        '''
+        self._scheduled = False
+        dirty = self._dirty
+        if not dirty:
+            return
+        self._dirty = WeakSet()
+        queue = self._queue = []
+        self._queued = set()
+        counts = {}
+        passes = 0
+        max_passes = self.max_passes
+        try:
+            for layout in dirty:
+                self._push(layout)
+            while queue:
+                layout = heappop(queue)[2]
+                self._queued.discard(layout)
+                count = counts.get(layout, 0)
+                if count == max_passes:
+                    Logger.warning(
+                        'Layout: %r has been laid out %d times in the same '
+                        'frame, continuing at the next frame' %
+                        (layout, count))
+                    self._dirty.add(layout)
+                    continue
+                counts[layout] = count + 1
+                passes += 1
+                self._running = layout
+                self._running_triggered = False
+                geometry = layout.x, layout.y, layout.width, layout.height
+                layout.do_layout()
+                self._running = None
+                # the layout has changed its own size or position (like a
+                # layout bound to its minimum size), run it again
+                if self._running_triggered and geometry != (
+                        layout.x, layout.y, layout.width, layout.height):
+                    self._push(layout)
+        finally:
+            for entry in queue:
+                self._dirty.add(entry[2])
+            self._queue = self._queued = self._running = None
+            self.passes = passes
+            self.total_passes += passes
+            self.frames += 1
+            if self._dirty and not self._scheduled:
+                # not the same frame, or the layouts would run again at once
+                self._scheduled = True
+                Clock.schedule_once(self.process, 0)
+
+    def reset_counters(self):
+        '''Set :attr:`passes`, :attr:`total_passes` and :attr:`frames` back
+        to 0.
+        '''
+        self.passes = self.total_passes = self.frames = 0
+
+
+#: Instance of :class:`LayoutManagerBase`.
+LayoutManager = register_context('LayoutManager', LayoutManagerBase)
+
+
 class Layout(Widget):
     '''Layout interface class, used to implement every layout. See module
     documentation for more information.
@@ -59,9 +215,19 @@ class Layout(Widget):
     def __init__(self, **kwargs):
         if self.__class__ == Layout:
             raise Exception('The Layout class cannot be used.')
-        self._trigger_layout = Clock.create_trigger(self.do_layout, -1)
         super(Layout, self).__init__(**kwargs)
 
+    def _trigger_layout(self, *largs):
+        '''Mark the layout dirty in the :attr:`LayoutManager`: it will be laid
+        out before the next frame. Bind it to the properties the layout
+        depends on.
+
+        .. versionchanged:: 1.8.1
+            It was a :class:`~kivy.clock.Clock` trigger, the layouts are now
+            laid out in a single pass by the :attr:`LayoutManager`.
+        '''
+        LayoutManager.trigger(self)
+
     def do_layout(self, *largs):
         '''This function is called when a layout is needed by a trigger.
         If you are writing a new Layout subclass, don't call this function
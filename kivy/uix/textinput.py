@@ -150,6 +150,7 @@ from kivy.config import Config
 from kivy.compat import PY2
 from kivy.logger import Logger
 from kivy.metrics import inch
+from kivy.textbuffer import LineIndex
 from kivy.utils import boundary, platform
 
 from kivy.core.text import Label
@@ -332,12 +333,19 @@ class TextInput(Widget):
         self._bubble = None
         self._lines_flags = []
         self._lines_labels = []
+        self._lines_labelled = set()
         self._lines_rects = []
+        self._lines_widths = []
+        self._lines_rects_pool = []
+        self._lines_created = 0
+        self._lines_index = LineIndex()
+        self._text_cache = None
         self._hint_text_flags = []
         self._hint_text_labels = []
         self._hint_text_rects = []
         self._label_cached = None
         self._line_options = None
+        self._line_options_key = None
         self._keyboard = None
         self._keyboard_mode = Config.get('kivy', 'keyboard_mode')
         self._command_mode = False
@@ -396,6 +404,10 @@ class TextInput(Widget):
 
     def cursor_index(self, cursor=None):
         '''Return the cursor index in the text/value.
+
+        .. versionchanged:: 1.8.1
+            The index is computed in logarithmic time from the number of
+            lines.
         '''
         if not cursor:
             cursor = self.cursor
@@ -405,12 +417,8 @@ class TextInput(Widget):
                 return 0
             lf = self._lines_flags
             index, cr = cursor
-            for row in range(cr):
-                if row >= len(l):
-                    continue
-                index += len(l[row])
-                if lf[row] & FL_IS_NEWLINE:
-                    index += 1
+            if cr > 0:
+                index += self._get_lines_index().start_of(cr)
             if lf[cr] & FL_IS_NEWLINE:
                 index += 1
             return index
@@ -425,29 +433,79 @@ class TextInput(Widget):
         col = self.cursor_col
         _lines = self._lines
         if col and row < len(_lines):
-            offset = self._get_text_width(
-                _lines[row][:col], self.tab_width,
-                self._label_cached)
+            offset = self._get_line_prefix_width(row, col)
         return offset
 
     def get_cursor_from_index(self, index):
         '''Return the (row, col) of the cursor from text index.
+
+        .. versionchanged:: 1.8.1
+            The cursor is found in logarithmic time from the number of lines.
         '''
-        index = boundary(index, 0, len(self.text))
+        lines_index = self._get_lines_index()
+        index = boundary(index, 0, lines_index.total)
         if index <= 0:
             return 0, 0
-        lf = self._lines_flags
-        l = self._lines
-        i = 0
-        for row in range(len(l)):
-            ni = i + len(l[row])
-            if lf[row] & FL_IS_NEWLINE:
-                ni += 1
-                i += 1
-            if ni >= index:
-                return index - i, row
-            i = ni
-        return index, row
+        row = lines_index.find(index)
+        start = lines_index.start_of(row)
+        if self._lines_flags[row] & FL_IS_NEWLINE:
+            start += 1
+        return index - start, row
+
+    def _get_lines_index(self):
+        # Return the index of the length of the lines. It is updated on every
+        # change of the lines, but rebuild it if the lines have been replaced
+        # without it.
+        lines_index = self._lines_index
+        if len(lines_index) != len(self._lines):
+            lines_index.reset(self._get_lines_lengths(
+                self._lines, self._lines_flags))
+            self._text_cache = None
+        return lines_index
+
+    def _replace_text_cache(self, start, finish, lines, lines_flags, first):
+        # Update the cached text, when the lines from start to finish are
+        # replaced by new lines. The index must not be updated yet. The flag of
+        # lines[i] is lines_flags[first + i].
+        text = self._text_cache
+        if text is None:
+            return
+        lines_index = self._lines_index
+        len_flags = len(lines_flags)
+        new_text = u''.join([
+            (u'\n' if (i >= len_flags or lines_flags[i] & FL_IS_NEWLINE)
+             else u'') + line for i, line in enumerate(lines, first)])
+        self._text_cache = u''.join((
+            text[:lines_index.start_of(start)], new_text,
+            text[lines_index.start_of(finish):]))
+
+    def _get_lines_lengths(self, lines, lines_flags, start=0):
+        # Return the length of the lines in the text, including the newline
+        # that comes before them. Missing flags are considered as newlines, as
+        # in _get_text().
+        len_flags = len(lines_flags)
+        return [len(line) + (1 if (i >= len_flags or
+                                  lines_flags[i] & FL_IS_NEWLINE) else 0)
+                for i, line in enumerate(lines, start)]
+
+    def _get_text_range(self, start, end):
+        # Return text[start:end], without joining all the lines of the text
+        if start >= end:
+            return u''
+        lines = self._lines
+        lines_flags = self._lines_flags
+        get_cursor_from_index = self.get_cursor_from_index
+        scol, srow = get_cursor_from_index(start)
+        ecol, erow = get_cursor_from_index(end)
+        if srow == erow:
+            return lines[srow][scol:ecol]
+        text = [lines[srow][scol:]]
+        len_flags = len(lines_flags)
+        for row in range(srow + 1, erow + 1):
+            if row >= len_flags or lines_flags[row] & FL_IS_NEWLINE:
+                text.append(u'\n')
+            text.append(lines[row] if row < erow else lines[row][:ecol])
+        return u''.join(text)
 
     def select_text(self, start, end):
         ''' Select a portion of text displayed in this TextInput.
@@ -463,7 +521,7 @@ class TextInput(Widget):
         '''
         if end < start:
             raise Exception('end must be superior to start')
-        m = len(self.text)
+        m = self._get_lines_index().total
         self._selection_from = boundary(start, 0, m)
         self._selection_to = boundary(end, 0, m)
         self._selection_finished = True
@@ -475,19 +533,23 @@ class TextInput(Widget):
 
         .. versionadded:: 1.4.0
         '''
-        self.select_text(0, len(self.text))
+        self.select_text(0, self._get_lines_index().total)
 
     re_indent = re.compile('^(\s*|)')
 
     def _auto_indent(self, substring):
-        index = self.cursor_index()
-        _text = self._get_text(encode=False)
-        if index > 0:
-            line_start = _text.rfind('\n', 0, index)
-            if line_start > -1:
-                line = _text[line_start + 1:index]
-                indent = self.re_indent.match(line).group()
-                substring += indent
+        # find the start of the paragraph of the cursor, instead of searching
+        # the previous newline in the whole text
+        cc, cr = self.cursor
+        lines = self._lines
+        lines_flags = self._lines_flags
+        row = cr
+        while row > 0 and not lines_flags[row] & FL_IS_NEWLINE:
+            row -= 1
+        if lines_flags[row] & FL_IS_NEWLINE:
+            line = u''.join(lines[row:cr]) + lines[cr][:cc]
+            indent = self.re_indent.match(line).group()
+            substring += indent
         return substring
 
     def insert_text(self, substring, from_undo=False):
@@ -788,18 +850,17 @@ class TextInput(Widget):
         scrl_y = scrl_y / dy if scrl_y > 0 else 0
         cy = (self.top - padding_top + scrl_y * dy) - y
         cy = int(boundary(round(cy / dy - 0.5), 0, len(l) - 1))
-        dcx = 0
-        _get_text_width = self._get_text_width
-        _tab_width = self.tab_width
-        _label_cached = self._label_cached
-        for i in range(1, len(l[cy]) + 1):
-            if _get_text_width(l[cy][:i],
-                               _tab_width,
-                               _label_cached) + padding_left >= cx + scrl_x:
-                break
-            dcx = i
-        cx = dcx
-        return cx, cy
+        # the width of the line prefixes only grows: search the last prefix
+        # ending before x
+        prefix_width = self._get_line_prefix_width
+        lo, hi = 0, len(l[cy])
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if prefix_width(cy, mid) + padding_left < cx + scrl_x:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo, cy
 
     #
     # Selection control
@@ -824,10 +885,10 @@ class TextInput(Widget):
         cc, cr = self.cursor
         if not self._selection:
             return
-        v = self._get_text(encode=False)
         a, b = self._selection_from, self._selection_to
         if a > b:
             a, b = b, a
+        v = self._get_text_range(a, b)
         self.cursor = cursor = self.get_cursor_from_index(a)
         start = cursor
         finish = self.get_cursor_from_index(b)
@@ -843,7 +904,7 @@ class TextInput(Widget):
         self.scroll_x = scrl_x
         self.scroll_y = scrl_y
         # handle undo and redo for delete selecttion
-        self._set_unredo_delsel(a, b, v[a:b], from_undo)
+        self._set_unredo_delsel(a, b, v, from_undo)
         self.cancel_selection()
 
     def _set_unredo_delsel(self, a, b, substring, from_undo):
@@ -865,7 +926,7 @@ class TextInput(Widget):
         if a > b:
             a, b = b, a
         self._selection_finished = finished
-        _selection_text = self._get_text(encode=False)[a:b]
+        _selection_text = self._get_text_range(a, b)
         self.selection_text = ("" if not self.allow_copy else
                                (('*' * (b - a)) if self.password else
                                 _selection_text))
@@ -1397,12 +1458,13 @@ class TextInput(Widget):
 
     def _get_text_width(self, text, tab_width, _label_cached):
         # Return the width of a text, according to the current line options
-        kw = self._get_line_options()
+        self._get_line_options()
+        key = self._line_options_key
 
         try:
-            cid = u'{}\0{}'.format(text, kw)
+            cid = u'{}\0{}'.format(text, key)
         except UnicodeDecodeError:
-            cid = '{}\0{}'.format(text, kw)
+            cid = '{}\0{}'.format(text, key)
 
         width = Cache_get('textinput.width', cid)
         if width:
@@ -1417,6 +1479,20 @@ class TextInput(Widget):
         Cache_append('textinput.width', cid, width)
         return width
 
+    def _get_line_prefix_width(self, row, col):
+        # Return the width of the first col characters of a line. The widths
+        # are kept for each line, until the line is changed.
+        widths = self._lines_widths[row]
+        if widths is None:
+            widths = self._lines_widths[row] = \
+                [0] + [None] * len(self._lines[row])
+        col = min(col, len(widths) - 1)
+        width = widths[col]
+        if width is None:
+            width = widths[col] = self._get_text_width(
+                self._lines[row][:col], self.tab_width, self._label_cached)
+        return width
+
     def _do_blink_cursor(self, dt):
         # Callback called by the timer to blink the cursor, according to the
         # last activity in the widget
@@ -1432,14 +1508,28 @@ class TextInput(Widget):
     def _delete_line(self, idx):
         # Delete current line, and fix cursor position
         assert(idx < len(self._lines))
+        lines_index = self._get_lines_index()
+        self._replace_text_cache(idx, idx + 1, [], [], 0)
         self._lines_flags.pop(idx)
         self._lines_labels.pop(idx)
+        # the following lines moved, look for the labels at the next eviction
+        self._lines_labelled = None
+        self._lines_rects.pop(idx)
+        self._lines_widths.pop(idx)
+        lines_index.splice(idx, idx + 1, [])
         self._lines.pop(idx)
         self.cursor = self.cursor
 
     def _set_line_text(self, line_num, text):
         # Set current line with other text than the default one.
-        self._lines_labels[line_num] = self._create_line_label(text)
+        lines_index = self._get_lines_index()
+        # the label is created again when the line is displayed
+        self._lines_labels[line_num] = None
+        self._lines_widths[line_num] = None
+        self._replace_text_cache(line_num, line_num + 1, (text, ),
+                                 self._lines_flags, line_num)
+        lines_index[line_num] = self._get_lines_lengths(
+            (text, ), self._lines_flags, line_num)[0]
         self._lines[line_num] = text
 
     def _trigger_refresh_line_options(self, *largs):
@@ -1462,12 +1552,18 @@ class TextInput(Widget):
 
     def _update_text_options(self, *largs):
         Cache_remove('textinput.width')
+        # the widths of the lines are measured again with the new options
+        self._lines_widths = [None] * len(self._lines)
         self._trigger_refresh_text()
 
     def _refresh_text_from_trigger(self, dt, *largs):
         self._refresh_text_from_property(*largs)
 
     def _refresh_text_from_property(self, *largs):
+        if len(largs) > 1:
+            # partial refresh, the text is not needed
+            self._refresh_text(None, *largs)
+            return
         self._refresh_text(self._get_text(encode=False), *largs)
 
     def _refresh_text(self, text, *largs):
@@ -1479,20 +1575,21 @@ class TextInput(Widget):
             #start = max(0, start)
         else:
             _lines, self._lines_flags = self._split_smart(text)
-        _lines_labels = []
-        _line_rects = []
-        _create_label = self._create_line_label
-
-        for x in _lines:
-            lbl = _create_label(x)
-            _lines_labels.append(lbl)
-            _line_rects.append(
-                Rectangle(size=(lbl.size if lbl else (0, 0))))
-            lbl = None
+        # the labels and rectangles of the lines are created when the lines
+        # are displayed, see _update_graphics(). Only the first one is needed
+        # now, for the line height.
+        _lines_labels = [None] * len(_lines)
+        _line_rects = [None] * len(_lines)
+        line_label = _lines_labels[0] = self._create_line_label(_lines[0])
 
         if mode == 'all':
             self._lines_labels = _lines_labels
+            self._lines_labelled = set([0])
             self._lines_rects = _line_rects
+            self._lines_widths = [None] * len(_lines)
+            self._lines_index.reset(
+                self._get_lines_lengths(_lines, self._lines_flags))
+            self._text_cache = None
             self._lines = _lines
         elif mode == 'del':
             if finish > start:
@@ -1508,7 +1605,6 @@ class TextInput(Widget):
                 len_lines, _lines_flags, _lines, _lines_labels,
                 _line_rects)
 
-        line_label = _lines_labels[0]
         min_line_ht = self._label_cached.get_extents('_')[1]
         if line_label is None:
             self.line_height = max(1, min_line_ht)
@@ -1529,39 +1625,34 @@ class TextInput(Widget):
 
     def _insert_lines(self, start, finish, len_lines, _lines_flags,
                       _lines, _lines_labels, _line_rects):
+            # replace the lines from start to finish in place: only the
+            # following lines are moved, the lists are not rebuilt.
             self_lines_flags = self._lines_flags
-            _lins_flags = []
-            _lins_flags.extend(self_lines_flags[:start])
-            if len_lines:
+            lines_index = self._get_lines_index()
+            if not len_lines:
+                _lines_flags = _lines = _lines_labels = _line_rects = []
+            elif start:
                 # if not inserting at first line then
-                if start:
-                    # make sure line flags restored for first line
-                    # _split_smart assumes first line to be not a new line
-                    _lines_flags[0] = self_lines_flags[start]
-                _lins_flags.extend(_lines_flags)
-            _lins_flags.extend(self_lines_flags[finish:])
-            self._lines_flags = _lins_flags
-
-            _lins_lbls = []
-            _lins_lbls.extend(self._lines_labels[:start])
-            if len_lines:
-                _lins_lbls.extend(_lines_labels)
-            _lins_lbls.extend(self._lines_labels[finish:])
-            self._lines_labels = _lins_lbls
-
-            _lins_rcts = []
-            _lins_rcts.extend(self._lines_rects[:start])
-            if len_lines:
-                _lins_rcts.extend(_line_rects)
-            _lins_rcts.extend(self._lines_rects[finish:])
-            self._lines_rects = _lins_rcts
-
-            _lins = []
-            _lins.extend(self._lines[:start])
-            if len_lines:
-                _lins.extend(_lines)
-            _lins.extend(self._lines[finish:])
-            self._lines = _lins
+                # make sure line flags restored for first line
+                # _split_smart assumes first line to be not a new line
+                _lines_flags[0] = self_lines_flags[start]
+            self_lines_flags[start:finish] = _lines_flags
+            self._lines_labels[start:finish] = _lines_labels
+            labelled = self._lines_labelled
+            if labelled is not None:
+                if len(_lines) != finish - start:
+                    # the following lines moved, look for the labels at the
+                    # next eviction
+                    self._lines_labelled = None
+                elif _lines_labels and _lines_labels[0] is not None:
+                    labelled.add(start)
+            self._lines_rects[start:finish] = _line_rects
+            self._lines_widths[start:finish] = [None] * len(_lines)
+            self._replace_text_cache(start, finish, _lines, self_lines_flags,
+                                     start)
+            lines_index.splice(start, finish, self._get_lines_lengths(
+                _lines, self_lines_flags, start))
+            self._lines[start:finish] = _lines
 
     def _trigger_update_graphics(self, *largs):
         Clock.unschedule(self._update_graphics)
@@ -1576,6 +1667,10 @@ class TextInput(Widget):
         #     - create rectangle for the lines matching the viewport
         #     - crop the texture coordinates to match the viewport
         #
+        # The labels of the lines are created here, the first time a line is
+        # displayed, and released once it has been scrolled away: see
+        # _evict_lines().
+        #
         # This is the first step of graphics, the second is the selection.
 
         self.canvas.clear()
@@ -1603,9 +1698,29 @@ class TextInput(Widget):
         y = self.top - padding_top + sy
         miny = self.y + padding_bottom
         maxy = self.top - padding_top
-        for line_num, value in enumerate(lines):
+        # skip the lines above the viewport
+        first = 0
+        if dy > 0 and y > maxy + dy:
+            first = min(len(lines), int((y - maxy - dy) / dy))
+            y -= first * dy
+        last = first - 1
+        create_label = self._create_line_label
+        labelled = (self._lines_labelled if labels is self._lines_labels
+                    else None)
+        rects_pool = self._lines_rects_pool
+        created = 0
+        for line_num in range(first, len(lines)):
+            if y < miny:
+                break
             if miny <= y <= maxy + dy:
+                last = line_num
                 texture = labels[line_num]
+                if texture is None:
+                    texture = labels[line_num] = create_label(
+                        lines[line_num])
+                    created += 1
+                    if labelled is not None:
+                        labelled.add(line_num)
                 if not texture:
                     y -= dy
                     continue
@@ -1658,6 +1773,9 @@ class TextInput(Widget):
 
                 # add rectangle.
                 r = rects[line_num]
+                if r is None:
+                    r = rects[line_num] = (
+                        rects_pool.pop() if rects_pool else Rectangle())
                 r.pos = int(x), int(y - mlh)
                 r.size = size
                 r.texture = texture
@@ -1666,8 +1784,47 @@ class TextInput(Widget):
 
             y -= dy
 
+        if created:
+            self._lines_created += created
+            if self._lines_created > self.lines_pool_size:
+                self._evict_lines(first, last)
         self._update_graphics_selection()
 
+    def _evict_lines(self, first, last):
+        # Release the labels of the lines far from the viewport, and keep
+        # their rectangles to recycle them. Lines within one viewport height
+        # above or below the visible lines are kept, to scroll smoothly.
+        self._lines_created = 0
+        margin = max(1, last - first + 1)
+        first = max(0, first - margin)
+        last += margin
+        labels = self._lines_labels
+        rects = self._lines_rects
+        rects_pool = self._lines_rects_pool
+        pool_size = self.lines_pool_size
+        # only the lines with a label are visited, unless lines were inserted
+        # or deleted since the last eviction
+        labelled = self._lines_labelled
+        if labelled is None:
+            labelled = [line_num for line_num, label in enumerate(labels)
+                        if label is not None]
+        kept = set()
+        len_labels = len(labels)
+        for line_num in labelled:
+            if line_num >= len_labels or labels[line_num] is None:
+                continue
+            if first <= line_num <= last:
+                kept.add(line_num)
+                continue
+            labels[line_num] = None
+            r = rects[line_num]
+            if r is not None:
+                rects[line_num] = None
+                if len(rects_pool) < pool_size:
+                    r.texture = None
+                    rects_pool.append(r)
+        self._lines_labelled = kept
+
     def _update_graphics_selection(self):
         if not self._selection:
             return
@@ -1702,8 +1859,9 @@ class TextInput(Widget):
         canvas_add = self.canvas.add
         selection_color = self.selection_color
         for line_num, value in enumerate(_lines[s1r:s2r], start=s1r):
-            if miny <= y <= maxy + dy:
-                r = rects[line_num]
+            r = rects[line_num]
+            # lines without rectangle have not been displayed yet
+            if r is not None and miny <= y <= maxy + dy:
                 draw_selection(r.pos, r.size, line_num, (s1c, s1r),
                                (s2c, s2r - 1), _lines, _get_text_width,
                                tab_width, _label_cached, width,
@@ -1724,14 +1882,11 @@ class TextInput(Widget):
         x1 = x
         x2 = x + w
         if line_num == s1r:
-            lines = _lines[line_num]
             x1 -= self.scroll_x
-            x1 += _get_text_width(lines[:s1c], tab_width, _label_cached)
+            x1 += self._get_line_prefix_width(line_num, s1c)
         if line_num == s2r:
-            lines = _lines[line_num]
-            x2 = (x - self.scroll_x) + _get_text_width(lines[:s2c],
-                                                       tab_width,
-                                                       _label_cached)
+            x2 = (x - self.scroll_x) + self._get_line_prefix_width(line_num,
+                                                                   s2c)
         width_minus_padding = width - (padding_right + padding_left)
         maxx = x + width_minus_padding
         if x1 > maxx:
@@ -1778,6 +1933,7 @@ class TextInput(Widget):
                 'padding_x': 0,
                 'padding_y': 0,
                 'padding': (0, 0)}
+            self._line_options_key = str(kw)
             self._label_cached = Label(**kw)
         return self._line_options
 
@@ -2430,8 +2586,13 @@ class TextInput(Widget):
         if len(lf) < len_l:
             lf.append(1)
 
-        text = u''.join([(u'\n' if (lf[i] & FL_IS_NEWLINE) else u'') + l[i]
-                        for i in range(len_l)])
+        # the text is cached, and updated on every change of the lines
+        self._get_lines_index()
+        text = self._text_cache
+        if text is None:
+            text = self._text_cache = u''.join(
+                [(u'\n' if (lf[i] & FL_IS_NEWLINE) else u'') + l[i]
+                 for i in range(len_l)])
 
         if PY2 and encode and type(text) is not str:
             text = text.encode('utf-8')
@@ -2552,6 +2713,21 @@ class TextInput(Widget):
     defaults to 0.
     '''
 
+    lines_pool_size = NumericProperty(256)
+    '''Number of line textures that can be created while scrolling before the
+    textures of the lines far from the viewport are released.
+
+    The texture of a line is created the first time the line is displayed, so
+    loading a large text only renders the visible lines. The rectangles of the
+    released lines are kept, up to :attr:`lines_pool_size`, and reused for the
+    next lines displayed.
+
+    .. versionadded:: 1.8.1
+
+    :attr:`lines_pool_size` is a :class:`~kivy.properties.NumericProperty`
+    and defaults to 256.
+    '''
+
     input_type = OptionProperty('text', options=('text', 'number', 'url',
                                                  'mail', 'datetime', 'tel',
                                                  'address'))
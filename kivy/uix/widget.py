@@ -211,6 +211,7 @@ from kivy.context import get_current_context
 from weakref import proxy
 from functools import partial
 from itertools import islice
+from kivy.spatialindex import SpatialGrid
 
 
 # references to all the destructors widgets (partial method with widget uid as
@@ -272,6 +273,10 @@ class Widget(WidgetBase):
     __metaclass__ = WidgetMetaclass
     __events__ = ('on_touch_down', 'on_touch_move', 'on_touch_up')
 
+    # spatial index of the children, see touch_index
+    _touch_index = None
+    _touch_order = None
+
     def __init__(self, **kwargs):
         # Before doing anything, ensure the windows exist.
         EventLoop.ensure_window()
@@ -400,7 +405,7 @@ class Widget(WidgetBase):
         '''
         if self.disabled and self.collide_point(*touch.pos):
             return True
-        for child in self.children[:]:
+        for child in self._touch_candidates(touch):
             if child.dispatch('on_touch_down', touch):
                 return True
 
@@ -411,7 +416,7 @@ class Widget(WidgetBase):
         '''
         if self.disabled:
             return
-        for child in self.children[:]:
+        for child in self._touch_candidates(touch):
             if child.dispatch('on_touch_move', touch):
                 return True
 
@@ -430,6 +435,62 @@ class Widget(WidgetBase):
         for child in self.children:
             child.disabled = value
 
+    #
+    # Touch index
+    #
+    def on_touch_index(self, instance, value):
+        index = self._touch_index
+        if index is not None:
+            self.unbind(children=self._touch_index_reorder)
+            for child in self.children:
+                self._touch_index_unbind(child)
+            self._touch_index = self._touch_order = None
+        if value:
+            self._touch_index = SpatialGrid()
+            self._touch_always = set()
+            self.bind(children=self._touch_index_reorder)
+            for child in self.children:
+                self._touch_index_bind(child)
+
+    def _touch_index_bind(self, child):
+        if _get_func(type(child).collide_point) is not _widget_collide_point:
+            # the child may accept touches outside of its bounding box
+            self._touch_always.add(child)
+            return
+        child.bind(pos=self._touch_index_update, size=self._touch_index_update)
+        self._touch_index_update(child)
+
+    def _touch_index_unbind(self, child):
+        if child in self._touch_always:
+            self._touch_always.discard(child)
+            return
+        child.unbind(pos=self._touch_index_update,
+                     size=self._touch_index_update)
+        self._touch_index.remove(child)
+
+    def _touch_index_update(self, child, *largs):
+        x, y = child.pos
+        width, height = child.size
+        self._touch_index.insert(child, x, y, width, height)
+
+    def _touch_index_reorder(self, *largs):
+        self._touch_order = None
+
+    def _touch_candidates(self, touch):
+        # children to dispatch the touch to, from the top to the bottom
+        index = self._touch_index
+        if index is None:
+            return self.children[:]
+        order = self._touch_order
+        if order is None:
+            order = self._touch_order = dict(
+                (child, i) for i, child in enumerate(self.children))
+        candidates = index.query(touch.x, touch.y)
+        if self._touch_always:
+            candidates.extend(self._touch_always)
+        return sorted((child for child in candidates if child in order),
+                      key=order.__getitem__)
+
     #
     # Tree management
     #
@@ -468,6 +529,8 @@ class Widget(WidgetBase):
         # child will be disabled if added to a disabled parent
         if parent.disabled:
             widget.disabled = True
+        if self._touch_index is not None:
+            self._touch_index_bind(widget)
 
         if index == 0 or len(self.children) == 0:
             self.children.insert(0, widget)
@@ -510,6 +573,8 @@ class Widget(WidgetBase):
         self.children.remove(widget)
         self.canvas.remove(widget.canvas)
         widget.parent = None
+        if self._touch_index is not None:
+            self._touch_index_unbind(widget)
 
     def clear_widgets(self, children=None):
         '''Remove all widgets added to this widget.
@@ -1066,3 +1131,37 @@ class Widget(WidgetBase):
     :attr:`disabled` is a :class:`~kivy.properties.BooleanProperty` and
     defaults to False.
     '''
+
+    touch_index = BooleanProperty(False)
+    '''If True, the children are stored in a
+    :class:`~kivy.spatialindex.SpatialGrid`, kept up to date when their `pos`
+    or `size` change, and :meth:`on_touch_down` and :meth:`on_touch_move`
+    dispatch the touch only to the children whose bounding box contains it,
+    still from the top to the bottom. This is much faster for a widget with
+    hundreds of children, like a dashboard in a
+    :class:`~kivy.uix.floatlayout.FloatLayout`.
+
+    The children overriding :meth:`collide_point`, like a
+    :class:`~kivy.uix.scatter.Scatter`, can accept touches outside of their
+    bounding box: they always receive the touches. :meth:`on_touch_up` is
+    always dispatched to all the children.
+
+    .. warning::
+        A child that handles the touches outside of its bounding box without
+        overriding :meth:`collide_point` doesn't receive them anymore. To
+        follow a touch leaving its bounding box, a widget must
+        :meth:`~kivy.input.motionevent.MotionEvent.grab` it.
+
+    .. versionadded:: 1.8.1
+
+    :attr:`touch_index` is a :class:`~kivy.properties.BooleanProperty` and
+    defaults to False.
+    '''
+
+
+def _get_func(method):
+    # the function of a method, the same for all the subclasses that don't
+    # override it
+    return getattr(method, '__func__', method)
+
+_widget_collide_point = _get_func(Widget.collide_point)